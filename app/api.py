@@ -0,0 +1,304 @@
+# app/api.py
+# Local read-only HTTP query API for MRO planning tools.
+#
+#   python -m app.api export.xlsx
+#   python -m app.api stationA.xlsx stationB.csv --port 8765 --sheet PURCHASE_ORDER
+#
+# Endpoints (GET, JSON):
+#   /orders/<order no>          order summary, aircraft, supplier and per-line status
+#   /parts/<part no>            PO-wise status of a part
+#   /aircraft/<XXX | VT-XXX>    order-wise and line-level status of an aircraft's dedicated lines
+#   /activity/<YYYY-MM-DD>      new orders, shipments, GRN and stock-in entries on a date
+#   /monthly[/<YYYY-MM>]        order lines and INR value per order month (?usd_rate=84)
+#   /stats                      request counts and latency percentiles per endpoint
+#
+# The exports are parsed once at start-up, through the same disk cache as the dashboard and the
+# watcher, into frames plus QueryIndex row positions; a request only selects rows by position.
+# The data does not change while the server runs, so response bodies are memoized.
+import argparse
+import datetime
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .consolidate import prepare_uploads, prepare_uploads_index
+from .lookups import part_status, order_status, aircraft_lines, aircraft_summary
+from .order_lines import MAWB_DATE_COLUMN
+from .reports import DEFAULT_USD_RATE, DAILY_SHEETS, daily_activity, monthly_totals
+
+DEFAULT_PORT = 8765
+ACTIVITY_COLUMNS = ['Order Date', MAWB_DATE_COLUMN, 'GRN Date', 'Stock-In Date']
+LATENCY_WINDOW = 10000  # most recent requests per endpoint kept for the percentiles
+
+log = logging.getLogger("procurement.api")
+
+
+class NotFound(Exception):
+    pass
+
+
+class BadRequest(Exception):
+    pass
+
+
+def records(frame):
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+
+def iso_date(value):
+    return value.date().isoformat() if pd.notnull(value) else None
+
+
+# 🔹 Row positions (into the batch rows) with any activity on each date, so a date lookup
+# runs daily_activity over a handful of rows instead of the whole upload
+def activity_rows(df):
+    stacked = pd.concat([df[col] for col in ACTIVITY_COLUMNS], ignore_index=True).dt.normalize()
+    rows = np.tile(np.arange(len(df)), len(ACTIVITY_COLUMNS))
+    return {day.date(): np.unique(rows[positions]) for day, positions in stacked.groupby(stacked).indices.items()}
+
+
+# 🔹 Frames and indexes of the loaded exports, and the lookups answered from them
+class Snapshot:
+    def __init__(self, uploads, sheet_name=None):
+        self.files = [name for name, _ in uploads]
+        self.df, self.lines, self.summary, self.dropped = prepare_uploads(uploads, sheet_name)
+        self.index = prepare_uploads_index(uploads, sheet_name)
+        self.orders = self.summary.set_index('Order No.')
+        self.activity = activity_rows(self.df)
+        self.body = lru_cache(maxsize=4096)(self._body)
+
+    # 🔹 One spelling per lookup ("abc", "vt-abc " → "VT-ABC"), so equivalent requests share a memoized body
+    @staticmethod
+    def normalize(endpoint, key):
+        if endpoint in ('orders', 'parts', 'aircraft'):
+            key = key.strip().upper()
+        if endpoint == 'aircraft' and len(key) == 3 and key.isalpha():
+            key = f"VT-{key}"
+        return key.strip()
+
+    def order(self, order_no):
+        if not self.index.has_order(order_no):
+            raise NotFound(f"order {order_no} not found")
+        summary = self.orders.loc[order_no]
+        order = order_status(self.index.order_lines(order_no))
+        return {
+            'order_no': order_no,
+            'order_date': iso_date(order['order_date']),
+            'status': summary['Status'],
+            'qa_status': summary['QA Status'],
+            'order_qty': float(summary['Order Qty']),
+            'grn_qty': float(summary['GRN Qty']),
+            'fully_shipped': order['fully_shipped'],
+            'days_pending': order['days_pending'],
+            'aircraft': order['aircraft'],
+            'supplier': order['supplier'],
+            'line_counts': order['line_counts'],
+            'items': records(order['items']),
+        }
+
+    def part(self, part_no):
+        if not self.index.has_part(part_no):
+            raise NotFound(f"part {part_no} not found")
+        return {'part_no': part_no, 'orders': records(part_status(self.index.part_lines(part_no)))}
+
+    def aircraft(self, code):
+        single_ac_df = aircraft_lines(self.index.aircraft_lines(code), code)
+        if single_ac_df.empty:
+            raise NotFound(f"no dedicated records found for aircraft {code}")
+        ac_summary, related_lines = aircraft_summary(single_ac_df)
+        orders_by_status = ac_summary.groupby('Status')['Order No.'].agg(list)
+        return {
+            'aircraft': code,
+            'total_orders': len(ac_summary),
+            'orders_by_status': {status: orders_by_status.get(status, [])
+                                 for status in ['Fully Shipped', 'Partially Shipped', 'Not Shipped']},
+            'line_counts': {status: int(count) for status, count in related_lines['Status'].value_counts().items()},
+            'total_lines': len(related_lines),
+            'orders': records(ac_summary),
+        }
+
+    def day(self, text):
+        try:
+            selected_date = datetime.date.fromisoformat(text)
+        except ValueError:
+            raise BadRequest(f"expected a date as YYYY-MM-DD, got {text!r}")
+        rows = self.activity.get(selected_date)
+        if rows is None:
+            return {'date': text, 'counts': dict.fromkeys(DAILY_SHEETS, 0), **dict.fromkeys(DAILY_SHEETS, [])}
+        frames = daily_activity(self.df.iloc[rows], selected_date)
+        return {
+            'date': text,
+            'counts': {sheet: len(frame) for sheet, frame in zip(DAILY_SHEETS, frames)},
+            **{sheet: records(frame) for sheet, frame in zip(DAILY_SHEETS, frames)},
+        }
+
+    def monthly(self, month, usd_rate):
+        totals = monthly_totals(self.lines, usd_rate)
+        if month:
+            totals = totals[totals['Month'] == month]
+            if totals.empty:
+                raise NotFound(f"no orders placed in {month}")
+        return {'usd_rate': usd_rate, 'months': records(totals)}
+
+    # 🔹 JSON body for one lookup; `today` is part of the cache key because days pending moves daily
+    def _body(self, endpoint, key, usd_rate, today):
+        if endpoint == 'orders':
+            payload = self.order(key)
+        elif endpoint == 'parts':
+            payload = self.part(key)
+        elif endpoint == 'aircraft':
+            payload = self.aircraft(key)
+        elif endpoint == 'activity':
+            payload = self.day(key)
+        else:
+            payload = self.monthly(key, usd_rate)
+        return json.dumps(payload).encode()
+
+    # 🔹 Render the few expensive, frequently asked bodies (every aircraft, monthly totals) up front
+    def warm(self, usd_rate=DEFAULT_USD_RATE):
+        today = datetime.date.today()
+        for code in self.index.aircraft:
+            try:
+                self.body('aircraft', code, usd_rate, today)
+            except NotFound:  # only seen on lines shared with other aircraft
+                pass
+        self.body('monthly', '', usd_rate, today)
+
+
+# 🔹 Request counts, errors and latency percentiles per endpoint (thread-safe)
+class LatencyStats:
+    def __init__(self, window=LATENCY_WINDOW):
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counts = Counter()
+        self.errors = Counter()
+
+    def record(self, endpoint, seconds, status):
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            self.counts[endpoint] += 1
+            if status >= 400:
+                self.errors[endpoint] += 1
+
+    def report(self):
+        with self.lock:
+            samples = {endpoint: np.array(values) * 1000 for endpoint, values in self.samples.items()}
+            counts, errors = dict(self.counts), dict(self.errors)
+        uptime = time.monotonic() - self.started
+        endpoints = {}
+        for endpoint, ms in sorted(samples.items()):
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            endpoints[endpoint] = {
+                'requests': counts[endpoint],
+                'errors': errors.get(endpoint, 0),
+                'mean_ms': round(float(ms.mean()), 3),
+                'p50_ms': round(float(p50), 3),
+                'p95_ms': round(float(p95), 3),
+                'p99_ms': round(float(p99), 3),
+                'max_ms': round(float(ms.max()), 3),
+            }
+        total = sum(counts.values())
+        return {
+            'uptime_s': round(uptime, 1),
+            'requests': total,
+            'requests_per_s': round(total / uptime, 1) if uptime else 0.0,
+            'window': LATENCY_WINDOW,
+            'endpoints': endpoints,
+        }
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can reuse one connection
+    disable_nagle_algorithm = True  # headers and body are separate writes; don't wait for the client's ACK
+    ENDPOINTS = {'orders', 'parts', 'aircraft', 'activity', 'monthly'}
+
+    def do_GET(self):
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        endpoint, _, key = url.path.strip('/').partition('/')
+        status, body = self.route(endpoint, unquote(key), parse_qs(url.query))
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.stats.record(endpoint if endpoint in self.ENDPOINTS | {'stats'} else 'unknown',
+                                 time.perf_counter() - started, status)
+
+    def route(self, endpoint, key, query):
+        snapshot = self.server.snapshot
+        try:
+            if endpoint == 'stats':
+                return 200, json.dumps({**self.server.stats.report(), 'files': snapshot.files,
+                                        'order_lines': len(snapshot.lines)}).encode()
+            if endpoint not in self.ENDPOINTS:
+                raise NotFound(f"unknown endpoint /{endpoint}")
+            if not key and endpoint != 'monthly':
+                raise BadRequest(f"/{endpoint}/<value> expected")
+            try:
+                usd_rate = float(query.get('usd_rate', [DEFAULT_USD_RATE])[0])
+            except ValueError:
+                raise BadRequest("usd_rate must be a number")
+            return 200, snapshot.body(endpoint, snapshot.normalize(endpoint, key), usd_rate, datetime.date.today())
+        except NotFound as exc:
+            return 404, json.dumps({'error': str(exc)}).encode()
+        except BadRequest as exc:
+            return 400, json.dumps({'error': str(exc)}).encode()
+        except Exception as exc:  # a failing lookup answers 500 instead of dropping the connection
+            log.exception("lookup failed: %s", self.path)
+            return 500, json.dumps({'error': f"{type(exc).__name__}: {exc}"}).encode()
+
+    def log_message(self, format, *args):
+        log.debug("%s " + format, self.address_string(), *args)
+
+
+def make_server(snapshot, host="127.0.0.1", port=DEFAULT_PORT):
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.snapshot = snapshot
+    server.stats = LatencyStats()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve order, part, aircraft, activity and monthly lookups as JSON")
+    parser.add_argument("exports", nargs="+", help="Laminaar export(s); several are consolidated like the dashboard")
+    parser.add_argument("--sheet", default=None, help="sheet to read from Excel exports (default: PURCHASE_ORDER)")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    uploads = []
+    for path in args.exports:
+        with open(path, "rb") as fh:
+            uploads.append((os.path.basename(path), fh.read()))
+
+    started = time.perf_counter()
+    snapshot = Snapshot(tuple(uploads), args.sheet)
+    snapshot.warm()
+    log.info("loaded %d order lines from %s in %.1fs", len(snapshot.lines), ", ".join(snapshot.files),
+             time.perf_counter() - started)
+
+    server = make_server(snapshot, args.host, args.port)
+    log.info("serving on http://%s:%d", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# app/columnar.py
+# Parquet / Arrow IPC export of the derived views for downstream analytics.
+#
+#   python -m app.columnar export.xlsx --out views/
+#   python -m app.columnar stationA.xlsx stationB.csv --out views/ --format arrow --usd-rate 84
+#
+# Every view has a fixed schema (column order and Arrow type), so BI jobs can rely on it across
+# uploads: identifiers and text are strings, quantities and amounts float64, counts int64 and dates
+# date32. Columns an export does not carry are written as nulls rather than left out.
+# Parquet files are zstd-compressed; Arrow IPC files are uncompressed so readers can memory-map
+# them (pyarrow.memory_map + pyarrow.ipc.open_file) and use the columns without copying.
+import argparse
+import io
+import json
+import os
+import zipfile
+
+import pandas as pd
+
+from .exposure import VALUE_COLUMN, open_order_lines
+from .lead_times import lead_time_cube
+from .order_lines import MAWB_COLUMN, unshipped_lines, partial_grn_lines
+from .report_cache import cached_report
+from .reports import DEFAULT_USD_RATE, inr_values, monthly_totals, order_months
+from .rollup import INR_PARTIALS, rollup_cube
+
+# pyarrow is imported inside the writers so the dashboard starts without it
+
+SCHEMA_VERSION = 1
+FORMATS = {'parquet': '.parquet', 'arrow': '.arrow'}
+
+LINE_FIELDS = [
+    ('Order No.', 'string'), ('Part No.', 'string'), ('Description', 'string'), ('Supplier', 'string'),
+    ('Order Date', 'date'), ('Order Qty', 'float64'), ('GRN Qty', 'float64'), ('Stock Qty', 'float64'),
+    ('Unit Price', 'float64'), ('Currency', 'string'), ('A/C Reg. No', 'string'), ('REF. NO', 'string'),
+    ('PRIORITY', 'string'), (MAWB_COLUMN, 'string'), ('Mode of Transport', 'string'), ('QA Status', 'string'),
+    ('Batches', 'int64'), ('Days Pending', 'int64'), ('Source File', 'string'),
+]
+
+# 🔹 View name → (column, type) in file order
+SCHEMAS = {
+    'order_summary': [
+        ('Order No.', 'string'), ('Order Date', 'date'), ('Supplier', 'string'), ('Order Qty', 'float64'),
+        ('GRN Qty', 'float64'), ('QA Status', 'string'), ('Status', 'string'),
+    ],
+    'order_lines': LINE_FIELDS,
+    'not_shipped': LINE_FIELDS,
+    'partial_grn': [
+        ('Order No.', 'string'), ('Part No.', 'string'), ('Description', 'string'), ('Supplier', 'string'),
+        ('Order Qty', 'float64'), ('GRN Qty', 'float64'), ('GRN Shortfall', 'float64'), (MAWB_COLUMN, 'string'),
+        ('Mode of Transport', 'string'),
+    ],
+    'monthly_report': [
+        ('Month', 'string'), ('Supplier', 'string'), ('Order No.', 'string'), ('Part No.', 'string'),
+        ('Description', 'string'), ('Order Date', 'date'), ('Quantity', 'float64'), ('Currency', 'string'),
+        ('Unit Price', 'float64'), ('Exchange Rate', 'float64'), ('Total (INR)', 'float64'), ('PRIORITY', 'string'),
+    ],
+    'monthly_totals': [
+        ('Month', 'string'), ('Order Lines', 'int64'), ('Total (INR)', 'float64'), ('7.5% Value', 'float64'),
+    ],
+    'monthly_rollup': [
+        ('Month', 'string'), ('Supplier', 'string'), ('Currency', 'string'), ('Priority', 'string'),
+        ('Order Lines', 'int64'), ('Order Qty', 'float64'), ('Order Value', 'float64'),
+    ],
+    'open_orders': [
+        ('Order No.', 'string'), ('Part No.', 'string'), ('Description', 'string'), ('Supplier', 'string'),
+        ('A/C Reg. No', 'string'), ('Order Date', 'date'), ('PRIORITY', 'string'), ('Order Qty', 'float64'),
+        ('GRN Qty', 'float64'), ('Open Qty', 'float64'), ('Currency', 'string'), ('Unit Price', 'float64'),
+        ('Exchange Rate', 'float64'), (VALUE_COLUMN, 'float64'),
+    ],
+    'lead_times': [
+        ('Leg', 'string'), ('Supplier', 'string'), ('Mode of Transport', 'string'), ('Priority', 'string'),
+        ('Month', 'string'), ('Count', 'int64'), ('Mean', 'float64'), ('Min', 'float64'), ('P50', 'float64'),
+        ('P75', 'float64'), ('P90', 'float64'), ('P95', 'float64'), ('Max', 'float64'),
+    ],
+}
+
+
+# 🔹 Monthly report rows for every order month (the monthly report's lines, INR-valued)
+def monthly_report_rows(order_lines, usd_rate=DEFAULT_USD_RATE):
+    ordered = order_lines.sort_values('First Row')
+    month_year, _ = order_months(ordered)
+    valued = inr_values(ordered[ordered['Order Date'].notna()], usd_rate)
+    return valued.assign(Month=month_year[ordered['Order Date'].notna()]).sort_values('Month', kind='stable')
+
+
+# 🔹 Every derived view as a DataFrame; lead-time and rollup cubes can be passed in when already built
+def derived_views(df, order_lines, order_summary, usd_rate=DEFAULT_USD_RATE, lead_times=None, rollup=None):
+    partial = partial_grn_lines(order_lines)
+    return {
+        'order_summary': order_summary,
+        'order_lines': order_lines,
+        'not_shipped': unshipped_lines(order_lines),
+        'partial_grn': partial.assign(**{'GRN Shortfall': partial['Order Qty'] - partial['GRN Qty']}),
+        'monthly_report': monthly_report_rows(order_lines, usd_rate),
+        'monthly_totals': monthly_totals(order_lines, usd_rate),
+        'monthly_rollup': (rollup if rollup is not None else rollup_cube(order_lines, usd_rate)).drop(
+            columns=['Exchange Rate', INR_PARTIALS]),
+        'open_orders': open_order_lines(order_lines, usd_rate),
+        'lead_times': (lead_times if lead_times is not None else lead_time_cube(df)).reset_index(),
+    }
+
+
+def _arrow_type(kind):
+    import pyarrow as pa
+
+    return {'string': pa.string(), 'float64': pa.float64(), 'int64': pa.int64(), 'date': pa.date32()}[kind]
+
+
+def _column(series, kind):
+    import pyarrow as pa
+
+    if kind == 'date':
+        dates = pd.to_datetime(series, errors='coerce').dt.normalize()
+        return pa.array(dates.to_numpy(dtype='datetime64[ms]'), type=pa.timestamp('ms'),
+                        mask=dates.isna().to_numpy()).cast(pa.date32())
+    if kind == 'string':
+        try:  # text columns are already str (or missing) after cleaning — no per-value conversion needed
+            return pa.array(series, type=pa.string(), from_pandas=True)
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            values = series.astype(object)
+            return pa.array(values.where(values.isna(), values.astype(str)), type=pa.string(), from_pandas=True)
+    if kind == 'int64':
+        return pa.array(pd.to_numeric(series, errors='coerce').astype('Int64'), type=pa.int64(), from_pandas=True)
+    return pa.array(pd.to_numeric(series, errors='coerce').astype('float64'), type=pa.float64(), from_pandas=True)
+
+
+# 🔹 DataFrame → Arrow table with the view's fixed schema (missing columns become all-null)
+def view_table(name, frame):
+    import pyarrow as pa
+
+    fields = SCHEMAS[name]
+    schema = pa.schema([pa.field(col, _arrow_type(kind)) for col, kind in fields],
+                       metadata={'view': name, 'schema_version': str(SCHEMA_VERSION)})
+    frame = frame.reset_index(drop=True)
+    columns = [
+        _column(frame[col], kind) if col in frame.columns else pa.nulls(len(frame), type=_arrow_type(kind))
+        for col, kind in fields
+    ]
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def write_table(table, fmt):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    buffer = io.BytesIO()
+    if fmt == 'parquet':
+        pq.write_table(table, buffer, compression='zstd')
+    else:
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            writer.write_table(table)
+    buffer.seek(0)
+    return buffer
+
+
+def schema_description():
+    return {'schema_version': SCHEMA_VERSION,
+            'views': {name: [{'name': col, 'type': kind} for col, kind in fields] for name, fields in SCHEMAS.items()}}
+
+
+# 🔹 One view as Parquet / Arrow bytes, cached like the other reports
+def view_file(name, frame, fmt='parquet'):
+    return cached_report(f'columnar-{name}', [frame], {'format': fmt, 'schema_version': SCHEMA_VERSION},
+                         lambda: write_table(view_table(name, frame), fmt), fmt)
+
+
+# 🔹 All views in one zip: <view>.parquet / <view>.arrow plus schemas.json
+def views_bundle(views, fmt='parquet'):
+    def build():
+        buffer = io.BytesIO()
+        # Members are stored, not deflated: Parquet is already compressed and Arrow stays mappable once extracted
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as bundle:
+            for name, frame in views.items():
+                bundle.writestr(name + FORMATS[fmt], view_file(name, frame, fmt).getvalue())
+            bundle.writestr('schemas.json', json.dumps(schema_description(), indent=2))
+        buffer.seek(0)
+        return buffer
+
+    return cached_report('columnar-bundle', list(views.values()),
+                         {'views': list(views), 'format': fmt, 'schema_version': SCHEMA_VERSION}, build, 'zip')
+
+
+def main():
+    from .consolidate import prepare_uploads
+
+    parser = argparse.ArgumentParser(description="Write the derived views of Laminaar export(s) as Parquet or Arrow")
+    parser.add_argument("exports", nargs="+", help="Laminaar export(s); several are consolidated like the dashboard")
+    parser.add_argument("--out", required=True, help="folder the view files and schemas.json are written to")
+    parser.add_argument("--format", choices=list(FORMATS), default="parquet")
+    parser.add_argument("--sheet", default=None, help="sheet to read from Excel exports (default: PURCHASE_ORDER)")
+    parser.add_argument("--usd-rate", type=float, default=DEFAULT_USD_RATE,
+                        help="USD to INR rate for the INR-valued views (the dashboard default)")
+    args = parser.parse_args()
+
+    uploads = []
+    for path in args.exports:
+        with open(path, "rb") as fh:
+            uploads.append((os.path.basename(path), fh.read()))
+    df, order_lines, order_summary, _ = prepare_uploads(tuple(uploads), args.sheet)
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, frame in derived_views(df, order_lines, order_summary, args.usd_rate).items():
+        path = os.path.join(args.out, name + FORMATS[args.format])
+        with open(path, "wb") as fh:
+            fh.write(view_file(name, frame, args.format).getvalue())
+        print(f"{path}: {len(frame):,} rows")
+    with open(os.path.join(args.out, "schemas.json"), "w") as fh:
+        json.dump(schema_description(), fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
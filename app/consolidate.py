@@ -0,0 +1,115 @@
+# app/consolidate.py
+# Several station exports uploaded together: each file is parsed and cleaned in its own worker
+# process, then the frames are stacked into one fleet-wide frame with a Source File column.
+# An order line (Order No. + Part No.) present in more than one file is kept from one file only:
+# the file whose latest GRN Date for that line is the newest wins; ties (including lines with no
+# GRN yet) go to the file uploaded last.
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+from .dataset import prepare_dataset, prepare_query_index, report_day
+from .loader import file_extension, read_export, resolve_sheet
+from .order_lines import ORDER_LINE_KEYS, prepare_orders, build_order_lines, build_order_summary
+from .query import QueryIndex
+from .report_cache import cached_object
+
+SOURCE_COLUMN = 'Source File'
+
+# 🔹 Below this much upload data, parsing in-process is faster than starting workers
+PARALLEL_MIN_BYTES = 2 * 1024 * 1024
+
+
+# 🔹 Worker entry point: one export's default sheet, read and cleaned (module level so it can be pickled)
+def parse_upload(name, file_bytes, today=None):
+    extension = file_extension(name)
+    df = prepare_orders(read_export(file_bytes, extension, resolve_sheet(file_bytes, extension)), today=today)
+    df[SOURCE_COLUMN] = name
+    return df
+
+
+# 🔹 Parses uploads concurrently, preserving upload order; falls back to in-process parsing
+# where worker processes are unavailable (e.g. restricted hosting).
+# Workers are spawned, not forked: uploads are parsed from inside the multi-threaded Streamlit server.
+def parse_uploads(uploads, max_workers=None, today=None):
+    workers = min(len(uploads), max_workers or os.cpu_count() or 1)
+    if workers <= 1 or sum(len(data) for _, data in uploads) < PARALLEL_MIN_BYTES:
+        return [parse_upload(name, data, today) for name, data in uploads]
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(parse_upload, name, data, today) for name, data in uploads]
+            return [f.result() for f in futures]
+    except (BrokenProcessPool, OSError):
+        return [parse_upload(name, data, today) for name, data in uploads]
+
+
+# 🔹 Stacks parsed exports, keeping each duplicated order line from a single file.
+# Returns (fleet rows, one row per order line that was dropped from a file).
+def consolidate(frames):
+    stacked = pd.concat(frames, ignore_index=True)
+    stacked['Upload Position'] = stacked.groupby(SOURCE_COLUMN, sort=False).ngroup()
+
+    per_file = stacked.groupby(ORDER_LINE_KEYS + [SOURCE_COLUMN], sort=False).agg(
+        **{'Latest GRN Date': ('GRN Date', 'max'), 'Upload Position': ('Upload Position', 'first')}).reset_index()
+    ranked = per_file.sort_values(['Latest GRN Date', 'Upload Position'], na_position='first', kind='stable')
+    winners = ranked.drop_duplicates(ORDER_LINE_KEYS, keep='last')
+
+    keep = stacked.merge(winners[ORDER_LINE_KEYS + [SOURCE_COLUMN]], on=ORDER_LINE_KEYS + [SOURCE_COLUMN],
+                         how='left', indicator=True)['_merge'].eq('both').to_numpy()
+    fleet = stacked[keep].drop(columns='Upload Position').reset_index(drop=True)
+
+    dropped = per_file.merge(winners[ORDER_LINE_KEYS + [SOURCE_COLUMN]].rename(columns={SOURCE_COLUMN: 'Kept From'}),
+                             on=ORDER_LINE_KEYS)
+    dropped = dropped[dropped[SOURCE_COLUMN] != dropped['Kept From']]
+    dropped = dropped.rename(columns={SOURCE_COLUMN: 'Dropped From'})[
+        ORDER_LINE_KEYS + ['Kept From', 'Dropped From', 'Latest GRN Date']].reset_index(drop=True)
+    return fleet, dropped
+
+
+# 🔹 Two stations' files may share a name: later ones get " (2)", " (3)", … so sources stay distinct
+def unique_names(uploads):
+    seen = {}
+    renamed = []
+    for name, data in uploads:
+        seen[name] = seen.get(name, 0) + 1
+        renamed.append((name if seen[name] == 1 else f"{name} ({seen[name]})", data))
+    return tuple(renamed)
+
+
+def uploads_digest(uploads):
+    digest = hashlib.sha256()
+    for name, data in uploads:
+        digest.update(name.encode() + b"\0" + hashlib.sha256(data).digest())
+    return digest.digest()
+
+
+# 🔹 Dataset for one or more uploads: (rows, order lines, order summary, dropped duplicate lines).
+# A single upload is processed exactly as before (chosen sheet, no Source File column).
+def prepare_uploads(uploads, sheet_name=None, today=None):
+    if len(uploads) == 1:
+        name, data = uploads[0]
+        return prepare_dataset(data, file_extension(name), sheet_name, today) + (None,)
+
+    uploads = unique_names(uploads)
+    today = report_day(today)
+
+    def build():
+        df, dropped = consolidate(parse_uploads(uploads, today=today))
+        order_lines = build_order_lines(df, today=today)
+        return df, order_lines, build_order_summary(order_lines), dropped
+
+    return cached_object("fleet", uploads_digest(uploads), {"today": today.date().isoformat()}, build)
+
+
+def prepare_uploads_index(uploads, sheet_name=None, today=None):
+    if len(uploads) == 1:
+        name, data = uploads[0]
+        return prepare_query_index(data, file_extension(name), sheet_name, today)
+    today = report_day(today)
+    return cached_object("fleet-query-index", uploads_digest(uploads),
+                         {"sheet": sheet_name, "today": today.date().isoformat()},
+                         lambda: QueryIndex(prepare_uploads(uploads, sheet_name, today)[1]))
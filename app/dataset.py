@@ -0,0 +1,38 @@
+# app/dataset.py
+# Everything the dashboard derives from one upload — cleaned rows, order lines, order summary and
+# the Q&A index — built once per file content and kept in the shared report cache, so the
+# dashboard, the watch-folder worker and the query API never prepare the same export twice.
+import pandas as pd
+
+from .loader import read_export, resolve_sheet
+from .order_lines import prepare_orders, build_order_lines, build_order_summary
+from .query import QueryIndex
+from .report_cache import cached_object
+
+
+# 🔹 Day the cached frames are built for: Days Pending is counted up to it, so it is part of their key
+def report_day(today=None):
+    return pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today).normalize()
+
+
+# 🔹 Parsed + cleaned rows, order lines and order summary, cached on disk by file content and day
+def prepare_dataset(file_bytes, extension, sheet_name=None, today=None):
+    sheet_name = resolve_sheet(file_bytes, extension, sheet_name)
+    today = report_day(today)
+
+    def build():
+        df = prepare_orders(read_export(file_bytes, extension, sheet_name), today=today)
+        order_lines = build_order_lines(df, today=today)
+        return df, order_lines, build_order_summary(order_lines)
+
+    return cached_object("dataset", file_bytes,
+                         {"extension": extension, "sheet": sheet_name, "today": today.date().isoformat()}, build)
+
+
+# 🔹 Q&A index over the order lines, cached on disk by file content and day
+def prepare_query_index(file_bytes, extension, sheet_name=None, today=None):
+    sheet_name = resolve_sheet(file_bytes, extension, sheet_name)
+    today = report_day(today)
+    return cached_object("query-index", file_bytes,
+                         {"extension": extension, "sheet": sheet_name, "today": today.date().isoformat()},
+                         lambda: QueryIndex(prepare_dataset(file_bytes, extension, sheet_name, today)[1]))
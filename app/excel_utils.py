@@ -0,0 +1,126 @@
+# app/excel_utils.py
+from io import BytesIO
+
+import pandas as pd
+
+# xlsxwriter is imported inside the writers so the dashboard starts without it
+
+
+# 🔹 Native Excel number formats — values stay numeric, only the display is formatted
+AMOUNT_FORMAT = '#,##0.00'
+DATE_FORMAT = 'dd-mm-yyyy'
+
+
+# 🔹 Indian grouping (1,23,45,678.00) for amounts of up to `digits` integer digits, negatives as -₹…
+# Excel has no lakh separator, so the commas are literals at fixed digit positions
+def indian_format(symbol='', digits=5):
+    body = '#,##0' if digits <= 5 else '##' + '\\,##' * ((digits - 5) // 2) + '\\,##0'
+    prefix = f'"{symbol}"' if symbol else ''
+    return f'{prefix}{body}.00;-{prefix}{body}.00'
+
+
+# A number format holds at most two conditions, so these are the formats below 1,00,000; write_sheet
+# adds one conditional format per further band (lakhs, crores, …) to the columns that use them
+INR_FORMAT = indian_format('₹')
+INDIAN_AMOUNT_FORMAT = indian_format()
+INDIAN_FORMATS = {INR_FORMAT: '₹', INDIAN_AMOUNT_FORMAT: ''}
+# (lowest rounded absolute amount, integer digits) of each band; the last one is open-ended
+INDIAN_BANDS = [(10 ** (digits - 2), digits) for digits in (7, 9, 11, 13, 15)]
+
+AOG_COLOR = '#FFA500'  # same orange as the PDF highlight
+
+
+# 🔹 Column values as a plain list with NaN/NaT → None so xlsxwriter writes blanks
+def column_values(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(object)
+    if pd.api.types.is_datetime64_any_dtype(series):
+        series = series.dt.tz_localize(None) if series.dt.tz is not None else series
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+# 🔹 Writes one DataFrame as a sheet, row by row (required by constant_memory mode)
+def write_sheet(workbook, sheet_name, data, number_formats=None, hidden_columns=(), highlight_column="PRIORITY"):
+    from xlsxwriter.utility import xl_col_to_name
+
+    worksheet = workbook.add_worksheet(sheet_name)
+    header_format = workbook.add_format({'bold': True, 'bg_color': '#D3E9FF', 'border': 1})
+    number_formats = number_formats or {}
+    columns = list(data.columns)
+
+    # Column-level formats apply to every cell written without its own format
+    for idx, col in enumerate(columns):
+        fmt = number_formats.get(col)
+        if fmt is None and pd.api.types.is_datetime64_any_dtype(data[col]):
+            fmt = DATE_FORMAT
+        width = min(max(len(str(col)) + 2, 12), 40)
+        options = {'hidden': True} if col in hidden_columns else {}
+        worksheet.set_column(idx, idx, width, workbook.add_format({'num_format': fmt}) if fmt else None, options)
+
+    worksheet.write_row(0, 0, columns, header_format)
+    value_columns = [column_values(data[col]) for col in columns]
+    for row_idx, row in enumerate(zip(*value_columns), start=1):
+        worksheet.write_row(row_idx, 0, row)
+
+    # ₹ / Indian-grouped columns: the pattern for each magnitude band, by the rounded absolute amount
+    for idx, col in enumerate(columns):
+        symbol = INDIAN_FORMATS.get(number_formats.get(col))
+        if symbol is None or not len(data):
+            continue
+        amount = f'ABS(ROUND({xl_col_to_name(idx)}2,2))'
+        uppers = [lower for lower, _ in INDIAN_BANDS[1:]] + [None]
+        for (lower, digits), upper in zip(INDIAN_BANDS, uppers):
+            criteria = f'=AND({amount}>={lower},{amount}<{upper})' if upper else f'={amount}>={lower}'
+            worksheet.conditional_format(1, idx, len(data), idx, {
+                'type': 'formula',
+                'criteria': criteria,
+                'format': workbook.add_format({'num_format': indian_format(symbol, digits)}),
+            })
+
+    # 🟠 AOG highlight as a single conditional format over the data range (no per-cell styling)
+    if highlight_column in columns and len(data):
+        letter = xl_col_to_name(columns.index(highlight_column))
+        worksheet.conditional_format(1, 0, len(data), len(columns) - 1, {
+            'type': 'formula',
+            'criteria': f'=${letter}2="AOG"',
+            'format': workbook.add_format({'bg_color': AOG_COLOR}),
+        })
+    worksheet.freeze_panes(1, 0)
+    return worksheet
+
+
+# 🔹 Native Excel chart over a written sheet: chart = {'type': 'column' | 'line', 'categories': column,
+# 'values': [columns], 'title': text, 'stacked': bool}; placed to the right of the data
+def add_chart(workbook, worksheet, sheet_name, data, chart):
+    columns = list(data.columns)
+    subtype = {'subtype': 'stacked'} if chart.get('stacked') else {}
+    excel_chart = workbook.add_chart({'type': chart['type'], **subtype})
+    category_col = columns.index(chart['categories'])
+    for col in chart['values']:
+        idx = columns.index(col)
+        excel_chart.add_series({
+            'name': [sheet_name, 0, idx],
+            'categories': [sheet_name, 1, category_col, len(data), category_col],
+            'values': [sheet_name, 1, idx, len(data), idx],
+        })
+    excel_chart.set_title({'name': chart.get('title', sheet_name)})
+    excel_chart.set_size({'width': 720, 'height': 360})
+    worksheet.insert_chart(1, len(columns) + 1, excel_chart)
+
+
+# 🔹 Used for daily and monthly Excel downloads: sheets is a list of (sheet name, DataFrame);
+# charts optionally maps a sheet name to a chart spec (see add_chart)
+def generate_excel_report(sheets, number_formats=None, hidden_columns=(), charts=None):
+    import xlsxwriter
+
+    buffer = BytesIO()
+    # constant_memory flushes each row to a temp file once the next row starts
+    workbook = xlsxwriter.Workbook(buffer, {'constant_memory': True})
+    for sheet_name, data in sheets:
+        worksheet = write_sheet(workbook, sheet_name, data, number_formats=number_formats,
+                                hidden_columns=hidden_columns)
+        if charts and sheet_name in charts and len(data) and charts[sheet_name]['values']:
+            add_chart(workbook, worksheet, sheet_name, data, charts[sheet_name])
+    workbook.close()
+    buffer.seek(0)
+    return buffer
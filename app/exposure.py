@@ -0,0 +1,53 @@
+# app/exposure.py
+# Open-order exposure: value of material ordered but not yet received,
+# (Order Qty − GRN Qty, floored at 0) × Unit Price × exchange rate, per order line, rolled up by
+# supplier, aircraft and order month. Quantities come from the canonical order lines (Order Qty
+# once per line, GRN Qty summed over batches) and prices use the monthly report's INR conversion.
+import pandas as pd
+
+from .reports import DEFAULT_USD_RATE, inr_values, exact_total
+
+VALUE_COLUMN = 'Open Value (INR)'
+LINE_COLUMNS = ['Order No.', 'Part No.', 'Description', 'Supplier', 'A/C Reg. No', 'Order Date', 'PRIORITY',
+                'Order Qty', 'GRN Qty', 'Open Qty', 'Currency', 'Unit Price', 'Exchange Rate', VALUE_COLUMN]
+
+
+# 🔹 Order lines with something still to receive, valued in INR (one vectorized pass over all lines)
+def open_order_lines(order_lines, usd_rate=DEFAULT_USD_RATE):
+    valued = inr_values(order_lines, usd_rate)
+    open_qty = (valued['Quantity'] - valued['GRN Qty']).clip(lower=0)
+    valued['Open Qty'] = open_qty
+    valued[VALUE_COLUMN] = open_qty * valued['Unit Price'] * valued['Exchange Rate']
+    valued['Month'] = valued['Order Date'].dt.to_period('M').astype(str).replace('NaT', '(no date)')
+    # Lines for several aircraft keep their combined registration, so no value is counted twice
+    aircraft = valued['A/C Reg. No'] if 'A/C Reg. No' in valued.columns else pd.Series('', index=valued.index)
+    valued['Aircraft'] = aircraft.fillna('').astype(str).str.strip().replace('', '(none)')
+    open_lines = valued[open_qty > 0]
+    return open_lines.sort_values(VALUE_COLUMN, ascending=False, kind='stable').reset_index(drop=True)
+
+
+# 🔹 Exposure per group: open lines, open qty, value and share of the total
+def exposure_by(open_lines, column, by_value=True):
+    grouped = open_lines.groupby(column, sort=True)
+    rolled = pd.DataFrame({
+        'Open Lines': grouped.size(),
+        'Open Qty': grouped['Open Qty'].sum(),
+        VALUE_COLUMN: grouped[VALUE_COLUMN].sum(),
+    })
+    total = rolled[VALUE_COLUMN].sum()
+    rolled['Share %'] = (rolled[VALUE_COLUMN] / total * 100).round(1) if total else 0.0
+    if by_value:
+        rolled = rolled.sort_values(VALUE_COLUMN, ascending=False, kind='stable')
+    return rolled.rename_axis(column).reset_index()
+
+
+# 🔹 (open lines, by supplier, by aircraft, by month, total exposure)
+def exposure_summary(order_lines, usd_rate=DEFAULT_USD_RATE):
+    open_lines = open_order_lines(order_lines, usd_rate)
+    return (
+        open_lines[[col for col in LINE_COLUMNS if col in open_lines.columns]],
+        exposure_by(open_lines, 'Supplier'),
+        exposure_by(open_lines, 'Aircraft'),
+        exposure_by(open_lines, 'Month', by_value=False),
+        exact_total(open_lines[VALUE_COLUMN]),
+    )
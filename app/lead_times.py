@@ -0,0 +1,108 @@
+# app/lead_times.py
+# Supplier lead-time cube from the four activity dates on each batch row:
+#   Order → Ship (Order Date → MAWB Date), Ship → GRN (MAWB Date → GRN Date),
+#   GRN → Stock-In (GRN Date → Stock-In Date).
+# Durations are computed once per upload and summarized (count, mean, percentiles) for every
+# combination of supplier, mode of transport, priority and month, with "All" standing for a
+# rolled-up dimension. Drill-downs in the dashboard are then index lookups on the cube.
+from itertools import combinations
+
+import pandas as pd
+
+from .order_lines import MAWB_DATE_COLUMN
+
+LEGS = [
+    ('Order → Ship', 'Order Date', MAWB_DATE_COLUMN),
+    ('Ship → GRN', MAWB_DATE_COLUMN, 'GRN Date'),
+    ('GRN → Stock-In', 'GRN Date', 'Stock-In Date'),
+]
+DIMENSIONS = ['Supplier', 'Mode of Transport', 'Priority', 'Month']
+ALL = 'All'
+PERCENTILES = {'P50': 0.5, 'P75': 0.75, 'P90': 0.9, 'P95': 0.95}
+STAT_COLUMNS = ['Count', 'Mean', 'Min'] + list(PERCENTILES) + ['Max']
+
+
+def dimension_values(df, col):
+    if col not in df.columns:
+        return pd.Series('(unknown)', index=df.index)
+    return df[col].fillna('').astype(str).str.strip().str.upper().replace('', '(unknown)')
+
+
+# 🔹 One row per (batch row, leg) with a known, non-negative duration in days.
+# Month is the month the leg completed (shipment month, GRN month, stock-in month).
+def leg_durations(df):
+    dims = pd.DataFrame({
+        'Supplier': dimension_values(df, 'Supplier'),
+        'Mode of Transport': dimension_values(df, 'Mode of Transport'),
+        'Priority': dimension_values(df, 'PRIORITY').eq('AOG').map({True: 'AOG', False: 'Routine'}),
+    })
+    legs = []
+    for leg, start, end in LEGS:
+        if start not in df.columns or end not in df.columns:
+            continue
+        days = (df[end] - df[start]).dt.days
+        known = days.notna() & (days >= 0)  # negative spans are data-entry errors
+        legs.append(dims[known].assign(Leg=leg, Month=df.loc[known, end].dt.to_period('M').astype(str),
+                                       Days=days[known]))
+    if not legs:
+        return pd.DataFrame(columns=['Leg'] + DIMENSIONS + ['Days'])
+    return pd.concat(legs, ignore_index=True)[['Leg'] + DIMENSIONS + ['Days']]
+
+
+# 🔹 Duration statistics for all 16 grouping sets of the four dimensions, indexed by (Leg, *DIMENSIONS)
+def lead_time_cube(df):
+    durations = leg_durations(df)
+    # Category codes make the 16 group-bys cheap; only observed combinations are kept
+    for col in ['Leg'] + DIMENSIONS:
+        durations[col] = durations[col].astype('category')
+    parts = []
+    for size in range(len(DIMENSIONS) + 1):
+        for dims in combinations(DIMENSIONS, size):
+            grouped = durations.groupby(['Leg'] + list(dims), sort=False, observed=True)['Days']
+            stats = grouped.agg(['count', 'mean', 'min', 'max'])
+            stats.columns = ['Count', 'Mean', 'Min', 'Max']
+            quantiles = grouped.quantile(list(PERCENTILES.values())).unstack()
+            quantiles.columns = list(PERCENTILES)
+            stats = stats.join(quantiles).reset_index()
+            for dim in ['Leg'] + list(dims):
+                stats[dim] = stats[dim].astype(str)
+            for dim in DIMENSIONS:
+                if dim not in dims:
+                    stats[dim] = ALL
+            parts.append(stats)
+    cube = pd.concat(parts, ignore_index=True)
+    cube['Mean'] = cube['Mean'].round(1)
+    return cube.set_index(['Leg'] + DIMENSIONS)[STAT_COLUMNS].sort_index()
+
+
+# 🔹 Values present for a dimension (for drill-down pickers), "All" first
+def cube_options(cube, dim):
+    values = cube.index.get_level_values(dim).unique()
+    return [ALL] + sorted(v for v in values if v != ALL)
+
+
+# 🔹 Rows in journey order (Order → Ship, Ship → GRN, GRN → Stock-In) rather than alphabetical
+def in_leg_order(rows, by=()):
+    order = {leg: idx for idx, (leg, _, _) in enumerate(LEGS)}
+    return rows.sort_values(['Leg'] + list(by), key=lambda col: col.map(order) if col.name == 'Leg' else col,
+                            kind='stable').reset_index(drop=True)
+
+
+# 🔹 Statistics per leg for one selection, e.g. {'Supplier': 'SAT AIR', 'Priority': 'AOG'}
+def lead_time_lookup(cube, selection):
+    key = tuple(selection.get(dim, ALL) for dim in DIMENSIONS)
+    try:
+        return in_leg_order(cube.xs(key, level=DIMENSIONS).reset_index())
+    except KeyError:
+        return pd.DataFrame(columns=['Leg'] + STAT_COLUMNS)
+
+
+# 🔹 Statistics per leg and value of `by`, with the other dimensions fixed to the selection
+def lead_time_breakdown(cube, by, selection):
+    levels = [dim for dim in DIMENSIONS if dim != by]
+    key = tuple(selection.get(dim, ALL) for dim in levels)
+    try:
+        rows = cube.xs(key, level=levels).reset_index()
+    except KeyError:
+        return pd.DataFrame(columns=['Leg', by] + STAT_COLUMNS)
+    return in_leg_order(rows[rows[by] != ALL], by=[by])
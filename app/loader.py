@@ -0,0 +1,42 @@
+# app/loader.py
+from io import BytesIO
+
+import pandas as pd
+
+DEFAULT_SHEET = "PURCHASE_ORDER"
+SUPPORTED_EXTENSIONS = ["xlsx", "xls", "csv"]
+
+
+def file_extension(file_name):
+    return file_name.split('.')[-1].lower()
+
+
+# 🔹 Sheet names of an uploaded workbook + index of the default Laminaar sheet
+def list_sheets(file_bytes):
+    sheet_list = pd.ExcelFile(BytesIO(file_bytes)).sheet_names
+    cleaned_names = [name.strip() for name in sheet_list]
+    default_index = cleaned_names.index(DEFAULT_SHEET) if DEFAULT_SHEET in cleaned_names else 0
+    return sheet_list, default_index
+
+
+# 🔹 Reads a raw Laminaar export (csv / xls / xlsx) from bytes
+def read_export(file_bytes, extension, sheet_name=None):
+    if extension == "csv":
+        return pd.read_csv(BytesIO(file_bytes))
+    if extension in ["xls", "xlsx"]:
+        if sheet_name is None:
+            sheet_list, default_index = list_sheets(file_bytes)
+            sheet_name = sheet_list[default_index]
+        return pd.read_excel(BytesIO(file_bytes), sheet_name=sheet_name)
+    raise ValueError("Unsupported file type. Please upload an XLSX, XLS, or CSV file.")
+
+
+# 🔹 Sheet actually read for an upload — None for csv, the default Laminaar sheet when not chosen
+def resolve_sheet(file_bytes, extension, sheet_name=None):
+    if extension == "csv":
+        return None
+    if sheet_name is None:
+        sheet_list, default_index = list_sheets(file_bytes)
+        sheet_name = sheet_list[default_index]
+    return sheet_name
+
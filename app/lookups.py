@@ -0,0 +1,87 @@
+# app/lookups.py
+# Part, order and aircraft status lookups over order lines. Shared by the Q&A box and the
+# local HTTP API; callers pass just the lines of interest (e.g. rows picked via QueryIndex).
+import pandas as pd
+
+from .utils import trim_text, classify_line, classify_ac, classify_procurement, format_unit_price, \
+    determine_shipment_status
+
+PART_COLUMNS = ['Order No.', 'Supplier', 'Part No.', 'Description', 'Order Qty', 'GRN Qty', 'Status',
+                'Unit Price (Currency)']
+ORDER_ITEM_COLUMNS = ['Part Number', 'Description', 'Ordered Qty', 'GRN Received Qty', 'Status']
+
+
+# 🔹 PO-wise status of one part: one row per order line, Order Qty once, GRN summed
+def part_status(part_lines):
+    grouped = part_lines[
+        ['Order No.', 'Part No.', 'Supplier', 'Order Qty', 'Description', 'GRN Qty', 'Unit Price', 'Currency']
+    ].copy()
+    grouped['Supplier'] = grouped['Supplier'].apply(trim_text)  # ✅ Trim supplier to 16 chars
+    grouped['Status'] = grouped.apply(determine_shipment_status, axis=1)
+    grouped['Unit Price (Currency)'] = grouped.apply(format_unit_price, axis=1)
+    return grouped[PART_COLUMNS]
+
+
+# 🔹 Status of one order from its lines: dates, pending days, aircraft, supplier, per-line status
+def order_status(order_data):
+    order_data = order_data.copy()
+    order_date = pd.to_datetime(order_data['Order Date'].iloc[0], errors='coerce')
+
+    # Order Qty counted once per line
+    fully_shipped = order_data['GRN Qty'].sum() >= order_data['Order Qty'].sum()
+    days_pending = None
+    if not fully_shipped and pd.notnull(order_date):
+        days_pending = (pd.Timestamp.today() - order_date).days
+
+    aircraft = order_data['A/C Reg. No'].dropna().astype(str).str.strip().unique().tolist()
+    suppliers = order_data['Supplier'].dropna().unique()
+    supplier_name = suppliers[0] if len(suppliers) == 1 else ', '.join(suppliers)
+
+    order_data['Line Status'] = order_data.apply(classify_line, axis=1)
+    line_counts = order_data['Line Status'].value_counts()
+
+    # Per item details — already one row per part, sorted by Status in descending alphabetical order
+    items = order_data[['Part No.', 'Order Qty', 'Description', 'GRN Qty', 'Line Status']].rename(columns={
+        'Line Status': 'Status',
+        'Part No.': 'Part Number',
+        'Order Qty': 'Ordered Qty',
+        'GRN Qty': 'GRN Received Qty',
+    }).sort_values(by='Status', ascending=False)
+
+    return {
+        'order_date': order_date,
+        'fully_shipped': bool(fully_shipped),
+        'days_pending': days_pending,
+        'aircraft': aircraft,
+        'supplier': supplier_name,
+        'line_counts': {status: int(line_counts.get(status, 0))
+                        for status in ['Fully Shipped', 'Partial GRN', 'Not Shipped']},
+        'items': items[ORDER_ITEM_COLUMNS],
+    }
+
+
+# 🔹 Lines dedicated to one aircraft (registration matches and no other aircraft on the line)
+def aircraft_lines(lines, aircraft_code, ac_col='A/C Reg. No'):
+    return lines[
+        lines[ac_col].astype(str).str.upper().str.contains(aircraft_code) &
+        (lines[ac_col].astype(str).str.count(',') == 0)
+        ]
+
+
+# 🔹 Order-wise summary (classify_ac) and line-level status (classify_procurement) for one aircraft
+def aircraft_summary(single_ac_df, ac_col='A/C Reg. No'):
+    agg_dict = {
+        'Order Qty': 'sum',
+        'GRN Qty': 'sum',
+        ac_col: 'first',
+        'Supplier': 'first'
+    }
+    if 'PO Date' in single_ac_df.columns:
+        agg_dict['PO Date'] = 'first'
+
+    ac_summary = single_ac_df.groupby('Order No.').agg(agg_dict).reset_index()
+    ac_summary['Status'] = ac_summary.apply(classify_ac, axis=1)
+
+    related_lines = single_ac_df.copy()
+    related_lines['Status'] = related_lines.apply(classify_procurement, axis=1)
+    return ac_summary, related_lines
@@ -1,13 +1,333 @@
+import datetime
 from io import BytesIO
 
 import streamlit as st
 import pandas as pd
-import io
-import calendar
 
-from .utils import trim_text, format_inr, classify, classify_line, po_part_status, grn_status, stock_status, \
-    classify_ac, classify_procurement, format_unit_price, determine_shipment_status
-from .pdf_utils import generate_monthly_report_pdf, generate_daily_activity_pdf
+from .utils import format_inr, format_amounts, po_part_status
+from .report_cache import excel_report, cache_stats
+from .excel_utils import INDIAN_AMOUNT_FORMAT, INR_FORMAT
+from .loader import SUPPORTED_EXTENSIONS, file_extension, list_sheets
+from .dataset import prepare_dataset
+from .consolidate import SOURCE_COLUMN, prepare_uploads, prepare_uploads_index, uploads_digest
+from .order_lines import ORDER_LINE_KEYS, unshipped_lines, partial_grn_lines
+from .query import parse_query, run_query, is_compound
+from .lookups import part_status, order_status, aircraft_lines, aircraft_summary
+from .table_view import paged_table
+from .snapshot_diff import diff_snapshots
+from .exposure import VALUE_COLUMN, exposure_summary
+from .quality import SEVERITIES, scan_exceptions, exceptions_excel
+from .columnar import FORMATS, SCHEMAS, derived_views, view_file, views_bundle
+from .rollup import PERIODS, rollup_cube, period_report, period_excel
+from .lead_times import DIMENSIONS, ALL, lead_time_cube, cube_options, lead_time_lookup, lead_time_breakdown
+from .reports import DEFAULT_USD_RATE, activity_dates, daily_activity, has_activity, daily_pdf, daily_excel, \
+    order_months, monthly_report, monthly_excel, monthly_pdf
+
+
+# 🔹 Download whose file is built only once asked for. The first click builds it; the download button then
+# stays on later reruns (clicking it reruns the script too), rebuilding from the report cache.
+def download_on_request(key, prepare_label, build, **download_args):
+    if st.button(prepare_label, key=f"{key}_prepare"):
+        st.session_state[f"{key}_prepared"] = True
+    if st.session_state.get(f"{key}_prepared"):
+        st.download_button(data=build(), key=f"{key}_download", **download_args)
+
+
+# 🔹 Cache key for an upload: its digest and today's date, since Days Pending (and the scans and
+# views built from it) move daily — a server left running past midnight rebuilds them for the new day
+def day_key(uploads):
+    return f"{uploads_digest(uploads).hex()}-{datetime.date.today().isoformat()}"
+
+
+# 🔹 Parsed + cleaned upload, order lines and order summary — built once per uploaded file / sheet.
+# Frames from the cache_resource loaders are shared across reruns and sessions: never modify them in place.
+@st.cache_resource(show_spinner="Processing upload…")
+def load_dataset(upload_key, extension, _file_bytes):
+    return prepare_dataset(_file_bytes, extension)
+
+
+# 🔹 One or more station exports as a single dataset; _uploads is a tuple of (file name, bytes).
+# Loaders are keyed by upload_key (the uploads' digest and day, see day_key): the underscore
+# keeps Streamlit from hashing the raw bytes again for every cached call.
+@st.cache_resource(show_spinner="Processing uploads…")
+def load_uploads(upload_key, sheet_name, _uploads):
+    return prepare_uploads(_uploads, sheet_name)
+
+
+# 🔹 Q&A row-set index over the order lines — read-only, so shared across reruns and sessions
+@st.cache_resource(show_spinner=False)
+def load_query_index(upload_key, sheet_name, _uploads):
+    return prepare_uploads_index(_uploads, sheet_name)
+
+
+@st.cache_data(show_spinner=False)
+def load_sheet_names(upload_key, _file_bytes):
+    return list_sheets(_file_bytes)
+
+
+# 🔹 Open-order exposure for the whole upload at one exchange rate
+@st.cache_resource(show_spinner=False)
+def load_exposure(upload_key, sheet_name, usd_rate, _uploads):
+    return exposure_summary(load_uploads(upload_key, sheet_name, _uploads)[1], usd_rate)
+
+
+# 🔹 Value of ordered but not yet received material by supplier, aircraft and order month
+def exposure_section(upload_key, uploads, sheet_name):
+    st.subheader("💼 Open-Order Exposure")
+    usd_rate = st.number_input("USD to INR exchange rate for exposure", min_value=50.0, max_value=200.0,
+                               value=DEFAULT_USD_RATE, step=0.5, key="exposure_usd_rate")
+    open_lines, by_supplier, by_aircraft, by_month, total = load_exposure(upload_key, sheet_name, usd_rate, uploads)
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("💰 Open exposure", format_inr(total))
+    c2.metric("📋 Open order lines", f"{len(open_lines):,}")
+    c3.metric("🏭 Suppliers with open lines", f"{len(by_supplier):,}")
+
+    def shown(frame):
+        display = frame.copy()
+        display[VALUE_COLUMN] = format_amounts(display[VALUE_COLUMN])
+        return display
+
+    tab_supplier, tab_aircraft, tab_month, tab_lines = st.tabs(["By Supplier", "By Aircraft", "By Month", "Open Lines"])
+    with tab_supplier:
+        st.dataframe(shown(by_supplier), hide_index=True)
+    with tab_aircraft:
+        st.dataframe(shown(by_aircraft), hide_index=True)
+    with tab_month:
+        st.bar_chart(by_month.set_index('Month')[VALUE_COLUMN])
+        st.dataframe(shown(by_month), hide_index=True)
+    with tab_lines:
+        paged_table(open_lines, key="exposure_lines")
+
+    download_on_request(
+        "exposure_report", "📥 Prepare Exposure Report (Excel)",
+        lambda: excel_report('exposure-xlsx', [
+            ('By Supplier', by_supplier),
+            ('By Aircraft', by_aircraft),
+            ('By Month', by_month),
+            ('Open Lines', open_lines),
+        ], number_formats={VALUE_COLUMN: INR_FORMAT, 'Unit Price': INDIAN_AMOUNT_FORMAT},
+            params={'usd_rate': usd_rate}),
+        label="⬇️ Download Exposure Report (Excel)",
+        file_name="open_order_exposure.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+# 🔹 Data-quality exceptions for the upload — every rule evaluated once, as vectorized masks
+@st.cache_resource(show_spinner="Scanning for data-quality exceptions…")
+def load_exceptions(upload_key, sheet_name, _uploads):
+    df, order_lines, _, _ = load_uploads(upload_key, sheet_name, _uploads)
+    return scan_exceptions(df, order_lines)
+
+
+def quality_section(upload_key, uploads, sheet_name):
+    st.subheader("🧪 Data-Quality Exceptions")
+    exceptions, counts = load_exceptions(upload_key, sheet_name, uploads)
+    if exceptions.empty:
+        st.success("✅ No data-quality exceptions found in this upload.")
+        return
+
+    c1, c2, c3 = st.columns(3)
+    c1.metric("⚠️ Exceptions", f"{len(exceptions):,}")
+    c2.metric("🔴 High severity", f"{(exceptions['Severity'] == 'High').sum():,}")
+    c3.metric("📦 Orders affected", f"{exceptions['Order No.'].nunique():,}")
+    st.dataframe(counts[counts['Exceptions'] > 0], hide_index=True)
+
+    with st.expander("📋 Exception details"):
+        f1, f2 = st.columns(2)
+        severities = f1.multiselect("Severity", SEVERITIES, default=SEVERITIES, key="quality_severity")
+        flagged_rules = counts.loc[counts['Exceptions'] > 0, 'Rule'].tolist()
+        rules = f2.multiselect("Rule", flagged_rules, default=flagged_rules, key="quality_rules")
+        shown = exceptions[exceptions['Severity'].isin(severities) & exceptions['Rule'].isin(rules)]
+        paged_table(shown, key="quality_exceptions")
+
+    download_on_request(
+        "quality_report", "📥 Prepare Exceptions Report (Excel)", lambda: exceptions_excel(exceptions, counts),
+        label="⬇️ Download Exceptions Report (Excel)",
+        file_name="data_quality_exceptions.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+# 🔹 Monthly rollup cube for the upload at one exchange rate — built once, every period report below
+# rolls up its cells
+@st.cache_resource(show_spinner=False)
+def load_rollup(upload_key, sheet_name, usd_rate, _uploads):
+    return rollup_cube(load_uploads(upload_key, sheet_name, _uploads)[1], usd_rate)
+
+
+# 🔹 Year-to-date / trailing 12-month order value, by month and supplier, from the rollup cube
+def trend_section(upload_key, uploads, sheet_name):
+    st.subheader("📈 Year-to-Date & 12-Month Trend")
+    c1, c2, c3 = st.columns(3)
+    usd_rate = c3.number_input("USD to INR exchange rate for trends", min_value=50.0, max_value=200.0,
+                               value=DEFAULT_USD_RATE, step=0.5, key="trend_usd_rate")
+    cube = load_rollup(upload_key, sheet_name, usd_rate, uploads)
+    months = sorted(cube['Month'].unique())
+    if not months:
+        st.info("No dated orders in this upload.")
+        return
+
+    period = c1.radio("Period", list(PERIODS), format_func=PERIODS.get, horizontal=True, key="trend_period")
+    end_month = c2.selectbox("Ending with", months[::-1], key="trend_end_month")
+    report = period_report(cube, end_month, period, usd_rate)
+
+    st.caption(report['label'])
+    m1, m2, m3 = st.columns(3)
+    m1.metric("💰 Order value", format_inr(report['total_inr']))
+    m2.metric("📋 Order lines", f"{report['order_lines']:,}")
+    m3.metric("7.5% value", format_inr(report['percent_75']))
+
+    def shown(frame, columns=('Total (INR)', '7.5% Value')):
+        display = frame.copy()
+        for col in columns:
+            if col in display.columns:
+                display[col] = format_amounts(display[col])
+        return display
+
+    tab_month, tab_trend, tab_supplier, tab_currency, tab_priority = st.tabs(
+        ["By Month", "Supplier Trend", "By Supplier", "By Currency", "By Priority"])
+    with tab_month:
+        st.bar_chart(report['by_month'].set_index('Month')['Total (INR)'])
+        st.dataframe(shown(report['by_month']), hide_index=True)
+    with tab_trend:
+        st.line_chart(report['supplier_trend'].set_index('Month'))
+    with tab_supplier:
+        st.dataframe(shown(report['by_supplier']), hide_index=True)
+    with tab_currency:
+        st.dataframe(shown(report['by_currency']), hide_index=True)
+    with tab_priority:
+        st.dataframe(shown(report['by_priority']), hide_index=True)
+
+    download_on_request(
+        "trend_report", "📥 Prepare Trend Report (Excel)", lambda: period_excel(report),
+        label="⬇️ Download Trend Report (Excel)",
+        file_name=f"procurement_{period}_{end_month}.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+# 🔹 Lead-time cube for the upload — built once, every drill-down below is a lookup
+@st.cache_resource(show_spinner="Computing lead times…")
+def load_lead_times(upload_key, sheet_name, _uploads):
+    return lead_time_cube(load_uploads(upload_key, sheet_name, _uploads)[0])
+
+
+def lead_time_section(upload_key, uploads, sheet_name):
+    st.subheader("⏱️ Supplier Lead Times")
+    cube = load_lead_times(upload_key, sheet_name, uploads)
+    if cube.empty:
+        st.info("No lines have two consecutive activity dates yet.")
+        return
+
+    columns = st.columns(len(DIMENSIONS))
+    selection = {dim: col.selectbox(dim, cube_options(cube, dim), key=f"lead_time_{dim}")
+                 for dim, col in zip(DIMENSIONS, columns)}
+
+    summary = lead_time_lookup(cube, selection)
+    if summary.empty:
+        st.info("No lead-time data for this selection.")
+        return
+    for col, row in zip(st.columns(len(summary)), summary.itertuples(index=False)):
+        col.metric(f"{row.Leg} (median days)", f"{row.P50:.0f}",
+                   help=f"P90 {row.P90:.0f} days · {row.Count:,} batches")
+    st.dataframe(summary, hide_index=True)
+
+    by = st.selectbox("Break down by", [dim for dim in DIMENSIONS if selection[dim] == ALL] or DIMENSIONS,
+                      key="lead_time_by")
+    st.dataframe(lead_time_breakdown(cube, by, selection), hide_index=True)
+
+    download_on_request(
+        "lead_time_report", "📥 Prepare Lead-Time Cube (Excel)",
+        lambda: excel_report('lead-time-xlsx', [('Lead Time Cube', cube.reset_index())]),
+        label="⬇️ Download Lead-Time Cube (Excel)",
+        file_name="supplier_lead_times.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+
+
+# 🔹 Every derived view of the upload, reusing the lead-time and rollup cubes built for their sections
+@st.cache_resource(show_spinner="Preparing views…")
+def load_views(upload_key, sheet_name, usd_rate, _uploads):
+    df, order_lines, order_summary, _ = load_uploads(upload_key, sheet_name, _uploads)
+    return derived_views(df, order_lines, order_summary, usd_rate,
+                         lead_times=load_lead_times(upload_key, sheet_name, _uploads),
+                         rollup=load_rollup(upload_key, sheet_name, usd_rate, _uploads))
+
+
+# 🔹 Parquet / Arrow IPC downloads of the derived views for BI tools
+def columnar_section(upload_key, uploads, sheet_name):
+    st.subheader("🧊 Columnar Export (Parquet / Arrow)")
+    c1, c2, c3 = st.columns(3)
+    fmt = c1.radio("Format", list(FORMATS), format_func={'parquet': 'Parquet', 'arrow': 'Arrow IPC'}.get,
+                   horizontal=True, key="columnar_format")
+    view = c2.selectbox("View", list(SCHEMAS), key="columnar_view")
+    usd_rate = c3.number_input("USD to INR exchange rate for INR-valued views", min_value=50.0, max_value=200.0,
+                               value=DEFAULT_USD_RATE, step=0.5, key="columnar_usd_rate")
+    st.caption("Fixed column names and types per view (schemas.json in the bundle). "
+               "Arrow files are uncompressed and can be memory-mapped without copying.")
+
+    # Prepared state lives in session_state: clicking one download reruns the script, and both stay visible
+    if st.button("🧊 Prepare Columnar Export", key="columnar_prepare"):
+        st.session_state["columnar_prepared"] = True
+    if st.session_state.get("columnar_prepared"):
+        views = load_views(upload_key, sheet_name, usd_rate, uploads)
+        mime = {'parquet': 'application/vnd.apache.parquet', 'arrow': 'application/vnd.apache.arrow.file'}[fmt]
+        st.download_button(f"⬇️ Download {view} ({len(views[view]):,} rows)", data=view_file(view, views[view], fmt),
+                           file_name=f"{view}{FORMATS[fmt]}", mime=mime, key="columnar_view_download")
+        st.download_button("⬇️ Download All Views (zip)", data=views_bundle(views, fmt),
+                           file_name=f"procurement_views_{fmt}.zip", mime="application/zip",
+                           key="columnar_bundle_download")
+
+
+# 🔹 Compare the current upload with a previous export (new / removed / changed lines, status moves)
+def snapshot_diff_section(order_lines, order_summary):
+    st.subheader("🔁 Compare with a Previous Upload")
+    previous_file = st.file_uploader("Upload the earlier export (e.g. yesterday's) to see what changed",
+                                     type=SUPPORTED_EXTENSIONS, key="previous_upload")
+    if not previous_file:
+        return
+
+    previous = ((previous_file.name, previous_file.getvalue()),)
+    _, old_lines, old_summary = load_dataset(day_key(previous), file_extension(previous_file.name),
+                                             previous[0][1])
+    line_changes, transitions, counts = diff_snapshots(old_lines, old_summary, order_lines, order_summary)
+
+    change_counts = line_changes['Change'].value_counts()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("🆕 New lines", int(change_counts.get('New', 0)))
+    c2.metric("🗑️ Removed lines", int(change_counts.get('Removed', 0)))
+    c3.metric("✏️ Changed lines", int(change_counts.get('Changed', 0)))
+    c4.metric("✅ Lines with new GRN", int((line_changes['GRN Qty Δ'] > 0).sum()))
+
+    if line_changes.empty and transitions.empty:
+        st.success("✅ No differences between the two uploads.")
+        return
+
+    st.markdown("### 🔀 Order Status Transitions")
+    st.dataframe(counts, hide_index=True)
+    if not transitions.empty:
+        selected_from = st.selectbox("Show orders that moved from", sorted(transitions['Status (before)'].unique()))
+        st.dataframe(transitions[transitions['Status (before)'] == selected_from], hide_index=True)
+
+    st.markdown("### 📋 Changed Order Lines")
+    paged_table(line_changes, key="snapshot_diff", default_columns=[
+        'Order No.', 'Part No.', 'Change', 'Changed Fields', 'Description', 'GRN Qty Δ',
+        'Order Qty (before)', 'Order Qty (after)', 'GRN Qty (before)', 'GRN Qty (after)'
+    ])
+
+    download_on_request(
+        "diff_report", "📥 Prepare Change Report (Excel)",
+        lambda: excel_report('diff-xlsx', [
+            ('Status Transitions', counts),
+            ('Order Status Changes', transitions),
+            ('Line Changes', line_changes),
+        ]),
+        label="⬇️ Download Change Report (Excel)",
+        file_name="upload_change_report.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
 
 def main():
@@ -15,67 +335,49 @@ def main():
 
     st.title("✈️ Procurement Monitoring Dashboard")
 
-    uploaded_file = st.file_uploader(
+    stats = cache_stats()
+    st.sidebar.caption(f"🗄️ Report cache: {stats['hits']} hits / {stats['misses']} misses · "
+                       f"{stats['entries']} files, {stats['bytes'] / 1e6:.1f} MB")
+
+    uploaded_files = st.file_uploader(
         "Upload your Laminaar excel file in xlsx, xls, or csv format(using order tracker module), Select correct order type, date to, date from",
-        type=["xlsx", "xls", "csv"])
+        type=SUPPORTED_EXTENSIONS, accept_multiple_files=True)
 
-    if uploaded_file:
+    if uploaded_files:
         try:
-            file_extension = uploaded_file.name.split('.')[-1].lower()
-
-            if file_extension == "csv":
-                df = pd.read_csv(uploaded_file)
-            elif file_extension in ["xls", "xlsx"]:
-                xls = pd.ExcelFile(uploaded_file)
-                st.write("Available Sheets:", xls.sheet_names)
-
-                sheet_list = xls.sheet_names
-                cleaned_names = [name.strip() for name in sheet_list]
-                default_sheet = "PURCHASE_ORDER"
-
-                if default_sheet in cleaned_names:
-                    default_index = cleaned_names.index(default_sheet)
-                else:
-                    default_index = 0
+            uploads = tuple((f.name, f.getvalue()) for f in uploaded_files)
+            upload_key = day_key(uploads)
+            extension = file_extension(uploaded_files[0].name)
+            file_bytes = uploads[0][1]
+
+            if len(uploads) > 1:
+                # Station exports are combined; each file is read from its default Laminaar sheet
+                selected_sheet = None
+            elif extension == "csv":
+                selected_sheet = None
+            elif extension in ["xls", "xlsx"]:
+                sheet_list, default_index = load_sheet_names(upload_key, file_bytes)
+                st.write("Available Sheets:", sheet_list)
 
                 selected_sheet = st.selectbox("Select a sheet to process", sheet_list, index=default_index)
-                df = xls.parse(selected_sheet)
             else:
                 st.error("Unsupported file type. Please upload an XLSX, XLS, or CSV file.")
                 st.stop()
 
-            df.columns = df.columns.str.strip()
-            df['GRN Qty'] = df['GRN Qty'].fillna(0)
-            df['Order Qty'] = df['Order Qty'].fillna(0)
-
-            # Order Summary
-            # Clean up keys
-            df['Order No.'] = df['Order No.'].astype(str).str.strip().str.upper()
-            df['Part No.'] = df['Part No.'].astype(str).str.strip().str.upper()
-            df['Order Date'] = pd.to_datetime(df['Order Date'], errors='coerce')
-            df['Days Pending'] = (pd.Timestamp.today() - df['Order Date']).dt.days
+            # Every section below reads the same canonical order lines (one row per Order No. + Part No.)
+            df, order_lines, order_summary, dropped_lines = load_uploads(upload_key, selected_sheet, uploads)
 
-            # Step 1: Drop duplicate Order Qty lines per (Order No., Part No.)
-            dedup = df.drop_duplicates(subset=['Order No.', 'Part No.'])[['Order No.', 'Part No.', 'Order Qty']]
+            if dropped_lines is not None:
+                line_counts = order_lines[SOURCE_COLUMN].value_counts()
+                sources = ", ".join(f"{name} ({line_counts.get(name, 0):,} lines)"
+                                    for name in df[SOURCE_COLUMN].unique())
+                overlapping = dropped_lines[ORDER_LINE_KEYS].drop_duplicates().shape[0]
+                st.info(f"🛫 Combined {len(uploads)} exports: {sources}. {overlapping:,} order lines appeared in "
+                        f"more than one file and were kept from the file with the latest GRN Date.")
+                if not dropped_lines.empty:
+                    with st.expander("🔁 Duplicate order lines dropped"):
+                        paged_table(dropped_lines, key="dropped_lines")
 
-            # Step 2: Sum Order Qty once per part, per order
-            order_qty_sum = dedup.groupby('Order No.')['Order Qty'].sum().reset_index()
-
-            # Step 3: Sum GRN Qty normally (received in batches)
-            grn_qty_sum = df.groupby('Order No.')['GRN Qty'].sum().reset_index()
-
-            # Step 4: Other fields like Supplier and QA Status
-            others = df.groupby('Order No.').agg({
-                'Supplier': 'first',
-                'Order Date': 'first',
-                'QA Status': lambda x: ','.join(set(str(i).strip().lower() for i in x.dropna()))
-            }).reset_index()
-
-            # Step 5: Merge all
-            order_summary = pd.merge(order_qty_sum, grn_qty_sum, on='Order No.')
-            order_summary = pd.merge(order_summary, others, on='Order No.')
-
-            order_summary['Status'] = order_summary.apply(classify, axis=1)
             status_counts = order_summary['Status'].value_counts()
 
             ############################################################
@@ -89,9 +391,11 @@ def main():
             for status, count in status_counts.items():
                 st.markdown(f"- **{status}**: {count} orders")
 
+            quality_section(upload_key, uploads, selected_sheet)
+
             # Format Order Date
-            order_summary['Order Date'] = pd.to_datetime(order_summary['Order Date'], errors='coerce').dt.strftime(
-                '%d-%m-%Y')
+            order_summary = order_summary.assign(**{'Order Date': pd.to_datetime(
+                order_summary['Order Date'], errors='coerce').dt.strftime('%d-%m-%Y')})
 
             # Reorder columns (optional: place Order Date after Order No.)
             cols = ['Order No.', 'Order Date'] + [col for col in order_summary.columns if
@@ -100,7 +404,7 @@ def main():
             #######################################################################
             #######################################################################
             st.subheader("📊 Order Summary")
-            st.dataframe(order_summary[cols])
+            paged_table(order_summary[cols], key="order_summary")
 
             ######################################################################
             #####################################################################
@@ -118,30 +422,18 @@ def main():
             # Reorder if needed
             cols = ['Order No.', 'Order Date'] + [col for col in filtered_status_df.columns if
                                                   col not in ['Order No.', 'Order Date']]
-            st.dataframe(filtered_status_df[cols])
+            paged_table(filtered_status_df[cols], key="status_filter")
             ########################################################################
             ##########################################################################
             st.subheader("🚫 Not Yet Shipped — By Order No")
 
-            # Identify orders with GRN Qty = 0 and no MAWB/shipping info
-            unshipped_orders = df[
-                (df['GRN Qty'] == 0) &
-                (
-                        df['MAWB No. / Consignment No./  Bill of Lading No.'].isna() |
-                        (df['MAWB No. / Consignment No./  Bill of Lading No.'].astype(str).str.strip() == "")
-                )
-                ]['Order No.'].dropna().unique()
+            # Identify order lines with GRN Qty = 0 and no MAWB/shipping info
+            unshipped = unshipped_lines(order_lines)
+            unshipped_orders = unshipped['Order No.'].unique()
 
             if len(unshipped_orders) > 0:
                 selected_unshipped = st.selectbox("Select Order No. with no shipment info", sorted(unshipped_orders))
-                filtered_unshipped = df[
-                    (df['Order No.'] == selected_unshipped) &
-                    (df['GRN Qty'] == 0) &
-                    (
-                            df['MAWB No. / Consignment No./  Bill of Lading No.'].isna() |
-                            (df['MAWB No. / Consignment No./  Bill of Lading No.'].astype(str).str.strip() == "")
-                    )
-                    ]
+                filtered_unshipped = unshipped[unshipped['Order No.'] == selected_unshipped].copy()
 
                 # Show only selected columns
                 columns_to_show = [
@@ -154,7 +446,6 @@ def main():
                     if col not in filtered_unshipped.columns:
                         filtered_unshipped[col] = ""
 
-                filtered_unshipped = filtered_unshipped.copy()
                 filtered_unshipped['Order Date'] = pd.to_datetime(filtered_unshipped['Order Date'],
                                                                   errors='coerce').dt.strftime('%d-%m-%Y')
 
@@ -168,25 +459,8 @@ def main():
 
             st.subheader("📦 Shipped but GRN Not Fully Done — By Order No")
 
-            # Group by Order No + Part No to compare totals
-            grn_compare = df.groupby(['Order No.', 'Part No.']).agg({
-                'Order Qty': 'first',
-                'GRN Qty': 'sum',
-                'MAWB No. / Consignment No./  Bill of Lading No.': lambda x: ', '.join(set(x.dropna().astype(str))),
-                'Mode of Transport': lambda x: ', '.join(set(x.dropna().astype(str))),
-                'Supplier': 'first',
-                'Description': 'first'
-            }).reset_index()
-
             # Filter: shipped (has mode or MAWB) but ordered ≠ GRN
-            shipped_partial_grn = grn_compare[
-                (grn_compare['Order Qty'] != grn_compare['GRN Qty']) &
-                (
-                        (grn_compare['MAWB No. / Consignment No./  Bill of Lading No.'].str.strip() != '') |
-                        (grn_compare['Mode of Transport'].str.strip() != '')
-                )
-
-                ]
+            shipped_partial_grn = partial_grn_lines(order_lines)
 
             if not shipped_partial_grn.empty:
                 selected_partial_grn_order = st.selectbox(
@@ -194,30 +468,24 @@ def main():
                     sorted(shipped_partial_grn['Order No.'].unique())
                 )
 
-                st.dataframe(shipped_partial_grn[shipped_partial_grn['Order No.'] == selected_partial_grn_order][[
+                paged_table(shipped_partial_grn[shipped_partial_grn['Order No.'] == selected_partial_grn_order][[
                     'Order No.', 'Part No.', 'Description', 'Supplier',
                     'Order Qty', 'GRN Qty', 'MAWB No. / Consignment No./  Bill of Lading No.', 'Mode of Transport'
-                ]])
+                ]], key="partial_grn")
             else:
                 st.success("✅ All shipped items have matching GRN.")
             ################################################################################
             ####################################################################################
             st.subheader("🔎 Search by Part Number — PO Wise Status")
 
-            all_parts = sorted(df['Part No.'].dropna().unique())
+            all_parts = sorted(order_lines['Part No.'].dropna().unique())
             selected_part = st.selectbox("Select Part Number to view order-wise status", all_parts)
 
             if selected_part:
-                part_data = df[df['Part No.'] == selected_part]
-
-                # Drop duplicate Order Qty rows BEFORE grouping
-                dedup_part_data = part_data.drop_duplicates(subset=['Order No.', 'Part No.', 'Supplier', 'Order Qty'])
-
-                part_po_wise = dedup_part_data.groupby(['Order No.', 'Part No.', 'Supplier']).agg({
-                    'Order Qty': 'first',  # Only once per order
-                    'GRN Qty': 'sum',  # Received in multiple lots is fine
-                    'Description': 'first'
-                }).reset_index()
+                # One line per order: Order Qty once, GRN Qty summed over all lots
+                part_po_wise = order_lines[order_lines['Part No.'] == selected_part][
+                    ['Order No.', 'Part No.', 'Supplier', 'Order Qty', 'GRN Qty', 'Description']
+                ].reset_index(drop=True)
 
                 part_po_wise['Status'] = part_po_wise.apply(po_part_status, axis=1)
 
@@ -232,84 +500,15 @@ def main():
             ### a new module for giving details on date picker
             st.subheader("📅 Full Date-wise Activity Report")
 
-            # Ensure date columns are in datetime format
-            df['Order Date'] = pd.to_datetime(df['Order Date'], errors='coerce')
-            df['MAWB Date / Consignment Date/  Bill of Lading Date'] = pd.to_datetime(
-                df['MAWB Date / Consignment Date/  Bill of Lading Date'], errors='coerce')
-            df['GRN Date'] = pd.to_datetime(df['GRN Date'], errors='coerce')
-            df['Stock-In Date'] = pd.to_datetime(df['Stock-In Date'], errors='coerce')
-
-            # Create a list of all relevant dates
-            all_dates = pd.concat([
-                df['Order Date'],
-                df['MAWB Date / Consignment Date/  Bill of Lading Date'],
-                df['GRN Date'],
-                df['Stock-In Date']
-            ]).dropna().dt.date.unique()
+            # Date columns are already parsed by prepare_orders
+            all_dates = activity_dates(df)
 
             if len(all_dates) > 0:
                 selected_date = st.date_input("Select a date", min_value=min(all_dates), max_value=max(all_dates))
 
                 # Filter each activity type
-                new_orders = df[df['Order Date'].dt.date == selected_date][
-                    [
-                        'Order No.',
-                        'REF. NO',
-                        'Part No.',
-                        'Description',
-                        'Order Qty',
-                        'A/C Reg. No',
-                        'Supplier',
-                        'PRIORITY',
-                    ]
-                ].rename(columns={'REF. NO': 'Reference No'})
-
-                shipped_items = df[
-                    df['MAWB Date / Consignment Date/  Bill of Lading Date'].dt.date
-                    == selected_date
-                ][
-                    [
-                        'Order No.',
-                        'Part No.',
-                        'Description',
-                        'Order Qty',
-                        'Supplier',
-                        'MAWB No. / Consignment No./  Bill of Lading No.',
-                        'Mode of Transport',
-                        'PRIORITY',
-                    ]
-                ]
-
-                grn_items = df[df['GRN Date'].dt.date == selected_date][
-                    [
-                        'Order No.',
-                        'Part No.',
-                        'Description',
-                        'Order Qty',
-                        'GRN Qty',
-                        'PRIORITY',
-                    ]
-                ]
-
-                grn_items['Status'] = grn_items.apply(grn_status, axis=1)
-
-                # Optional: custom sort order
-                status_order = ['Fully Received', 'Partial GRN', 'Not Shipped']
-                grn_items['Status'] = pd.Categorical(grn_items['Status'], categories=status_order, ordered=True)
-                grn_items = grn_items.sort_values(by='Status')
-                stock_in_items = df[df['Stock-In Date'].dt.date == selected_date][
-                    [
-                        'Order No.',
-                        'Part No.',
-                        'Description',
-                        'Order Qty',
-                        'GRN Qty',
-                        'Stock Qty',
-                        'PRIORITY',
-                    ]
-                ]
-
-                stock_in_items['Status'] = stock_in_items.apply(stock_status, axis=1)
+                daily_frames = daily_activity(df, selected_date)
+                new_orders, shipped_items, grn_items, stock_in_items = daily_frames
 
                 # 📊 Summary Counts
                 st.markdown("### 📊 Summary for Selected Date")
@@ -337,27 +536,15 @@ def main():
                                      ['Order No.', 'Part No.', 'Description', 'Order Qty', 'GRN Qty', 'Stock Qty',
                                       'Status']])
                 ######### pdf downloaed button######################################
-                if not all([new_orders.empty, shipped_items.empty, grn_items.empty, stock_in_items.empty]):
+                if has_activity(daily_frames):
                     if st.button("📥 Download Full Daily Activity PDF"):
-                        pdf_buffer = generate_daily_activity_pdf(selected_date, new_orders, shipped_items, grn_items,
-                                                                 stock_in_items)
+                        pdf_buffer = daily_pdf(selected_date, daily_frames)
                         st.download_button("⬇️ Click to Download PDF", data=pdf_buffer,
                                            file_name=f"activity_report_{selected_date}.pdf", mime="application/pdf")
 
                 ################ for excel download utility############################
-                if not all([new_orders.empty, shipped_items.empty, grn_items.empty, stock_in_items.empty]):
-                    excel_buffer: BytesIO = io.BytesIO()
-                    with pd.ExcelWriter(excel_buffer, engine='xlsxwriter') as writer:
-                        if not new_orders.empty:
-                            new_orders.to_excel(writer, index=False, sheet_name='New Orders')
-                        if not shipped_items.empty:
-                            shipped_items.to_excel(writer, index=False, sheet_name='Shipped Items')
-                        if not grn_items.empty:
-                            grn_items.to_excel(writer, index=False, sheet_name='GRN Entries')
-                        if not stock_in_items.empty:
-                            stock_in_items.to_excel(writer, index=False, sheet_name='Stock-In Entries')
-
-                    excel_buffer.seek(0)
+                if has_activity(daily_frames):
+                    excel_buffer: BytesIO = daily_excel(daily_frames)
 
                     st.download_button(
                         label="📥 Download Full Daily Report (Excel)",
@@ -366,11 +553,23 @@ def main():
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
                 ####################3 for excel download utility##########################################
-                if new_orders.empty and shipped_items.empty and grn_items.empty and stock_in_items.empty:
+                if not has_activity(daily_frames):
                     st.info(f"No activity found for {selected_date}")
             else:
                 st.warning("⚠️ No valid date data found in the sheet.")
 
+            ########################################################################
+            ############################################################################
+            trend_section(upload_key, uploads, selected_sheet)
+
+            exposure_section(upload_key, uploads, selected_sheet)
+
+            lead_time_section(upload_key, uploads, selected_sheet)
+
+            columnar_section(upload_key, uploads, selected_sheet)
+
+            snapshot_diff_section(order_lines, order_summary)
+
             ########################################################################
             ############################################################################
             ### a module for asking a simple question
@@ -396,6 +595,13 @@ def main():
                 - 🚫 **Keyword Shortcuts**:  
                     - `not shipped` → shows items with GRN = 0 & no MAWB  
                     - `partial grn` → shows items where GRN < Order Qty  
+                    - `aog` → AOG priority lines  
+
+                - 📅 **Order Date range**:  
+                  `since 2025-01`, `before 2025-03-15`, `from 2024-10 to 2024-12`, `in 2025-02`
+
+                - 🧩 **Combine any of the above**:  
+                  _e.g._ `supplier sat air not shipped abc since 2025-01`, `partial grn 204X1217 in 2025-02`
 
                 _Ask naturally, like: `supplier sat air`, `204X1217`, or `abc`._
                 """)
@@ -404,8 +610,24 @@ def main():
 
             if user_question:
                 q = user_question.strip().lower()
+                query_index = load_query_index(upload_key, selected_sheet, uploads)
+                predicates, unknown_words = parse_query(q, query_index)
+
+                if is_compound(predicates):
+                    result, steps, elapsed_ms = run_query(predicates, query_index)
+                    st.write(f"🧩 {len(result)} order lines match ({elapsed_ms:.1f} ms)")
+                    st.caption("Plan: " + " → ".join(f"{label} ({size:,} → {left:,})" for label, size, left in steps))
+                    if unknown_words:
+                        st.caption(f"Ignored: {' '.join(unknown_words)}")
+
+                    display_cols = [
+                        'Order No.', 'Order Date', 'Supplier', 'Part No.', 'Description', 'Order Qty', 'GRN Qty',
+                        'A/C Reg. No', 'PRIORITY', 'MAWB No. / Consignment No./  Bill of Lading No.',
+                        'Mode of Transport'
+                    ]
+                    paged_table(result, key="qa_planner", default_columns=display_cols)
 
-                if "not shipped" in q:
+                elif "not shipped" in q:
                     result = df[
                         (df['GRN Qty'] == 0) &
                         (
@@ -414,14 +636,13 @@ def main():
                         )
                         ]
                     st.write("🔍 Orders not yet shipped:")
-                    st.dataframe(result)
+                    paged_table(result, key="qa_not_shipped", default_columns=[
+                        'Order No.', 'Order Date', 'Part No.', 'Description', 'Supplier', 'Order Qty', 'A/C Reg. No',
+                        'REF. NO', 'PRIORITY', 'Days Pending'
+                    ])
 
                 elif "partial grn" in q:
-                    grouped = df.groupby(['Order No.', 'Part No.']).agg({
-                        'Order Qty': 'sum',
-                        'GRN Qty': 'sum',
-                        'Supplier': 'first'
-                    }).reset_index()
+                    grouped = order_lines[['Order No.', 'Part No.', 'Order Qty', 'GRN Qty', 'Supplier']]
                     partial = grouped[grouped['Order Qty'] != grouped['GRN Qty']]
                     st.write("📦 Orders with Partial GRN:")
                     st.dataframe(partial)
@@ -433,11 +654,11 @@ def main():
 
                     # Create a normalized Supplier column for matching
 
-                    df['Supplier_cleaned'] = df['Supplier'].astype(str).str.strip().str.upper()
+                    supplier_cleaned = df['Supplier'].astype(str).str.strip().str.upper()
 
                     # Filter rows where cleaned supplier contains the query
 
-                    matched_rows = df[df['Supplier_cleaned'].str.contains(query_cleaned, na=False)]
+                    matched_rows = df[supplier_cleaned.str.contains(query_cleaned, na=False)]
 
                     if not matched_rows.empty:
 
@@ -463,149 +684,65 @@ def main():
 
                         display_cols = [col for col in display_cols if col in matched_rows.columns]
 
-                        st.dataframe(matched_rows[display_cols])
+                        paged_table(matched_rows, key="qa_supplier", default_columns=display_cols)
 
                     else:
 
                         st.warning("❗ Supplier name not recognized in your question.")
 
 
-                elif len(q.split()) == 1 and q.upper().strip() in df['Part No.'].astype(
-                        str).str.upper().str.strip().unique():
-
-                    part_data = df[df['Part No.'].astype(str).str.upper().str.strip() == q.upper().strip()]
-
-                    # Extract 1 row per Order to get Order Qty, Supplier, etc.
-
-                    order_qty_info = part_data.drop_duplicates(subset=['Order No.', 'Part No.'])[
-
-                        ['Order No.', 'Part No.', 'Supplier', 'Order Qty', 'Description']
-
-                    ]
-
-                    order_qty_info['Supplier'] = order_qty_info['Supplier'].apply(
-                        trim_text)  # ✅ Trim supplier to 16 chars
-
-                    # GRN summary (received quantities)
-
-                    grn_sum = part_data.groupby(['Order No.', 'Part No.'])['GRN Qty'].sum().reset_index()
-
-                    # Unit price and currency
-
-                    unit_info = part_data[['Order No.', 'Part No.', 'Unit Price', 'Currency']].drop_duplicates()
-
-                    # Merge all
+                elif len(q.split()) == 1 and query_index.has_part(q):
 
-                    grouped = pd.merge(order_qty_info, grn_sum, on=['Order No.', 'Part No.'], how='left')
-
-                    grouped = pd.merge(grouped, unit_info, on=['Order No.', 'Part No.'], how='left')
-
-                    grouped['Status'] = grouped.apply(determine_shipment_status, axis=1)
-
-                    grouped['Unit Price (Currency)'] = grouped.apply(format_unit_price, axis=1)
+                    # One row per order line: Order Qty once, GRN summed, first Unit Price / Currency
+                    grouped = part_status(query_index.part_lines(q))
 
                     # Display
-
                     st.write(f"🔎 Results for Part No: {q.upper().strip()}")
-
-                    display_cols = ['Order No.', 'Supplier', 'Part No.', 'Description', 'Order Qty', 'GRN Qty',
-                                    'Status',
-                                    'Unit Price (Currency)']
-
-                    st.dataframe(grouped[display_cols])
+                    st.dataframe(grouped)
 
 
-                elif len(q.split()) == 1 and q.upper() in df['Order No.'].str.upper().unique():
-                    order_data = df[df['Order No.'].str.upper() == q.upper()]
+                elif len(q.split()) == 1 and query_index.has_order(q):
+                    order = order_status(query_index.order_lines(q))
 
                     # SHOW ORDER DATE
-                    order_date = pd.to_datetime(order_data['Order Date'].iloc[0], errors='coerce')
-
+                    order_date = order['order_date']
                     order_date_str = order_date.strftime("%d-%m-%Y") if pd.notnull(order_date) else "Unknown"
 
-                    # Get total quantities
-                    order_qty = order_data['Order Qty'].sum()
-                    grn_qty = order_data['GRN Qty'].sum()
-
                     # Display accordingly
-                    if grn_qty >= order_qty:
+                    if order['fully_shipped']:
                         st.markdown(
                             f"📦 **Order No**: `{q.upper()}` 🗓️ **Order Date**: `{order_date_str}` ✅ Fully Shipped")
                     else:
-                        days_pending = (pd.Timestamp.today() - order_date).days if pd.notnull(order_date) else "--"
+                        days_pending = order['days_pending'] if order['days_pending'] is not None else "--"
                         st.markdown(
                             f"📦 **Order No**: `{q.upper()}` 🗓️ **Order Date**: `{order_date_str}` 📆 Pending: `{days_pending}` days")
 
                     # Show Aircraft involved
-                    ac_regs = order_data['A/C Reg. No'].dropna().astype(str).str.strip().unique()
-                    ac_text = ', '.join(ac_regs) if len(ac_regs) else "Not Available"
+                    ac_text = ', '.join(order['aircraft']) if order['aircraft'] else "Not Available"
                     st.markdown(f"✈️ **Aircraft Reg. Involved**: {ac_text}")
-
-                    supplier = order_data['Supplier'].dropna().unique()
-                    supplier_name = supplier[0] if len(supplier) == 1 else ', '.join(supplier)
-                    st.markdown(f"🏢 **Supplier**: {supplier_name}")
-
-                    order_data['Line Status'] = order_data.apply(classify_line, axis=1)
-                    status_counts = order_data['Line Status'].value_counts()
+                    st.markdown(f"🏢 **Supplier**: {order['supplier']}")
 
                     # Summary
+                    status_counts = order['line_counts']
                     st.markdown("📊 **Line Item Status Summary**")
-                    st.markdown(f"- ✅ Fully Shipped: {status_counts.get('Fully Shipped', 0)}")
-                    st.markdown(f"- ⚠️ Partial GRN: {status_counts.get('Partial GRN', 0)}")
-                    st.markdown(f"- ❌ Not Shipped: {status_counts.get('Not Shipped', 0)}")
-
-                    # Show per item details
-                    order_qty_info = order_data.drop_duplicates(subset=['Order No.', 'Part No.'])[
-                        ['Part No.', 'Order Qty', 'Description']
-                    ]
-
-                    grn_sum = order_data.groupby(['Part No.'])['GRN Qty'].sum().reset_index()
-
-                    grouped = pd.merge(order_qty_info, grn_sum, on='Part No.', how='left')
-
-                    # Status per item
-                    grouped['Status'] = grouped.apply(classify_line, axis=1)
+                    st.markdown(f"- ✅ Fully Shipped: {status_counts['Fully Shipped']}")
+                    st.markdown(f"- ⚠️ Partial GRN: {status_counts['Partial GRN']}")
+                    st.markdown(f"- ❌ Not Shipped: {status_counts['Not Shipped']}")
 
+                    # Show per item details — already one row per part, sorted by Status
                     st.write(f"📦 Items under Order No: {q.upper()}")
-                    # ✅ Sort Status in descending alphabetical order
-                    grouped = grouped.sort_values(by='Status', ascending=False)
-
-                    # Rename columns for display
-                    grouped = grouped.rename(columns={
-                        'Part No.': 'Part Number',
-                        'Order Qty': 'Ordered Qty',
-                        'GRN Qty': 'GRN Received Qty'
-                    })
-
-                    # Set desired column order
-                    display_cols = ['Part Number', 'Description', 'Ordered Qty', 'GRN Received Qty', 'Status']
-                    st.dataframe(grouped[display_cols])
+                    st.dataframe(order['items'])
 
 
                 elif len(q) == 3 and q.isalpha():
                     aircraft_code = f"VT-{q.upper()}"
-                    ac_col = 'A/C Reg. No'
 
-                    single_ac_df = df[
-                        df[ac_col].astype(str).str.upper().str.contains(aircraft_code) &
-                        (df[ac_col].astype(str).str.count(',') == 0)
-                        ]
+                    single_ac_df = aircraft_lines(query_index.aircraft_lines(aircraft_code), aircraft_code)
 
                     if single_ac_df.empty:
                         st.info(f"🛬 No dedicated records found for aircraft code '{aircraft_code}'.")
                     else:
-                        agg_dict = {
-                            'Order Qty': 'sum',
-                            'GRN Qty': 'sum',
-                            ac_col: 'first',
-                            'Supplier': 'first'
-                        }
-                        if 'PO Date' in df.columns:
-                            agg_dict['PO Date'] = 'first'
-
-                        ac_summary = single_ac_df.groupby('Order No.').agg(agg_dict).reset_index()
-
-                        ac_summary['Status'] = ac_summary.apply(classify_ac, axis=1)
+                        ac_summary, related_lines = aircraft_summary(single_ac_df)
 
                         total_orders = ac_summary.shape[0]
                         fully = ac_summary[ac_summary['Status'] == 'Fully Shipped']['Order No.'].tolist()
@@ -626,10 +763,6 @@ def main():
                             f"- 🔴 **Not Yet Shipped Orders** ({len(not_shipped)}): {', '.join(not_shipped) if not_shipped else 'None'}")
 
                         # Line-level KPI summary
-                        related_lines = single_ac_df.copy()
-
-                        related_lines['Status'] = related_lines.apply(classify_procurement, axis=1)
-
                         line_status_counts = related_lines['Status'].value_counts()
                         total_items = related_lines.shape[0]
 
@@ -653,124 +786,37 @@ def main():
                     ############################################################################
                     st.subheader("📆 Monthly Procurement Report")
 
-                    # Convert columns safely
-                    df['Order Date'] = pd.to_datetime(df['Order Date'], errors='coerce')
-                    df['Unit Price'] = pd.to_numeric(df['Unit Price'], errors='coerce')
-                    df['Currency'] = df['Currency'].astype(str).str.strip().str.upper()
-
-                    # Extract month-year
-                    df['Month-Year'] = df['Order Date'].dt.to_period('M').astype(str)
-                    available_months = sorted(df['Month-Year'].dropna().unique())
+                    _, available_months = order_months(order_lines)
 
                     # Month selection
                     selected_month = st.selectbox("Select Month", available_months)
 
                     # ✅ USD to INR rate input
                     usd_rate = st.number_input("Set USD to INR exchange rate", min_value=50.0, max_value=200.0,
-                                               value=84.0,
+                                               value=DEFAULT_USD_RATE,
                                                step=0.5)
 
-                    # Filter monthly data
-                    monthly_data = df[df['Month-Year'] == selected_month].copy()
-
-                    if not monthly_data.empty:
-                        # Normalize Currency
-                        monthly_data['Currency'] = monthly_data['Currency'].apply(
-                            lambda x: 'INR' if x in ['INR', 'INDIAN RUPEE'] else 'USD'
-                        )
-
-                        # Assign exchange rate
-                        monthly_data['Exchange Rate'] = monthly_data['Currency'].apply(
-                            lambda x: 1 if x == 'INR' else usd_rate)
-
-                        # Compute total INR
-                        monthly_data['Quantity'] = pd.to_numeric(monthly_data['Order Qty'], errors='coerce')
-                        monthly_data['Total (INR)'] = monthly_data['Quantity'] * monthly_data['Unit Price'] * \
-                                                      monthly_data[
-                                                          'Exchange Rate']
-
-                        # Convert YYYY-MM to "Month Year"
-                        year, month = map(int, selected_month.split('-'))
-                        month_name = calendar.month_name[month]
-                        formatted_month = f"{month_name} {year}"
-                        # Deduplicate by Order No. + Part No. + Unit Price + Currency to prevent over counting
-                        monthly_data = monthly_data.drop_duplicates(
-                            subset=['Order No.', 'Part No.', 'Unit Price', 'Currency'])
-                        monthly_data.reset_index(drop=True, inplace=True)
-
-                        aog_rows = []
-                        if 'PRIORITY' in monthly_data.columns:
-                            aog_rows = [
-                                i
-                                for i, val in enumerate(
-                                    monthly_data['PRIORITY'].astype(str).str.upper()
-                                )
-                                if val == 'AOG'
-                            ]
-
-                        # Show total INR just after exchange rate input
-                        total_inr = monthly_data['Total (INR)'].sum()
-
-                        # Format amount
-
-                        percent_75 = total_inr * 0.075
-
-                        # Calculate last day of the selected month
-                        last_day = pd.to_datetime(selected_month + "-01") + pd.offsets.MonthEnd(0)
-
-                        # Create a human-readable exchange info line
-                        exchange_info_line = f"Exchange rate used as on {last_day.strftime('%d-%m-%Y')}: USD 1 = INR {usd_rate:.2f}"
+                    report = monthly_report(order_lines, selected_month, usd_rate)
 
+                    if report is not None:
                         # ✅ Display bold, rounded output
-                        st.markdown(f"### 💰 **Total Procurement Value for {formatted_month}: {format_inr(total_inr)}**")
-                        st.markdown(f"### 📌 **7.5% of it is: {format_inr(percent_75)}**")
-                        st.markdown(f"### 💱 {exchange_info_line}")
-
-                        # Prepare report
-                        report_df = monthly_data[[
-                            'Supplier', 'Order No.', 'Part No.', 'Description', 'Quantity',
-                            'Currency', 'Unit Price', 'Exchange Rate', 'Total (INR)'
-                        ]].copy()
+                        st.markdown(f"### 💰 **Total Procurement Value for {report['formatted_month']}: "
+                                    f"{format_inr(report['total_inr'])}**")
+                        st.markdown(f"### 📌 **7.5% of it is: {format_inr(report['percent_75'])}**")
+                        st.markdown(f"### 💱 {report['exchange_info_line']}")
 
-                        report_df.columns = ['Vendor', 'Purchase Order', 'Part No.', 'Description', 'Quantity',
-                                             'Currency', 'Unit Value', 'Exchange Rate', 'Total (INR)']
-
-                        # ✅ Format numeric columns to 2 decimal places
-                        report_df['Unit Value'] = report_df['Unit Value'].apply(
-                            lambda x: f"{x:,.2f}" if pd.notnull(x) else "")
-                        report_df['Total (INR)'] = report_df['Total (INR)'].apply(
-                            lambda x: f"{x:,.2f}" if pd.notnull(x) else "")
-                        # After all processing and formatting:
-                        report_df.rename(columns={"Total (INR)": "Total (₹)"}, inplace=True)
-
-                        report_df.insert(0, 'S. No.', range(1, len(report_df) + 1))
-
-                        st.dataframe(report_df)
-
-                        # Excel download
-                        buffer = io.BytesIO()
-                        with pd.ExcelWriter(buffer, engine='xlsxwriter') as writer:
-                            report_df.to_excel(writer, index=False, sheet_name='Monthly Report')
-                        buffer.seek(0)
+                        st.dataframe(report['display_df'])
 
                         st.download_button(
                             label="📥 Download Monthly Report (Excel)",
-                            data=buffer,
+                            data=monthly_excel(report),
                             file_name=f"Monthly_Procurement_Report_{selected_month}.xlsx",
                             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                         )
 
-                        pdf_buffer = generate_monthly_report_pdf(
-                            formatted_month,
-                            report_df,
-                            total_inr,
-                            percent_75,
-                            exchange_info_line,
-                            highlight_rows=aog_rows,
-                        )
                         st.download_button(
                             label="📄 Download Monthly Report (PDF)",
-                            data=pdf_buffer,
+                            data=monthly_pdf(report),
                             file_name=f"Monthly_Procurement_Report_{selected_month}.pdf",
                             mime="application/pdf"
                         )
@@ -0,0 +1,175 @@
+# app/order_lines.py
+# Canonical order-line model: one row per (Order No., Part No.), built once per upload.
+# Laminaar exports repeat an order line once per shipment / GRN batch, so:
+#   - Order Qty is counted once per line (first row)
+#   - GRN Qty and Stock Qty are summed over the batches
+#   - shipment references / modes of transport are collected into one string
+import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+ORDER_LINE_KEYS = ['Order No.', 'Part No.']
+
+MAWB_COLUMN = 'MAWB No. / Consignment No./  Bill of Lading No.'
+MAWB_DATE_COLUMN = 'MAWB Date / Consignment Date/  Bill of Lading Date'
+DATE_COLUMNS = ['Order Date', MAWB_DATE_COLUMN, 'GRN Date', 'Stock-In Date']
+# Date text that could not be parsed, kept for the data-quality scan, e.g.
+# "Order Date: 31-02-2024 (expected %d-%m-%Y)"
+UNPARSED_DATES_COLUMN = 'Unparsed Dates'
+
+# Descriptive fields taken from the first row of each line
+FIRST_COLUMNS = ['Supplier', 'Description', 'Order Date', 'Order Qty', 'Unit Price', 'Currency', 'A/C Reg. No',
+                 'REF. NO', 'PRIORITY', 'PO Date', 'Source File']
+SUM_COLUMNS = ['GRN Qty', 'Stock Qty']
+JOIN_COLUMNS = [MAWB_COLUMN, 'Mode of Transport']
+
+
+# 🔹 Format pandas would infer for a date column: guessed from its first non-blank text value.
+# None when the column starts with real dates (Excel date cells) — text values are then read one by one.
+def inferred_date_format(raw):
+    for value in raw:
+        if isinstance(value, str) and value.strip():
+            return guess_datetime_format(value.strip())
+        if pd.notna(value) and not isinstance(value, str):
+            return None
+    return None
+
+
+# 🔹 Cleans a raw export once: column names, quantities, keys and activity dates.
+# date_formats / today let a file cleaned chunk by chunk parse exactly like the whole file would.
+def prepare_orders(df, date_formats=None, today=None):
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    # Text in a quantity cell ("N/A", "-") counts as blank, like an empty cell
+    for col in ['GRN Qty', 'Order Qty', 'Stock Qty']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+
+    # Clean up keys
+    df['Order No.'] = df['Order No.'].astype(str).str.strip().str.upper()
+    df['Part No.'] = df['Part No.'].astype(str).str.strip().str.upper()
+
+    date_formats = date_formats or {}
+    unparsed = np.full(len(df), '', dtype=object)
+    for col in DATE_COLUMNS:
+        if col in df.columns:
+            raw = df[col]
+            # The format is passed explicitly so an unparsed value can say which format it was read against
+            date_format = date_formats.get(col) or inferred_date_format(raw)
+            df[col] = pd.to_datetime(raw, errors='coerce', format=date_format)
+            failed = np.flatnonzero((df[col].isna() & raw.notna()).to_numpy())
+            if len(failed):
+                text = raw.iloc[failed].astype(str).str.strip().to_numpy()
+                failed, text = failed[text != ''], text[text != '']
+                expected = f" (expected {date_format})" if date_format and date_format != 'mixed' else ''
+                unparsed[failed] = [f"{prev}; {col}: {value}{expected}" if prev else f"{col}: {value}{expected}"
+                                    for prev, value in zip(unparsed[failed], text)]
+    df[UNPARSED_DATES_COLUMN] = unparsed
+    today = pd.Timestamp.today() if today is None else today
+    df['Days Pending'] = (today - df['Order Date']).dt.days
+    return df
+
+
+# 🔹 Joins distinct values per line; most lines have a single value, so only the rest go through a Python join
+def join_by_line(values, col, sep):
+    values = values.drop_duplicates().sort_values(ORDER_LINE_KEYS, kind='stable')
+    repeated = values.duplicated(ORDER_LINE_KEYS, keep=False)
+    single = values[~repeated].set_index(ORDER_LINE_KEYS)[col]
+    multi = values[repeated].groupby(ORDER_LINE_KEYS, sort=False)[col].agg(sep.join)
+    return pd.concat([single, multi])
+
+
+# 🔹 Distinct non-empty values per line joined with ', ' (shipment refs, modes of transport)
+def join_unique(df, col):
+    values = df[ORDER_LINE_KEYS + [col]].dropna(subset=[col])
+    return join_by_line(values.assign(**{col: values[col].astype(str)}), col, ', ')
+
+
+# 🔹 Normalized QA statuses per line, joined with ',' (same form the order summary has always used)
+def join_qa_status(df):
+    qa = df[ORDER_LINE_KEYS + ['QA Status']].dropna(subset=['QA Status'])
+    qa = qa.assign(**{'QA Status': qa['QA Status'].astype(str).str.strip().str.lower()})
+    return join_by_line(qa.sort_values('QA Status'), 'QA Status', ',')
+
+
+# First Row is the row's position in the upload; a partition of a larger file brings its own
+def build_order_lines(df, today=None):
+    df = df.reset_index(drop=True)
+    if 'First Row' not in df.columns:
+        df['First Row'] = df.index
+    grouped = df.groupby(ORDER_LINE_KEYS, sort=True)
+
+    # Order Qty is already filled with 0, so `first` is the quantity on the line's first batch row
+    first_cols = [col for col in FIRST_COLUMNS if col in df.columns]
+    lines = grouped[first_cols].first()
+
+    for col in SUM_COLUMNS:
+        if col in df.columns:
+            lines[col] = grouped[col].sum()
+    lines['Batches'] = grouped.size()
+    lines['First Row'] = grouped['First Row'].min()
+
+    for col in JOIN_COLUMNS:
+        if col in df.columns:
+            lines[col] = join_unique(df, col).reindex(lines.index).fillna('')
+    if 'QA Status' in df.columns:
+        lines['QA Status'] = join_qa_status(df).reindex(lines.index).fillna('')
+
+    if 'Unit Price' in lines.columns:
+        lines['Unit Price'] = pd.to_numeric(lines['Unit Price'], errors='coerce')
+    if 'Currency' in lines.columns:
+        lines['Currency'] = lines['Currency'].astype(str).str.strip().str.upper()
+    if 'Order Date' in lines.columns:
+        today = pd.Timestamp.today() if today is None else today
+        lines['Days Pending'] = (today - lines['Order Date']).dt.days
+
+    return lines.reset_index()
+
+
+# 🔹 Vectorized equivalent of utils.classify over a whole order summary
+def classify_orders(summary):
+    grn, order = summary['GRN Qty'], summary['Order Qty']
+    approved = summary['QA Status'].str.contains('approved', regex=False, na=False)
+    conditions = [
+        (grn == 0) & approved,
+        grn == 0,
+        grn < order,
+        grn > order,
+        (grn >= order) & approved,
+    ]
+    choices = ["Shipped - No GRN", "No Item Shipped", "Shipped - Partial GRN", "GRN > Ordered – Check", "All OK"]
+    return pd.Series(np.select(conditions, choices, default="Check Manually"), index=summary.index)
+
+
+# 🔹 One row per Order No. rolled up from the order lines
+def build_order_summary(lines):
+    # Supplier / Order Date come from the order's first row in the upload
+    ordered = lines.sort_values('First Row')
+    grouped = ordered.groupby('Order No.')
+    summary = grouped.agg({'Order Qty': 'sum', 'GRN Qty': 'sum', 'Supplier': 'first', 'Order Date': 'first'})
+
+    qa = ordered[['Order No.', 'QA Status']].assign(**{'QA Status': ordered['QA Status'].str.split(',')})
+    qa = qa.explode('QA Status')
+    qa = qa[qa['QA Status'] != ''].drop_duplicates().sort_values('QA Status')
+    qa_joined = qa.groupby('Order No.', sort=False)['QA Status'].agg(','.join)
+    summary['QA Status'] = qa_joined.reindex(summary.index).fillna('')
+
+    summary = summary.reset_index()
+    summary['Status'] = classify_orders(summary)
+    return summary
+
+
+# 🔹 Lines where nothing has arrived and no shipment reference exists yet
+def unshipped_lines(lines):
+    return lines[(lines['GRN Qty'] == 0) & (lines[MAWB_COLUMN].str.strip() == '')]
+
+
+# 🔹 Lines with a shipment reference or transport mode whose GRN total does not match the order
+def partial_grn_lines(lines):
+    return lines[
+        (lines['Order Qty'] != lines['GRN Qty']) &
+        (
+                (lines[MAWB_COLUMN].str.strip() != '') |
+                (lines['Mode of Transport'].str.strip() != '')
+        )
+        ]
@@ -0,0 +1,201 @@
+# app/out_of_core.py
+# Out-of-core mode for exports larger than memory (multi-year, multi-station histories).
+#
+#   python -m app.out_of_core history.csv --out results/ --memory-mb 1024
+#   python -m app.out_of_core history.csv --out results/ --verify   # also run in memory and compare
+#
+# The CSV is streamed in chunks, cleaned with prepare_orders and hash-partitioned by Order No.
+# into files on disk. Every order (and so every order line) lands in exactly one partition, so
+# order lines, the order summary and partial-GRN lines are built per partition with the in-memory
+# functions. Monthly INR totals are combined from exact per-partition partial sums. Only one
+# partition is held in memory at a time.
+#
+# Two details keep the result identical to reading the whole file at once: a first pass infers
+# each column's dtype and each date column's format over the whole file (pandas would otherwise
+# infer them per chunk), and row positions are carried along as First Row.
+import argparse
+import math
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+
+from .order_lines import DATE_COLUMNS, ORDER_LINE_KEYS, prepare_orders, build_order_lines, build_order_summary, \
+    partial_grn_lines
+from .reports import DEFAULT_USD_RATE, order_months, inr_values, monthly_totals, exact_partials
+
+CHUNK_ROWS = 100_000
+DEFAULT_MEMORY_MB = 1024
+# Rough in-memory size of a partition (raw rows + order lines + intermediates) per byte of CSV
+FRAME_EXPANSION = 10
+
+
+# 🔹 dtype pandas infers for each column over the whole file, and the datetime format it would
+# guess from each date column's first value
+def scan_csv(path, chunk_rows=CHUNK_ROWS):
+    kinds = {}
+    first_dates = {}
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        for col, dtype in chunk.dtypes.items():
+            kinds.setdefault(col, set()).add(dtype.kind)
+        for col in chunk.columns:
+            name = col.strip()
+            if name in DATE_COLUMNS and name not in first_dates:
+                values = chunk[col].dropna()
+                if len(values):
+                    first_dates[name] = values.iloc[0]
+
+    dtypes = {}
+    for col, seen in kinds.items():
+        if seen <= {'i'}:
+            dtypes[col] = 'int64'
+        elif seen <= {'i', 'f'}:
+            dtypes[col] = 'float64'
+        elif seen <= {'b'}:
+            dtypes[col] = 'bool'
+        else:
+            dtypes[col] = 'object'
+
+    date_formats = {}
+    for col, value in first_dates.items():
+        if isinstance(value, str):
+            # No guessable format → pandas parses element by element, which 'mixed' does per chunk too
+            date_formats[col] = guess_datetime_format(value) or 'mixed'
+    return dtypes, date_formats
+
+
+def partition_count(path, memory_mb=DEFAULT_MEMORY_MB):
+    return max(1, math.ceil(os.path.getsize(path) * FRAME_EXPANSION / (memory_mb * 1024 * 1024)))
+
+
+def partition_path(work_dir, part):
+    return os.path.join(work_dir, f"part-{part:05d}.pkl")
+
+
+# 🔹 Streams the CSV into `partitions` files of cleaned rows, split by a hash of Order No.
+def write_partitions(path, work_dir, partitions, dtypes, date_formats, today, chunk_rows=CHUNK_ROWS):
+    handles = {}
+    try:
+        # Chunk indexes continue across chunks, so the index is the row's position in the file
+        for chunk in pd.read_csv(path, chunksize=chunk_rows, dtype=dtypes):
+            chunk = prepare_orders(chunk, date_formats=date_formats, today=today)
+            chunk['First Row'] = chunk.index
+            part_ids = pd.util.hash_array(chunk['Order No.'].to_numpy()) % partitions
+            for part, rows in chunk.groupby(part_ids, sort=False):
+                if part not in handles:
+                    handles[part] = open(partition_path(work_dir, part), "wb")
+                pickle.dump(rows, handles[part], protocol=pickle.HIGHEST_PROTOCOL)
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return sorted(handles)
+
+
+def read_partition(work_dir, part):
+    frames = []
+    with open(partition_path(work_dir, part), "rb") as fh:
+        while True:
+            try:
+                frames.append(pickle.load(fh))
+            except EOFError:
+                break
+    return pd.concat(frames)
+
+
+# 🔹 Per-month (order lines, exact INR sum as float partials) of one partition, so partitions add up losslessly
+def monthly_partials(lines, usd_rate):
+    month_year, months = order_months(lines)
+    valued = inr_values(lines, usd_rate)['Total (INR)']
+    partials = {}
+    for month, values in valued.groupby(month_year):
+        if month in months:
+            partials[month] = (len(values), exact_partials(values))
+    return partials
+
+
+def combine_monthly_partials(all_partials):
+    combined = {}
+    for partials in all_partials:
+        for month, (count, total) in partials.items():
+            prev_count, prev_total = combined.get(month, (0, []))
+            combined[month] = (prev_count + count, prev_total + total)
+    rows = [(month, count, math.fsum(total)) for month, (count, total) in sorted(combined.items())]
+    totals = pd.DataFrame(rows, columns=['Month', 'Order Lines', 'Total (INR)'])
+    totals['7.5% Value'] = totals['Total (INR)'] * 0.075
+    return totals
+
+
+# 🔹 Order summary, partial-GRN lines and monthly totals of a CSV export, one partition at a time.
+# Returns the same (order_summary, partial_grn, monthly) as aggregate_in_memory.
+def aggregate_csv(path, usd_rate=DEFAULT_USD_RATE, memory_mb=DEFAULT_MEMORY_MB, chunk_rows=CHUNK_ROWS,
+                  work_dir=None, today=None):
+    today = pd.Timestamp.today() if today is None else today
+    dtypes, date_formats = scan_csv(path, chunk_rows)
+    partitions = partition_count(path, memory_mb)
+
+    own_dir = work_dir is None
+    work_dir = tempfile.mkdtemp(prefix="procurement-ooc-") if own_dir else work_dir
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        summaries, partial_grn, all_partials = [], [], []
+        for part in write_partitions(path, work_dir, partitions, dtypes, date_formats, today, chunk_rows):
+            lines = build_order_lines(read_partition(work_dir, part), today=today)
+            summaries.append(build_order_summary(lines))
+            partial_grn.append(partial_grn_lines(lines))
+            all_partials.append(monthly_partials(lines, usd_rate))
+            os.remove(partition_path(work_dir, part))
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    # Lines and orders are keyed, so concatenating and re-sorting restores the whole-file order
+    order_summary = pd.concat(summaries).sort_values('Order No.').reset_index(drop=True)
+    partial_grn = pd.concat(partial_grn).sort_values(ORDER_LINE_KEYS).reset_index(drop=True)
+    return order_summary, partial_grn, combine_monthly_partials(all_partials)
+
+
+# 🔹 Reference path: the same three results from the whole file in one frame
+def aggregate_in_memory(path, usd_rate=DEFAULT_USD_RATE, today=None):
+    today = pd.Timestamp.today() if today is None else today
+    lines = build_order_lines(prepare_orders(pd.read_csv(path), today=today), today=today)
+    return (build_order_summary(lines), partial_grn_lines(lines).reset_index(drop=True),
+            monthly_totals(lines, usd_rate))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aggregate a Laminaar CSV export larger than memory")
+    parser.add_argument("csv", help="CSV export (workbooks cannot be streamed — save them as CSV first)")
+    parser.add_argument("--out", required=True, help="folder for order_summary.csv, partial_grn.csv, monthly.csv")
+    parser.add_argument("--memory-mb", type=int, default=DEFAULT_MEMORY_MB, help="memory to plan partitions for")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument("--usd-rate", type=float, default=DEFAULT_USD_RATE)
+    parser.add_argument("--work-dir", default=None, help="where partitions are spilled (default: a temp folder)")
+    parser.add_argument("--verify", action="store_true", help="also aggregate in memory and compare")
+    args = parser.parse_args()
+
+    today = pd.Timestamp.today()
+    results = aggregate_csv(args.csv, usd_rate=args.usd_rate, memory_mb=args.memory_mb, chunk_rows=args.chunk_rows,
+                            work_dir=args.work_dir, today=today)
+    os.makedirs(args.out, exist_ok=True)
+    for name, frame in zip(["order_summary", "partial_grn", "monthly"], results):
+        frame.to_csv(os.path.join(args.out, f"{name}.csv"), index=False)
+        print(f"{name}: {len(frame):,} rows")
+
+    if args.verify:
+        for name, expected, actual in zip(["order_summary", "partial_grn", "monthly"],
+                                          aggregate_in_memory(args.csv, args.usd_rate, today), results):
+            try:
+                pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+            except AssertionError as exc:
+                print(f"❌ {name} differs from the in-memory result:\n{exc}")
+                return 1
+        print("✅ identical to the in-memory result")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+# app/pdf_parallel.py
+# Sectioned PDF rendering: page ranges of a report are laid out in separate worker processes,
+# then stitched into one document with continuous page numbers.
+# Parts are cut at the page boundaries of the serial layout and keep the full tables' column
+# widths, so the merged document has the same pages, rows per page and columns as a serial build.
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from itertools import accumulate
+
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas as pdf_canvas
+from reportlab.platypus import BaseDocTemplate, Flowable, Table, TableStyle
+from reportlab.platypus.doctemplate import ActionFlowable
+from pypdf import PdfReader, PdfWriter
+
+from .pdf_utils import (register_pdf_font, monthly_styles, daily_styles, build_pdf, add_header_border,
+                        draw_page_number, monthly_summary_flowables, monthly_table, monthly_table_data,
+                        MONTHLY_TABLE_STYLE, daily_summary_flowables, daily_heading_flowables, daily_table_data,
+                        daily_section_flowables, DAILY_TABLE_STYLE, DAILY_SECTIONS)
+
+# 🔹 Below this many table rows a single in-process build is faster than spinning up workers.
+# Above it, splitting pays off even on one core: reportlab's table splitting grows faster than linearly.
+PARALLEL_MIN_ROWS = 1500
+
+# 🔹 Rows per part (at least; a part always ends on a page boundary)
+CHUNK_ROWS = 500
+
+
+def use_parallel(total_rows, parallel=None):
+    if parallel is None:
+        return total_rows >= PARALLEL_MIN_ROWS
+    return bool(parallel)
+
+
+# 🔹 Column widths and row heights a table of table_data gets from reportlab, measured on a small
+# probe table (the widest text of every column, one row per distinct line count) instead of every cell
+def table_geometry(table_data, style):
+    fonts = {command[0]: command[3] for command in style if command[0] in ('FONTNAME', 'FONTSIZE')}
+
+    def text_width(text):
+        return max(stringWidth(line, fonts['FONTNAME'], fonts['FONTSIZE']) for line in text.split('\n'))
+
+    widest = [max(set(column), key=text_width) for column in zip(*table_data)]
+    line_counts = [max(cell.count('\n') for cell in row) + 1 for row in table_data[1:]]
+    distinct = sorted(set(line_counts))
+    probe = Table([table_data[0], widest] + [['\n' * (count - 1)] * len(widest) for count in distinct])
+    probe.setStyle(TableStyle(style))
+    probe.wrap(0, 0)
+    heights = dict(zip(distinct, probe._rowHeights[2:]))
+    return probe._colWidths, [probe._rowHeights[0]] + [heights[count] for count in line_counts]
+
+
+# 🔹 Stand-in for a table (repeatRows=1) in the layout pass: same size, split between the same rows
+# as reportlab's Table, nothing drawn. Covers data rows start..stop-1 of its section.
+class RowProbe(Flowable):
+    def __init__(self, section, col_widths, row_heights, start=0, stop=None, offsets=None):
+        Flowable.__init__(self)
+        self.section = section
+        self.col_widths = col_widths
+        self.row_heights = row_heights  # header first, then one per data row
+        self.start = start
+        self.stop = len(row_heights) - 1 if stop is None else stop
+        self.offsets = offsets if offsets is not None else list(accumulate(row_heights[1:], initial=0))
+
+    def _piece(self, start, stop):
+        return RowProbe(self.section, self.col_widths, self.row_heights, start, stop, self.offsets)
+
+    def wrap(self, availWidth, availHeight):
+        width = 0
+        for w in self.col_widths:
+            width = width + w
+        header = self.row_heights[0]
+        height = header + self.offsets[self.stop] - self.offsets[self.start]
+        if height <= availHeight + 1:
+            # Close to a fit: the exact (compensated, bottom-up) sum Table uses
+            height = c = 0
+            for h in reversed([header] + self.row_heights[self.start + 1:self.stop + 1]):
+                y = h - c
+                t = height + y
+                c = (t - height) - y
+                height = t
+        return width, height
+
+    def split(self, availWidth, availHeight):
+        # Table._getFirstPossibleSplitRowPosition + _splitRows, without spans or in-row splits
+        h = self.row_heights[0]
+        fits = 1 if h <= availHeight else 0
+        row = self.start
+        while fits and row < self.stop and h + self.row_heights[row + 1] <= availHeight:
+            h = h + self.row_heights[row + 1]
+            row += 1
+        if row == self.start:
+            return []
+        if row == self.stop:
+            return [self]
+        return [self._piece(self.start, row), self._piece(row, self.stop)]
+
+    def draw(self):
+        pass
+
+
+# 🔹 Splits a report into parts: [(section, start, stop), ...] per part. Lays the report out once
+# with RowProbes in place of its tables (prefix flowables, then per section its heading flowables
+# and table) and cuts at pages that start with a heading or a table continuation.
+def layout_parts(prefix, sections, pagesize):
+    sizes = [len(row_heights) - 1 for _, _, row_heights in sections]
+    offsets = [0, *accumulate(sizes)]
+    if not offsets[-1]:
+        return [[(section, 0, 0) for section in range(len(sections))]]
+
+    content = list(prefix)
+    headings = {}
+    for section, (heading, col_widths, row_heights) in enumerate(sections):
+        if heading:
+            headings[id(heading[0])] = section
+        content += heading
+        content.append(RowProbe(section, col_widths, row_heights))
+
+    first_on_page = {}
+
+    class LayoutDoc(BaseDocTemplate):
+        def afterFlowable(self, flowable):
+            if not isinstance(flowable, ActionFlowable):
+                first_on_page.setdefault(self.page, flowable)
+
+    build_pdf(content, pagesize, on_page=lambda canvas, doc: None, doc_class=LayoutDoc)
+
+    cuts = [0]
+    for page in sorted(first_on_page)[1:]:
+        flowable = first_on_page[page]
+        if isinstance(flowable, RowProbe) and flowable.start > 0:
+            position = offsets[flowable.section] + flowable.start
+        elif id(flowable) in headings:
+            position = offsets[headings[id(flowable)]]
+        else:
+            continue  # e.g. a table moved below its heading's page: not a point a part can start from
+        if position - cuts[-1] >= CHUNK_ROWS:
+            cuts.append(position)
+    cuts.append(offsets[-1])
+
+    return [
+        [(section, max(lo - offsets[section], 0), min(hi, offsets[section + 1]) - offsets[section])
+         for section in range(len(sections)) if offsets[section] < hi and offsets[section + 1] > lo]
+        for lo, hi in zip(cuts, cuts[1:])
+    ]
+
+
+# 🔹 Worker entry point for one part of the monthly report (module level so it can be pickled)
+def render_monthly_part(selected_month, report_df, total_inr, percent_75, exchange_info_line, highlight_rows,
+                        with_summary, col_widths=None):
+    register_pdf_font()
+    styles = monthly_styles()
+    content = []
+    if with_summary:
+        content = monthly_summary_flowables(styles, selected_month, total_inr, percent_75, exchange_info_line)
+    content.append(monthly_table(report_df, highlight_rows, col_widths))
+    return build_pdf(content, landscape(A4), on_page=add_header_border).getvalue()
+
+
+# 🔹 Worker entry point for one part of the daily report: optional summary + section chunks
+def render_daily_part(report_date, counts, sections):
+    register_pdf_font()
+    styles = daily_styles()
+    content = []
+    if counts is not None:
+        content = daily_summary_flowables(styles, report_date, counts)
+    for title, data, drop_priority, start, total, col_widths in sections:
+        content.extend(daily_section_flowables(styles, title, data, drop_priority=drop_priority, start=start,
+                                               total=total, col_widths=col_widths))
+    return build_pdf(content, A4, on_page=add_header_border).getvalue()
+
+
+# 🔹 Runs (fn, args) jobs across processes, preserving job order; falls back to in-process rendering
+# where worker processes are unavailable (e.g. restricted hosting).
+# Workers are spawned, not forked: the dashboard renders from inside the multi-threaded Streamlit server.
+def run_jobs(jobs, max_workers=None):
+    workers = min(len(jobs), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [fn(*args) for fn, args in jobs]
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = [pool.submit(fn, *args) for fn, args in jobs]
+            return [f.result() for f in futures]
+    except (BrokenProcessPool, OSError):
+        return [fn(*args) for fn, args in jobs]
+
+
+# 🔹 Stitches rendered parts in order and stamps continuous "Page N" footers, matching add_header_footer
+def merge_parts(parts, pagesize):
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(BytesIO(part)))
+
+    register_pdf_font()
+    overlay_buffer = BytesIO()
+    overlay = pdf_canvas.Canvas(overlay_buffer, pagesize=pagesize)
+    for page_number in range(1, len(writer.pages) + 1):
+        draw_page_number(overlay, pagesize[0], page_number)
+        overlay.showPage()
+    overlay.save()
+
+    overlay_pages = PdfReader(BytesIO(overlay_buffer.getvalue())).pages
+    for page, stamp in zip(writer.pages, overlay_pages):
+        page.merge_page(stamp)
+
+    buffer = BytesIO()
+    writer.write(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+def render_monthly_report_parallel(selected_month, report_df, total_inr, percent_75, exchange_info_line,
+                                   highlight_rows=None, max_workers=None):
+    register_pdf_font()
+    summary = monthly_summary_flowables(monthly_styles(), selected_month, total_inr, percent_75, exchange_info_line)
+    col_widths, row_heights = table_geometry(monthly_table_data(report_df), MONTHLY_TABLE_STYLE)
+
+    highlight_rows = sorted(highlight_rows or [])
+    jobs = []
+    for [(_, start, end)] in layout_parts(summary, [([], col_widths, row_heights)], landscape(A4)):
+        chunk_highlights = [row - start for row in highlight_rows if start <= row < end]
+        jobs.append((render_monthly_part, (selected_month, report_df.iloc[start:end], total_inr, percent_75,
+                                           exchange_info_line, chunk_highlights, start == 0, col_widths)))
+    return merge_parts(run_jobs(jobs, max_workers), landscape(A4))
+
+
+def render_daily_activity_parallel(report_date, frames, max_workers=None):
+    register_pdf_font()
+    styles = daily_styles()
+    counts = [len(f) for f in frames]
+    summary = daily_summary_flowables(styles, report_date, counts)
+
+    # Empty sections render nothing, in the serial layout too
+    present = [(title, drop_priority, data) for (title, drop_priority), data in zip(DAILY_SECTIONS, frames)
+               if not data.empty]
+    sections = []
+    for title, drop_priority, data in present:
+        table_data, _ = daily_table_data(data, drop_priority)
+        sections.append((daily_heading_flowables(styles, title, len(data)),
+                         *table_geometry(table_data, DAILY_TABLE_STYLE)))
+
+    # Summary travels with the first part, as at the top of the serial report
+    jobs = []
+    for part in layout_parts(summary, sections, A4):
+        chunks = [(present[section][0], present[section][2].iloc[start:end], present[section][1], start,
+                   len(present[section][2]), sections[section][1]) for section, start, end in part]
+        jobs.append((render_daily_part, (report_date, counts if not jobs else None, chunks)))
+    return merge_parts(run_jobs(jobs, max_workers), A4)
@@ -7,10 +7,19 @@ from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib import colors
 from io import BytesIO
 import os
-from .utils import format_inr, trim_text
+from .utils import format_inr, trimmed_rows
 
 
-def add_header_footer(canvas, doc):
+MAWB_COLUMN = "MAWB No. / Consignment No./  Bill of Lading No."
+
+
+def draw_page_number(canvas, width, page_number):
+    canvas.setFont("NotoSans", 8)
+    canvas.setFillColor(colors.grey)
+    canvas.drawRightString(width - 40, 20, f"Page {page_number}")
+
+
+def add_header_border(canvas, doc):
     width, height = doc.pagesize
     canvas.saveState()
 
@@ -19,12 +28,6 @@ def add_header_footer(canvas, doc):
     canvas.setFillColor(colors.darkblue)
     canvas.drawString(40, height - 30, "✈️ Procurement Monitoring Dashboard")
 
-    # Page Footer
-    canvas.setFont("NotoSans", 8)
-    canvas.setFillColor(colors.grey)
-    page_number_text = f"Page {canvas.getPageNumber()}"  # ✅ safe
-    canvas.drawRightString(width - 40, 20, page_number_text)
-
     # Border
     canvas.setStrokeColor(colors.lightgrey)
     canvas.rect(25, 25, width - 50, height - 50, stroke=1)
@@ -32,25 +35,53 @@ def add_header_footer(canvas, doc):
     canvas.restoreState()
 
 
+def add_header_footer(canvas, doc):
+    width, height = doc.pagesize
+    add_header_border(canvas, doc)
 
-def generate_monthly_report_pdf(selected_month, report_df, total_inr, percent_75, exchange_info_line, highlight_rows=None):
-    from reportlab.platypus import SimpleDocTemplate
+    # Page Footer
+    canvas.saveState()
+    draw_page_number(canvas, width, canvas.getPageNumber())  # ✅ safe
+    canvas.restoreState()
 
-    buffer = BytesIO()
-    doc = BaseDocTemplate(buffer, pagesize=landscape(A4), leftMargin=30, rightMargin=30, topMargin=50, bottomMargin=40)
-    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='landscape')
-    template = PageTemplate(id='landscape_template', frames=frame, onPage=add_header_footer)
-    doc.addPageTemplates([template])
 
-    # Font setup (required!)
+# 🔹 Font setup (required!) — also called inside worker processes when rendering in parallel
+def register_pdf_font():
     font_path = os.path.join(os.getcwd(), "NotoSans-Regular.ttf")
     pdfmetrics.registerFont(TTFont("NotoSans", font_path))
 
+
+def monthly_styles():
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name='BlueTitle', parent=styles['Title'], textColor=colors.darkblue, fontName='NotoSans'))
     styles.add(ParagraphStyle(name='NormalNoto', parent=styles['Normal'], fontName='NotoSans'))
+    return styles
+
 
-    content = [
+def daily_styles():
+    styles = getSampleStyleSheet()
+    styles.add(ParagraphStyle(name='BlueTitle', parent=styles['Title'], textColor=colors.darkblue, fontName='NotoSans'))
+    styles.add(ParagraphStyle(name='GreenHeading', parent=styles['Heading3'], textColor=colors.darkgreen, fontName='NotoSans'))
+    styles['Normal'].fontName = 'NotoSans'
+    return styles
+
+
+# 🔹 Builds a BaseDocTemplate with a single full-page frame and renders the flowables into a buffer
+def build_pdf(content, pagesize, on_page=add_header_footer, doc_class=BaseDocTemplate):
+    buffer = BytesIO()
+    doc = doc_class(buffer, pagesize=pagesize, leftMargin=30, rightMargin=30, topMargin=50, bottomMargin=40)
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
+    template = PageTemplate(id='content', frames=frame, onPage=on_page)
+    doc.addPageTemplates([template])
+
+    doc.build(content)
+    buffer.seek(0)
+    return buffer
+
+
+# 🔹 Title + total/7.5%/exchange lines shown at the top of the monthly report
+def monthly_summary_flowables(styles, selected_month, total_inr, percent_75, exchange_info_line):
+    return [
         Paragraph(f"📅 Monthly Procurement Report – {selected_month}", styles['BlueTitle']),
         Spacer(1, 12),
         Paragraph(f"💰 Total Procurement Value: <b>{format_inr(total_inr)}</b>", styles['NormalNoto']),
@@ -60,114 +91,148 @@ def generate_monthly_report_pdf(selected_month, report_df, total_inr, percent_75
         Spacer(1, 12),
     ]
 
+
+MONTHLY_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
+    ('FONTNAME', (0, 0), (-1, -1), 'NotoSans'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+]
+
+
+def monthly_table_data(report_df):
     # Table header + data
-    table_data = [list(report_df.columns)] + report_df.applymap(trim_text).values.tolist()
-
-    table = Table(table_data, repeatRows=1)
-    style = TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-        ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
-        ('FONTNAME', (0, 0), (-1, -1), 'NotoSans'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ])
-    if highlight_rows:
-        for row in highlight_rows:
-            style.add('BACKGROUND', (0, row + 1), (-1, row + 1), colors.orange)
-    table.setStyle(style)
-    content.append(table)
+    return [list(report_df.columns)] + trimmed_rows(report_df)
 
-    doc.build(content)
-    buffer.seek(0)
-    return buffer
 
+# 🔹 Monthly report table; highlight_rows are positional indexes into report_df (AOG rows).
+# col_widths fixes the column widths (a page range rendered on its own keeps the full table's widths).
+def monthly_table(report_df, highlight_rows=None, col_widths=None):
+    table = Table(monthly_table_data(report_df), colWidths=col_widths, repeatRows=1)
+    style = TableStyle(MONTHLY_TABLE_STYLE)
+    if highlight_rows:
+        for row in highlight_rows:
+            style.add('BACKGROUND', (0, row + 1), (-1, row + 1), colors.orange)
+    table.setStyle(style)
+    return table
 
-def generate_daily_activity_pdf(report_date, new_orders, shipped_items, grn_items, stock_in_items):
-    buffer = BytesIO()
 
+def generate_monthly_report_pdf(selected_month, report_df, total_inr, percent_75, exchange_info_line, highlight_rows=None,
+                                parallel=None):
+    # Large tables are split into page ranges and laid out in worker processes
+    from .pdf_parallel import use_parallel, render_monthly_report_parallel
+    if use_parallel(len(report_df), parallel):
+        return render_monthly_report_parallel(selected_month, report_df, total_inr, percent_75, exchange_info_line,
+                                              highlight_rows)
 
+    register_pdf_font()
+    styles = monthly_styles()
 
+    content = monthly_summary_flowables(styles, selected_month, total_inr, percent_75, exchange_info_line)
+    content.append(monthly_table(report_df, highlight_rows))
 
-    # Font setup
-    font_path = os.path.join(os.getcwd(), "NotoSans-Regular.ttf")
-    pdfmetrics.registerFont(TTFont("NotoSans", font_path))
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(name='BlueTitle', parent=styles['Title'], textColor=colors.darkblue, fontName='NotoSans'))
-    styles.add(ParagraphStyle(name='GreenHeading', parent=styles['Heading3'], textColor=colors.darkgreen, fontName='NotoSans'))
-    styles['Normal'].fontName = 'NotoSans'
+    return build_pdf(content, landscape(A4))
 
-    # Doc + layout
-    doc = BaseDocTemplate(buffer, pagesize=A4, leftMargin=30, rightMargin=30, topMargin=50, bottomMargin=40)
-    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id='normal')
-    template = PageTemplate(id='content', frames=frame, onPage=add_header_footer)
-    doc.addPageTemplates([template])
 
+# 🔹 Title, date and per-section row counts shown at the top of the daily report
+def daily_summary_flowables(styles, report_date, counts):
     content = [Paragraph(f"📅 Daily Procurement Activity Report", styles['BlueTitle']), Spacer(1, 12),
                Paragraph(f"🗓️ Date: {report_date}", styles['Normal']), Spacer(1, 6)]
 
     # 🔹 Add Summary Page
-
-    summary_items = [
-        ("🆕 New Orders", len(new_orders)),
-        ("🚚 Shipped Items", len(shipped_items)),
-        ("✅ GRN Entries", len(grn_items)),
-        ("📦 Stock-In Entries", len(stock_in_items)),
-    ]
-    for label, count in summary_items:
+    labels = ["🆕 New Orders", "🚚 Shipped Items", "✅ GRN Entries", "📦 Stock-In Entries"]
+    for label, count in zip(labels, counts):
         content.append(Paragraph(f"- {label}: <b>{count}</b> rows", styles['Normal']))
         content.append(Spacer(1, 2))
+    return content
 
-    ####content.append(PageBreak())
-# 🔹 Table Section Renderer (only if data exists)
-    def add_table_section(title, data, drop_priority=False):
-        if data.empty:
-            return
+
+DAILY_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D3E9FF')),
+    ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
+    ('FONTNAME', (0, 0), (-1, -1), 'NotoSans'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+]
+
+
+def daily_heading_flowables(styles, title, total):
+    return [Paragraph(f"{title} (Total: {total})", styles['GreenHeading']), Spacer(1, 6)]
+
+
+# 🔹 Rows of a daily section table (header + Sl No. numbered rows) and its AOG row mask
+def daily_table_data(data, drop_priority=False, start=0):
     # ✅ Rename long MAWB column for PDF readability
-        if "MAWB No. / Consignment No./  Bill of Lading No." in data.columns:
-            data = data.rename(columns={"MAWB No. / Consignment No./  Bill of Lading No.": "MAWB/Consignment/BL No."})
-
-        content.append(Paragraph(f"{title} (Total: {len(data)})", styles['GreenHeading']))
-        content.append(Spacer(1, 6))
-
-        # Capture AOG rows before optionally dropping PRIORITY column
-        highlight_mask = None
-        if "PRIORITY" in data.columns:
-            highlight_mask = data["PRIORITY"].astype(str).str.upper() == "AOG"
-            if drop_priority:
-                data = data.drop(columns=["PRIORITY"])
-
-        headers = ["Sl No."] + list(data.columns)  # Sl No. becomes first column
-        rows = data.values.tolist()
-
-        # Add serial number to each row
-        numbered_rows = [[str(i + 1)] + [trim_text(cell) for cell in row] for i, row in enumerate(rows)]
-
-        trimmed_data = [headers] + numbered_rows  # Final data with Sl No.
-
-        table = Table(trimmed_data, repeatRows=1)
-        style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D3E9FF')),
-            ('GRID', (0, 0), (-1, -1), 0.25, colors.black),
-            ('FONTNAME', (0, 0), (-1, -1), 'NotoSans'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.darkblue),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ])
-        if highlight_mask is not None:
-            for idx, is_aog in enumerate(highlight_mask):
-                if is_aog:
-                    style.add('BACKGROUND', (0, idx + 1), (-1, idx + 1), colors.orange)
-        table.setStyle(style)
-        content.append(table)
-        #######content.append(PageBreak())
+    if MAWB_COLUMN in data.columns:
+        data = data.rename(columns={MAWB_COLUMN: "MAWB/Consignment/BL No."})
+
+    # Capture AOG rows before optionally dropping PRIORITY column
+    highlight_mask = None
+    if "PRIORITY" in data.columns:
+        highlight_mask = data["PRIORITY"].astype(str).str.upper() == "AOG"
+        if drop_priority:
+            data = data.drop(columns=["PRIORITY"])
+
+    headers = ["Sl No."] + list(data.columns)  # Sl No. becomes first column
+
+    # Add serial number to each row, then trim / stringify column by column
+    numbered = data.copy()
+    numbered.insert(0, "Sl No.", range(start + 1, start + len(data) + 1), allow_duplicates=True)
+
+    trimmed_data = [headers] + trimmed_rows(numbered)  # Final data with Sl No.
+    return trimmed_data, highlight_mask
+
+
+# 🔹 Table Section Renderer (only if data exists)
+# start / total allow a section to be split into page ranges: Sl No. continues from `start`
+# and only the first chunk carries the section heading. col_widths fixes the column widths.
+def daily_section_flowables(styles, title, data, drop_priority=False, start=0, total=None, col_widths=None):
+    if data.empty:
+        return []
+
+    content = []
+    if start == 0:
+        content.extend(daily_heading_flowables(styles, title, len(data) if total is None else total))
+
+    trimmed_data, highlight_mask = daily_table_data(data, drop_priority, start)
+    table = Table(trimmed_data, colWidths=col_widths, repeatRows=1)
+    style = TableStyle(DAILY_TABLE_STYLE)
+    if highlight_mask is not None:
+        for idx, is_aog in enumerate(highlight_mask):
+            if is_aog:
+                style.add('BACKGROUND', (0, idx + 1), (-1, idx + 1), colors.orange)
+    table.setStyle(style)
+    content.append(table)
+    return content
+
+
+# Section title + whether the PRIORITY column is dropped from the rendered table
+DAILY_SECTIONS = [
+    ("🆕 New Orders", True),
+    ("🚚 Shipped Items", True),
+    ("✅ GRN Entries", False),
+    ("📦 Stock-In Entries", False),
+]
+
+
+def generate_daily_activity_pdf(report_date, new_orders, shipped_items, grn_items, stock_in_items, parallel=None):
+    frames = [new_orders, shipped_items, grn_items, stock_in_items]
+
+    # Independent sections (and page ranges of large sections) are laid out in worker processes
+    from .pdf_parallel import use_parallel, render_daily_activity_parallel
+    if use_parallel(sum(len(f) for f in frames), parallel):
+        return render_daily_activity_parallel(report_date, frames)
+
+    register_pdf_font()
+    styles = daily_styles()
+
+    content = daily_summary_flowables(styles, report_date, [len(f) for f in frames])
 
     # 🔹 Conditional Rendering
-    add_table_section("🆕 New Orders", new_orders, drop_priority=True)
-    add_table_section("🚚 Shipped Items", shipped_items, drop_priority=True)
-    add_table_section("✅ GRN Entries", grn_items)
-    add_table_section("📦 Stock-In Entries", stock_in_items)
+    for (title, drop_priority), data in zip(DAILY_SECTIONS, frames):
+        content.extend(daily_section_flowables(styles, title, data, drop_priority=drop_priority))
 
     # 🔹 Build final PDF
-    doc.build(content)
-    buffer.seek(0)
-    return buffer
+    return build_pdf(content, A4)
@@ -0,0 +1,149 @@
+# app/quality.py
+# Data-quality exception scan over a whole upload. Every rule is a vectorized mask over the batch
+# rows or the order lines, evaluated once per upload; flagged rows are collected into one
+# categorized exceptions table plus per-rule counts, instead of anomalies surfacing only when a
+# user happens to open the view that shows them.
+import numpy as np
+import pandas as pd
+
+from .order_lines import ORDER_LINE_KEYS, MAWB_COLUMN, MAWB_DATE_COLUMN, UNPARSED_DATES_COLUMN
+from .report_cache import excel_report
+
+SEVERITIES = ['High', 'Medium', 'Low']
+EXCEPTION_COLUMNS = ['Severity', 'Category', 'Rule', 'Order No.', 'Part No.', 'Supplier', 'Detail', 'Source File']
+COUNT_COLUMNS = ['Severity', 'Category', 'Rule', 'Exceptions', 'Orders', 'Description']
+
+# 🔹 Rule → (category, severity, description). Rules on "lines" see one row per order line (GRN / Stock
+# summed over batches); rules on "rows" see the export's batch rows.
+RULES = {
+    'GRN > Ordered': ('Quantities', 'High', "Line's GRN total exceeds its Order Qty (\"GRN > Ordered – Check\")"),
+    'Stock-In > GRN': ('Quantities', 'High', "Line's Stock Qty total exceeds its GRN total"),
+    'Negative quantity': ('Quantities', 'High', "Order, GRN or Stock Qty below zero on a batch row"),
+    'Zero Order Qty': ('Quantities', 'Medium', "Line ordered with Order Qty 0 or blank"),
+    'Conflicting Order Qty': ('Consistency', 'High', "Batch rows of one (Order No., Part No.) disagree on Order Qty"),
+    'Conflicting Unit Price': ('Consistency', 'Medium',
+                               "Batch rows of one (Order No., Part No.) disagree on Unit Price"),
+    'Missing Unit Price': ('Pricing', 'Medium', "Line without a positive Unit Price (left out of INR values)"),
+    'GRN without shipment': ('Shipment', 'Medium', "Batch row with GRN Qty but no MAWB / consignment number"),
+    'Unparseable date': ('Dates', 'High', "Date text that could not be read as a date (treated as blank)"),
+    'Missing Order Date': ('Dates', 'Medium', "Batch row without an Order Date (left out of monthly reports)"),
+    'Order Date in future': ('Dates', 'Low', "Order Date after today"),
+    'Dates out of sequence': ('Dates', 'Low', "Shipment before order, GRN before shipment or stock-in before GRN"),
+}
+
+
+def _blank(series):
+    return series.isna() | (series.astype(str).str.strip() == '')
+
+
+# 🔹 Numbers of an export column: text such as "N/A" becomes NaN instead of failing a comparison
+def _numeric(values):
+    return pd.to_numeric(pd.Series(values), errors='coerce')
+
+
+# 🔹 Values as detail text: numbers as '{:g}', blanks and text as 'blank'
+def _fmt(values):
+    return _numeric(values).map(lambda v: 'blank' if pd.isna(v) else f"{v:g}").to_numpy()
+
+
+# 🔹 Keys whose batch rows carry more than one distinct value of `col` (blank / text counted as a value)
+def _conflicting(df, col):
+    distinct = df[ORDER_LINE_KEYS].assign(**{col: _numeric(df[col])}).drop_duplicates()
+    conflicting = distinct[distinct.duplicated(ORDER_LINE_KEYS, keep=False)]
+    values = conflicting.groupby(ORDER_LINE_KEYS, sort=False)[col].agg(
+        lambda v: ' / '.join(_fmt(v.sort_values())))
+    return values.rename('Detail').reset_index()
+
+
+# 🔹 One pass per upload: every rule's mask over the batch rows (df) and order lines → flagged rows
+def rule_hits(df, order_lines, today=None):
+    today = pd.Timestamp.today().normalize() if today is None else today
+    hits = []
+
+    def flag(rule, frame, mask, detail):
+        mask = np.asarray(mask, dtype=bool)
+        if mask.any():
+            flagged = frame.loc[mask, [col for col in EXCEPTION_COLUMNS if col in frame.columns]]
+            hits.append(flagged.assign(Rule=rule, Detail=detail(frame[mask]) if callable(detail) else detail))
+
+    # Order lines: quantities summed over batches
+    lines = order_lines
+    flag('GRN > Ordered', lines, lines['GRN Qty'] > lines['Order Qty'],
+         lambda x: 'GRN ' + _fmt(x['GRN Qty']) + ' > ordered ' + _fmt(x['Order Qty']))
+    if 'Stock Qty' in lines.columns:
+        flag('Stock-In > GRN', lines, lines['Stock Qty'] > lines['GRN Qty'],
+             lambda x: 'Stock ' + _fmt(x['Stock Qty']) + ' > GRN ' + _fmt(x['GRN Qty']))
+    flag('Zero Order Qty', lines, lines['Order Qty'] == 0, 'Order Qty 0')
+    if 'Unit Price' in lines.columns:
+        flag('Missing Unit Price', lines, ~(_numeric(lines['Unit Price']) > 0),
+             lambda x: 'Unit Price ' + _fmt(x['Unit Price']))
+
+    # Batch rows
+    qty_cols = [col for col in ['Order Qty', 'GRN Qty', 'Stock Qty'] if col in df.columns]
+    quantities = df[qty_cols].apply(_numeric)
+    negative = (quantities < 0).any(axis=1)
+    flag('Negative quantity', df, negative,
+         lambda x: quantities.loc[x.index].apply(
+             lambda row: ', '.join(f"{c} {v:g}" for c, v in row.items() if v < 0), axis=1))
+    if MAWB_COLUMN in df.columns:
+        flag('GRN without shipment', df, (df['GRN Qty'] > 0) & _blank(df[MAWB_COLUMN]),
+             lambda x: 'GRN ' + _fmt(x['GRN Qty']) + ' without MAWB')
+    if UNPARSED_DATES_COLUMN in df.columns:
+        unparsed = df[UNPARSED_DATES_COLUMN] != ''
+        flag('Unparseable date', df, unparsed, lambda x: x[UNPARSED_DATES_COLUMN])
+        missing_date = df['Order Date'].isna() & ~df[UNPARSED_DATES_COLUMN].str.contains('Order Date:', regex=False)
+    else:
+        missing_date = df['Order Date'].isna()
+    flag('Missing Order Date', df, missing_date, 'Order Date blank')
+    flag('Order Date in future', df, df['Order Date'] > today,
+         lambda x: 'Order Date ' + x['Order Date'].dt.strftime('%d-%m-%Y'))
+
+    sequence = [('Order Date', MAWB_DATE_COLUMN, 'shipped'), (MAWB_DATE_COLUMN, 'GRN Date', 'GRN'),
+                ('GRN Date', 'Stock-In Date', 'stock-in')]
+    out_of_order = pd.Series('', index=df.index)
+    for start, end, label in sequence:
+        if start in df.columns and end in df.columns:
+            early = df[end] < df[start]
+            out_of_order[early] += f"{label} before {'order' if start == 'Order Date' else start.split()[0]}; "
+    flag('Dates out of sequence', df, out_of_order != '', lambda x: out_of_order[x.index].str.rstrip('; '))
+
+    # Keys whose batch rows disagree
+    for rule, col in [('Conflicting Order Qty', 'Order Qty'), ('Conflicting Unit Price', 'Unit Price')]:
+        if col in df.columns:
+            conflicts = _conflicting(df, col)
+            if len(conflicts):
+                first = lines[ORDER_LINE_KEYS + [c for c in ['Supplier', 'Source File'] if c in lines.columns]]
+                conflicts = conflicts.merge(first, on=ORDER_LINE_KEYS, how='left')
+                hits.append(conflicts.assign(Rule=rule, Detail=col + ' ' + conflicts['Detail']))
+
+    return hits
+
+
+# 🔹 (exceptions, counts): one row per flagged row / line, and one row per rule with its totals
+def scan_exceptions(df, order_lines, today=None):
+    hits = rule_hits(df, order_lines, today)
+    exceptions = pd.concat(hits, ignore_index=True) if hits else pd.DataFrame(columns=EXCEPTION_COLUMNS)
+    exceptions['Category'] = exceptions['Rule'].map(lambda rule: RULES[rule][0])
+    exceptions['Severity'] = pd.Categorical(exceptions['Rule'].map(lambda rule: RULES[rule][1]),
+                                            categories=SEVERITIES, ordered=True)
+    exceptions = exceptions.reindex(columns=[col for col in EXCEPTION_COLUMNS
+                                             if col != 'Source File' or col in exceptions.columns])
+    exceptions = exceptions.sort_values(['Severity', 'Category', 'Rule', 'Order No.', 'Part No.'],
+                                        kind='stable').reset_index(drop=True)
+
+    grouped = exceptions.groupby('Rule', sort=False)
+    counts = pd.DataFrame({
+        'Rule': list(RULES),
+        'Category': [category for category, _, _ in RULES.values()],
+        'Severity': pd.Categorical([severity for _, severity, _ in RULES.values()], categories=SEVERITIES,
+                                   ordered=True),
+        'Description': [description for _, _, description in RULES.values()],
+    })
+    counts['Exceptions'] = counts['Rule'].map(grouped.size()).fillna(0).astype(int)
+    counts['Orders'] = counts['Rule'].map(grouped['Order No.'].nunique()).fillna(0).astype(int)
+    counts = counts.sort_values(['Severity', 'Category', 'Rule'], kind='stable').reset_index(drop=True)
+    return exceptions, counts[COUNT_COLUMNS]
+
+
+def exceptions_excel(exceptions, counts):
+    return excel_report('quality-xlsx', [('Summary', counts), ('Exceptions', exceptions)])
@@ -0,0 +1,219 @@
+# app/query.py
+# Compound query parser + planner for the local Q&A box.
+# Questions such as "supplier sat air not shipped abc since 2025-01" are split into predicates
+# (supplier, part, order, aircraft, status, date range) and evaluated against row-sets that are
+# precomputed once per upload over the order lines, cheapest predicate first.
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+from .order_lines import MAWB_COLUMN
+
+STATUS_KEYWORDS = ["not shipped", "partial grn", "aog"]
+# Status keywords that, on their own, keep the Q&A box's dedicated view; the others go through the planner
+DEDICATED_STATUSES = ["not shipped", "partial grn"]
+DATE_WORDS = ["since", "after", "from", "before", "until", "to", "in"]
+FIELD_WORDS = ["supplier", "part", "order", "aircraft"]
+
+AIRCRAFT_PATTERN = re.compile(r"VT-[A-Z]{3}")
+DATE_PATTERN = r"(\d{4}-\d{2}(?:-\d{2})?)"
+
+
+# 🔹 Row positions (into the order lines) for every part, order, supplier, aircraft and status
+class QueryIndex:
+    def __init__(self, lines):
+        self.lines = lines.reset_index(drop=True)
+        self.parts = self.lines.groupby('Part No.').indices
+        self.orders = self.lines.groupby('Order No.').indices
+        self.suppliers = self.lines.groupby(self.lines['Supplier'].astype(str).str.strip().str.upper()).indices
+
+        # A line can name several aircraft ("VT-ABC, VT-XYZ"); it is indexed under each of them
+        aircraft = self.lines['A/C Reg. No'].astype(str).str.upper().str.findall(AIRCRAFT_PATTERN.pattern)
+        aircraft = aircraft.explode().dropna()
+        self.aircraft = {code: np.sort(rows.to_numpy()) for code, rows in
+                         aircraft.index.to_series().groupby(aircraft.values)}
+
+        no_shipping = self.lines[MAWB_COLUMN].astype(str).str.strip() == ''
+        self.statuses = {
+            "not shipped": np.flatnonzero((self.lines['GRN Qty'] == 0) & no_shipping),
+            "partial grn": np.flatnonzero(self.lines['Order Qty'] != self.lines['GRN Qty']),
+            "aog": np.flatnonzero(self.lines.get('PRIORITY', pd.Series('', index=self.lines.index))
+                                  .astype(str).str.upper() == 'AOG'),
+        }
+
+        # Order Date sorted once; a date range is then two binary searches
+        dates = self.lines['Order Date'].to_numpy(dtype='datetime64[ns]')
+        self.dates = dates
+        valid = np.flatnonzero(~np.isnat(dates))
+        self.date_order = valid[np.argsort(dates[valid], kind='stable')]
+        self.sorted_dates = dates[self.date_order]
+
+    def has_part(self, value):
+        return value.strip().upper() in self.parts
+
+    def has_order(self, value):
+        return value.strip().upper() in self.orders
+
+    # 🔹 Lines of one part / order / aircraft, selected by position instead of a full-column scan
+    def part_lines(self, value):
+        return self.lines.iloc[self.parts.get(value.strip().upper(), [])]
+
+    def order_lines(self, value):
+        return self.lines.iloc[self.orders.get(value.strip().upper(), [])]
+
+    def aircraft_lines(self, code):
+        return self.lines.iloc[self.aircraft.get(code.strip().upper(), [])]
+
+
+# 🔹 A predicate knows its label, how many rows it selects, and how to narrow a candidate row-set
+class Predicate:
+    def __init__(self, kind, label, rows=None, start=None, end=None):
+        self.kind = kind
+        self.label = label
+        self.row_set = rows
+        self.start = start
+        self.end = end
+
+    def estimate(self, index):
+        if self.kind == "date":
+            lo, hi = self.bounds(index)
+            return hi - lo
+        return len(self.row_set)
+
+    def bounds(self, index):
+        lo = 0 if self.start is None else np.searchsorted(index.sorted_dates, np.datetime64(self.start), 'left')
+        hi = len(index.sorted_dates) if self.end is None else np.searchsorted(index.sorted_dates,
+                                                                              np.datetime64(self.end), 'left')
+        return int(lo), int(hi)
+
+    def rows(self, index):
+        if self.kind == "date":
+            lo, hi = self.bounds(index)
+            return np.sort(index.date_order[lo:hi])
+        return self.row_set
+
+    def narrow(self, index, candidates):
+        if self.kind == "date":
+            dates = index.dates[candidates]
+            keep = ~np.isnat(dates)
+            if self.start is not None:
+                keep &= dates >= np.datetime64(self.start)
+            if self.end is not None:
+                keep &= dates < np.datetime64(self.end)
+            return candidates[keep]
+        return np.intersect1d(candidates, self.row_set, assume_unique=True)
+
+
+# 🔹 "2025-01" → (2025-01-01, 2025-02-01); "2025-01-15" → (2025-01-15, 2025-01-16)
+def period_bounds(text):
+    period = pd.Period(text, freq='M' if len(text) == 7 else 'D')
+    return period.start_time, (period + 1).start_time
+
+
+def union_rows(row_sets):
+    row_sets = list(row_sets)
+    if not row_sets:
+        return np.array([], dtype=np.intp)
+    return np.unique(np.concatenate(row_sets))
+
+
+# 🔹 Returns (question without its date phrases, date predicate or None, phrases whose date does not exist)
+def parse_dates(q):
+    start = end = None
+    labels = []
+    invalid = []
+    for word, value in re.findall(rf"\b(since|after|from|before|until|to|in)\s+{DATE_PATTERN}", q):
+        try:
+            first, after_last = period_bounds(value)
+        except ValueError:  # e.g. "2025-13" or "2025-02-30" (pandas' DateParseError is a ValueError)
+            invalid.append(f"{word} {value}")
+            continue
+        if word in ("since", "from"):
+            start = first
+        elif word == "after":
+            start = after_last
+        elif word == "before":
+            end = first
+        elif word in ("until", "to"):
+            end = after_last
+        else:
+            start, end = first, after_last
+        labels.append(f"{word} {value}")
+    q = re.sub(rf"\b(since|after|from|before|until|to|in)\s+{DATE_PATTERN}", " ", q)
+    if start is None and end is None:
+        return q, None, invalid
+    return q, Predicate("date", "order date " + " ".join(labels), start=start, end=end), invalid
+
+
+# 🔹 Splits a question into predicates; returns (predicates, words that were not understood)
+def parse_query(question, index):
+    q = f" {question.strip().lower()} "
+    predicates = []
+
+    # Supplier name runs until the next recognised keyword (status, field or "<date word> <date>")
+    stop = "|".join(STATUS_KEYWORDS + FIELD_WORDS + [rf"{w}\s+\d{{4}}" for w in DATE_WORDS])
+    match = re.search(rf"\bsupplier\s+(.+?)(?=\s+(?:{stop})\b|\s*$)", q)
+    if match:
+        name = match.group(1).strip().upper()
+        matched = [rows for supplier, rows in index.suppliers.items() if name in supplier]
+        predicates.append(Predicate("supplier", f"supplier ~ {name}", rows=union_rows(matched)))
+        q = q[:match.start()] + " " + q[match.end():]
+
+    for keyword in STATUS_KEYWORDS:
+        if re.search(rf"\b{keyword}\b", q):
+            predicates.append(Predicate("status", keyword, rows=index.statuses[keyword]))
+            q = re.sub(rf"\b{keyword}\b", " ", q)
+
+    q, date_predicate, unknown = parse_dates(q)
+    if date_predicate is not None:
+        predicates.append(date_predicate)
+
+    tokens = q.split()
+    i = 0
+    while i < len(tokens):
+        word = tokens[i]
+        field = None
+        if word in ("part", "order", "aircraft") and i + 1 < len(tokens):
+            field, word = word, tokens[i + 1]
+            i += 1
+        value = word.upper()
+        aircraft_code = value if AIRCRAFT_PATTERN.fullmatch(value) else f"VT-{value}"
+
+        if field in (None, "part") and value in index.parts:
+            predicates.append(Predicate("part", f"part {value}", rows=index.parts[value]))
+        elif field in (None, "order") and value in index.orders:
+            predicates.append(Predicate("order", f"order {value}", rows=index.orders[value]))
+        elif (field == "aircraft" or (field is None and aircraft_code in index.aircraft)) and (
+                AIRCRAFT_PATTERN.fullmatch(value) or (len(value) == 3 and value.isalpha())):
+            predicates.append(Predicate("aircraft", f"aircraft {aircraft_code}",
+                                        rows=index.aircraft.get(aircraft_code, np.array([], dtype=np.intp))))
+        else:
+            unknown.append(tokens[i])
+        i += 1
+    return predicates, unknown
+
+
+# 🔹 Intersects predicates cheapest first; returns (matching order lines, plan steps, elapsed ms)
+def run_query(predicates, index):
+    started = time.perf_counter()
+    plan = sorted(predicates, key=lambda p: p.estimate(index))
+    steps = []
+    candidates = None
+    for predicate in plan:
+        candidates = predicate.rows(index) if candidates is None else predicate.narrow(index, candidates)
+        steps.append((predicate.label, predicate.estimate(index), len(candidates)))
+        if len(candidates) == 0:
+            break
+    if candidates is None:
+        candidates = np.arange(len(index.lines))
+    result = index.lines.iloc[candidates]
+    return result, steps, (time.perf_counter() - started) * 1000
+
+
+# 🔹 Compound questions go through the planner; single-type questions keep their dedicated views.
+# Dates and statuses without a dedicated view (e.g. a lone "aog") have no other answer than the planner's.
+def is_compound(predicates):
+    return len(predicates) > 1 or any(
+        p.kind == "date" or (p.kind == "status" and p.label not in DEDICATED_STATUSES) for p in predicates)
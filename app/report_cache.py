@@ -0,0 +1,273 @@
+# app/report_cache.py
+# Content-addressed disk cache for generated report files (PDF / Excel).
+# The key is a hash of the rows going into the report plus its parameters (date, month,
+# exchange rate, …), so the same report for the same upload is rendered once and then
+# served from disk — across reruns, sessions and users.
+# Objects derived from an upload (parsed dataset, Q&A index) are kept here too, keyed by the
+# upload's bytes, so the watch-folder worker can prepare an export before anyone opens it.
+# They are pickled with an HMAC signature and only unpickled after the signature checks out, so a
+# file dropped into a shared cache folder cannot run code in the dashboard.
+import hashlib
+import hmac
+import json
+import os
+import pickle
+import secrets
+import threading
+import time
+from io import BytesIO
+
+import pandas as pd
+
+
+# Bump when report layout changes so stale files are never served
+REPORT_CACHE_VERSION = 5
+
+CACHE_DIR = os.environ.get("PROCUREMENT_REPORT_CACHE", os.path.join(os.getcwd(), ".report_cache"))
+MAX_CACHE_BYTES = int(os.environ.get("PROCUREMENT_REPORT_CACHE_MB", "512")) * 1024 * 1024
+# Secret for signing cached objects; processes sharing a cache need the same one. When unset, a key
+# is generated once per user in KEY_FILE (outside the cache folder, readable by the owner only).
+CACHE_KEY = os.environ.get("PROCUREMENT_REPORT_CACHE_KEY", "")
+KEY_FILE = os.path.join(os.path.expanduser("~"), ".procurement_report_cache.key")
+# Seconds before the running size is re-read from disk (other processes write to the same folder)
+USAGE_TTL = 60
+
+_stats = {"hits": 0, "misses": 0, "evictions": 0}
+_usage = {"entries": 0, "bytes": 0, "scanned": None}
+_lock = threading.Lock()
+_signing_key = []
+
+
+def _count(name, n=1):
+    with _lock:
+        _stats[name] += n
+
+
+# 🔹 Stable digest of a DataFrame's values, column names and dtypes
+def frame_digest(df):
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in df.columns]).encode())
+    digest.update(json.dumps([str(t) for t in df.dtypes]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def report_key(kind, frames, params):
+    digest = hashlib.sha256(f"{REPORT_CACHE_VERSION}:{kind}".encode())
+    for frame in frames:
+        digest.update(frame_digest(frame).encode())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _path(key, suffix):
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.{suffix}")
+
+
+def get(key, suffix):
+    path = _path(key, suffix)
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+    except OSError:
+        _count("misses")
+        return None
+    # Access time is tracked through mtime — LRU eviction removes the oldest first
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    _count("hits")
+    return data
+
+
+def put(key, suffix, data):
+    path = _path(key, suffix)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    try:
+        replaced = os.stat(path).st_size
+    except OSError:
+        replaced = None
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)  # atomic — concurrent writers of the same key are harmless
+    with _lock:
+        _usage["entries"] += replaced is None
+        _usage["bytes"] += len(data) - (replaced or 0)
+    if _current_usage()[1] > MAX_CACHE_BYTES:
+        evict()
+
+
+def _entries():
+    entries = []
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def _set_usage(entries, total):
+    with _lock:
+        _usage.update(entries=entries, bytes=total, scanned=time.monotonic())
+
+
+# 🔹 (files, bytes) in the cache: a running total kept by put / evict, re-read from disk every USAGE_TTL s
+def _current_usage():
+    with _lock:
+        scanned = _usage["scanned"]
+    if scanned is None or time.monotonic() - scanned > USAGE_TTL:
+        entries = _entries()
+        _set_usage(len(entries), sum(size for _, size, _ in entries))
+    with _lock:
+        return _usage["entries"], _usage["bytes"]
+
+
+# 🔹 Size-based LRU: drop least recently used files until the cache fits in max_bytes
+def evict(max_bytes=None):
+    max_bytes = MAX_CACHE_BYTES if max_bytes is None else max_bytes
+    entries = _entries()
+    total = sum(size for _, size, _ in entries)
+    count = len(entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        count -= 1
+        _count("evictions")
+    _set_usage(count, total)
+
+
+def cache_stats():
+    entries, total = _current_usage()
+    with _lock:
+        stats = dict(_stats)
+    stats["entries"] = entries
+    stats["bytes"] = total
+    return stats
+
+
+# 🔹 Returns the cached report for (kind, frames, params) or builds, stores and returns it
+def cached_report(kind, frames, params, build, suffix):
+    key = report_key(kind, frames, params)
+    data = get(key, suffix)
+    if data is None:
+        data = build().getvalue()
+        try:
+            put(key, suffix, data)
+        except OSError:
+            pass  # read-only or full disk: serve the fresh report uncached
+    return BytesIO(data)
+
+
+def upload_key(kind, file_bytes, params):
+    digest = hashlib.sha256(f"{REPORT_CACHE_VERSION}:{kind}".encode())
+    digest.update(hashlib.sha256(file_bytes).digest())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _read_key_file():
+    with open(KEY_FILE, "rb") as fh:
+        return fh.read()
+
+
+def _create_key_file():
+    tmp_path = f"{KEY_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(secrets.token_bytes(32))
+        os.link(tmp_path, KEY_FILE)  # atomic and never replaces a key another process created first
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(tmp_path)
+
+
+def signing_key():
+    with _lock:
+        if not _signing_key:
+            if CACHE_KEY:
+                key = CACHE_KEY.encode()
+            else:
+                try:
+                    if not os.path.exists(KEY_FILE):
+                        _create_key_file()
+                    key = _read_key_file()
+                except OSError:
+                    key = b""
+                # No usable key file: sign for this process only (entries from other processes are rebuilt)
+                key = key or secrets.token_bytes(32)
+            _signing_key.append(key)
+        return _signing_key[0]
+
+
+# 🔹 Signature over the entry's cache key and payload, so a valid entry cannot be copied to another key either
+def _signature(key, payload):
+    return hmac.new(signing_key(), key.encode() + b"\0" + payload, hashlib.sha256).digest()
+
+
+# 🔹 Returns the cached object built from an upload's bytes or builds, pickles and returns it.
+# Entries are <HMAC-SHA256><pickle>; anything that does not verify is rebuilt, never unpickled.
+def cached_object(kind, file_bytes, params, build):
+    key = upload_key(kind, file_bytes, params)
+    data = get(key, "pkl")
+    if data is not None:
+        signature, payload = data[:32], data[32:]
+        if hmac.compare_digest(signature, _signature(key, payload)):
+            try:
+                return pickle.loads(payload)
+            except Exception:
+                pass  # written by an incompatible pandas / app version: rebuild below
+    value = build()
+    try:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        put(key, "pkl", _signature(key, payload) + payload)
+    except (OSError, pickle.PicklingError):
+        pass
+    return value
+
+
+# 🔹 Report builders are imported on first use — reportlab / xlsxwriter stay out of app start-up
+def daily_activity_pdf(report_date, new_orders, shipped_items, grn_items, stock_in_items):
+    from .pdf_utils import generate_daily_activity_pdf
+    return cached_report(
+        "daily-pdf", [new_orders, shipped_items, grn_items, stock_in_items], {"date": report_date},
+        lambda: generate_daily_activity_pdf(report_date, new_orders, shipped_items, grn_items, stock_in_items),
+        "pdf")
+
+
+def monthly_report_pdf(selected_month, report_df, total_inr, percent_75, exchange_info_line, highlight_rows=None):
+    from .pdf_utils import generate_monthly_report_pdf
+    params = {"month": selected_month, "total_inr": total_inr, "percent_75": percent_75,
+              "exchange": exchange_info_line, "highlight_rows": list(highlight_rows or [])}
+    return cached_report(
+        "monthly-pdf", [report_df], params,
+        lambda: generate_monthly_report_pdf(selected_month, report_df, total_inr, percent_75, exchange_info_line,
+                                            highlight_rows=highlight_rows),
+        "pdf")
+
+
+def excel_report(kind, sheets, number_formats=None, hidden_columns=(), params=None, charts=None):
+    from .excel_utils import generate_excel_report
+    params = dict(params or {}, sheets=[name for name, _ in sheets], number_formats=number_formats,
+                  hidden_columns=list(hidden_columns))
+    if charts:
+        params['charts'] = charts
+    return cached_report(
+        kind, [frame for _, frame in sheets], params,
+        lambda: generate_excel_report(sheets, number_formats=number_formats, hidden_columns=hidden_columns,
+                                      charts=charts),
+        "xlsx")
@@ -0,0 +1,231 @@
+# app/reports.py
+# Daily activity and monthly procurement report inputs. Shared by the dashboard and the
+# watch-folder worker, so a report pre-rendered overnight is the same cache entry the
+# dashboard asks for in the morning.
+import calendar
+import math
+
+import numpy as np
+import pandas as pd
+
+from .utils import grn_status, stock_status, format_amounts
+from .excel_utils import INDIAN_AMOUNT_FORMAT, INR_FORMAT
+from .order_lines import MAWB_COLUMN, MAWB_DATE_COLUMN
+from .report_cache import daily_activity_pdf, monthly_report_pdf, excel_report
+
+DAILY_SHEETS = ['New Orders', 'Shipped Items', 'GRN Entries', 'Stock-In Entries']
+DEFAULT_USD_RATE = 84.0
+
+
+# 🔹 Every date with some activity (order, shipment, GRN or stock-in)
+def activity_dates(df):
+    return pd.concat([
+        df['Order Date'],
+        df[MAWB_DATE_COLUMN],
+        df['GRN Date'],
+        df['Stock-In Date']
+    ]).dropna().dt.date.unique()
+
+
+# 🔹 Row-level activity on one date: (new_orders, shipped_items, grn_items, stock_in_items)
+def daily_activity(df, selected_date):
+    new_orders = df[df['Order Date'].dt.date == selected_date][
+        [
+            'Order No.',
+            'REF. NO',
+            'Part No.',
+            'Description',
+            'Order Qty',
+            'A/C Reg. No',
+            'Supplier',
+            'PRIORITY',
+        ]
+    ].rename(columns={'REF. NO': 'Reference No'})
+
+    shipped_items = df[df[MAWB_DATE_COLUMN].dt.date == selected_date][
+        [
+            'Order No.',
+            'Part No.',
+            'Description',
+            'Order Qty',
+            'Supplier',
+            MAWB_COLUMN,
+            'Mode of Transport',
+            'PRIORITY',
+        ]
+    ]
+
+    grn_items = df[df['GRN Date'].dt.date == selected_date][
+        [
+            'Order No.',
+            'Part No.',
+            'Description',
+            'Order Qty',
+            'GRN Qty',
+            'PRIORITY',
+        ]
+    ].copy()
+
+    grn_items['Status'] = grn_items.apply(grn_status, axis=1)
+
+    # Optional: custom sort order
+    status_order = ['Fully Received', 'Partial GRN', 'Not Shipped']
+    grn_items['Status'] = pd.Categorical(grn_items['Status'], categories=status_order, ordered=True)
+    grn_items = grn_items.sort_values(by='Status')
+
+    stock_in_items = df[df['Stock-In Date'].dt.date == selected_date][
+        [
+            'Order No.',
+            'Part No.',
+            'Description',
+            'Order Qty',
+            'GRN Qty',
+            'Stock Qty',
+            'PRIORITY',
+        ]
+    ].copy()
+
+    stock_in_items['Status'] = stock_in_items.apply(stock_status, axis=1)
+    return new_orders, shipped_items, grn_items, stock_in_items
+
+
+def has_activity(frames):
+    return not all(frame.empty for frame in frames)
+
+
+def daily_pdf(selected_date, frames):
+    return daily_activity_pdf(selected_date, *frames)
+
+
+def daily_excel(frames):
+    return excel_report('daily-xlsx', [(name, frame) for name, frame in zip(DAILY_SHEETS, frames) if not frame.empty])
+
+
+# 🔹 "YYYY-MM" of each order line + the months that have orders
+def order_months(order_lines):
+    month_year = order_lines['Order Date'].dt.to_period('M').astype(str)
+    return month_year, sorted(month_year[order_lines['Order Date'].notna()].unique())
+
+
+# 🔹 Currency as 'INR' (INR / Indian Rupee) or 'USD' (everything else)
+def normalized_currency(currency):
+    return pd.Series(np.where(currency.isin(['INR', 'INDIAN RUPEE']), 'INR', 'USD'), index=currency.index,
+                     dtype=object)
+
+
+# 🔹 Adds normalized Currency, Exchange Rate, Quantity and Total (INR) to order lines
+def inr_values(lines, usd_rate=DEFAULT_USD_RATE):
+    lines = lines.copy()
+    lines['Currency'] = normalized_currency(lines['Currency'])
+
+    # Assign exchange rate
+    lines['Exchange Rate'] = lines['Currency'].map({'INR': 1}).fillna(usd_rate)
+
+    # Compute total INR
+    lines['Quantity'] = pd.to_numeric(lines['Order Qty'], errors='coerce')
+    lines['Total (INR)'] = lines['Quantity'] * lines['Unit Price'] * lines['Exchange Rate']
+    return lines
+
+
+# 🔹 Correctly rounded sum (missing values skipped) — independent of summation order, so totals
+# combined from partitions of a file equal the total over the whole file
+def exact_total(values):
+    return math.fsum(values.dropna().tolist())
+
+
+# 🔹 The exact sum of values as a few non-overlapping floats (usually one or two): each is the
+# correctly rounded remainder of the previous ones. Partials of several groups add up losslessly:
+# math.fsum(partials(a) + partials(b)) == exact_total(a + b), bit for bit.
+def exact_partials(values):
+    values = values.dropna().tolist()
+    partials = []
+    while True:
+        rest = math.fsum(values + [-p for p in partials])
+        if rest == 0:
+            return partials
+        partials.append(rest)
+
+
+# 🔹 Order lines, INR value and 7.5% per order month
+def monthly_totals(order_lines, usd_rate=DEFAULT_USD_RATE):
+    month_year, months = order_months(order_lines)
+    grouped = inr_values(order_lines, usd_rate)['Total (INR)'].groupby(month_year)
+    totals = pd.DataFrame({'Order Lines': grouped.size(), 'Total (INR)': grouped.agg(exact_total)}).reindex(months)
+    totals['7.5% Value'] = totals['Total (INR)'] * 0.075
+    return totals.rename_axis('Month').reset_index()
+
+
+# 🔹 Monthly report for "YYYY-MM": totals, the numeric report table, its formatted display copy and
+# the Excel copy (with a hidden PRIORITY column). None when no orders were placed that month.
+def monthly_report(order_lines, selected_month, usd_rate=DEFAULT_USD_RATE):
+    # Order lines already carry numeric Unit Price and upper-cased Currency
+    monthly_lines = order_lines.sort_values('First Row')
+    month_year, _ = order_months(monthly_lines)
+
+    # Filter monthly data
+    monthly_data = monthly_lines[month_year == selected_month]
+    if monthly_data.empty:
+        return None
+    monthly_data = inr_values(monthly_data, usd_rate)
+
+    # Convert YYYY-MM to "Month Year"
+    year, month = map(int, selected_month.split('-'))
+    formatted_month = f"{calendar.month_name[month]} {year}"
+    # One row per order line already — no over counting of repeated batches
+    monthly_data.reset_index(drop=True, inplace=True)
+
+    aog_rows = []
+    if 'PRIORITY' in monthly_data.columns:
+        aog_rows = [i for i, val in enumerate(monthly_data['PRIORITY'].astype(str).str.upper()) if val == 'AOG']
+
+    total_inr = exact_total(monthly_data['Total (INR)'])
+    percent_75 = total_inr * 0.075
+
+    # Calculate last day of the selected month
+    last_day = pd.to_datetime(selected_month + "-01") + pd.offsets.MonthEnd(0)
+    exchange_info_line = f"Exchange rate used as on {last_day.strftime('%d-%m-%Y')}: USD 1 = INR {usd_rate:.2f}"
+
+    # Prepare report
+    report_df = monthly_data[[
+        'Supplier', 'Order No.', 'Part No.', 'Description', 'Quantity',
+        'Currency', 'Unit Price', 'Exchange Rate', 'Total (INR)'
+    ]].copy()
+    report_df.columns = ['Vendor', 'Purchase Order', 'Part No.', 'Description', 'Quantity',
+                         'Currency', 'Unit Value', 'Exchange Rate', 'Total (₹)']
+    report_df.insert(0, 'S. No.', range(1, len(report_df) + 1))
+
+    # ✅ Format numeric columns to 2 decimal places (screen + PDF only, Excel stays numeric)
+    display_df = report_df.copy()
+    display_df['Unit Value'] = format_amounts(display_df['Unit Value'])
+    display_df['Total (₹)'] = format_amounts(display_df['Total (₹)'])
+
+    # PRIORITY rides along as a hidden Excel column to drive the AOG highlight
+    excel_df = report_df.copy()
+    if 'PRIORITY' in monthly_data.columns:
+        excel_df['PRIORITY'] = monthly_data['PRIORITY'].astype(str).str.upper().values
+
+    return {
+        'month': selected_month,
+        'formatted_month': formatted_month,
+        'total_inr': total_inr,
+        'percent_75': percent_75,
+        'exchange_info_line': exchange_info_line,
+        'aog_rows': aog_rows,
+        'report_df': report_df,
+        'display_df': display_df,
+        'excel_df': excel_df,
+    }
+
+
+def monthly_excel(report):
+    return excel_report(
+        'monthly-xlsx',
+        [('Monthly Report', report['excel_df'])],
+        number_formats={'Unit Value': INDIAN_AMOUNT_FORMAT, 'Exchange Rate': '0.00', 'Total (₹)': INR_FORMAT},
+        hidden_columns=['PRIORITY'],
+    )
+
+
+def monthly_pdf(report):
+    return monthly_report_pdf(report['formatted_month'], report['display_df'], report['total_inr'],
+                              report['percent_75'], report['exchange_info_line'], highlight_rows=report['aog_rows'])
@@ -0,0 +1,143 @@
+# app/rollup.py
+# Monthly rollup cube: order lines, order quantity and order value for every
+# order month × supplier × currency × priority, built in one grouped pass per upload.
+# Order Value is kept in the order currency. INR values are kept per cell as the exact partials
+# (reports.exact_partials) of its lines' Quantity × Unit Price × rate at the cube's USD rate — a few
+# floats per cell whatever its number of lines — so year-to-date and 12-month trend reports roll up
+# a few hundred cells instead of re-filtering every order line month by month, and their totals
+# match the monthly report's bit for bit. The cube is built once per upload and exchange rate.
+import math
+
+import pandas as pd
+
+from .excel_utils import INR_FORMAT, AMOUNT_FORMAT
+from .report_cache import excel_report
+from .reports import DEFAULT_USD_RATE, order_months, inr_values, exact_total, exact_partials
+
+DIMENSIONS = ['Month', 'Supplier', 'Currency', 'Priority']
+PERIODS = {'ytd': 'Year to date', '12m': 'Last 12 months'}
+INR_PARTIALS = 'INR Partials'  # per cell: exact partials of its lines' Total (INR), see reports.exact_partials
+TOP_SUPPLIERS = 5  # suppliers drawn separately in the trend chart; the rest are summed as "Others"
+
+
+# 🔹 One row per observed (Month, Supplier, Currency, Priority) with Order Lines, Order Qty, Order Value
+# (Quantity × Unit Price in the order currency), the cell's Exchange Rate and its INR_PARTIALS.
+# Lines without an Order Date are left out, as in the monthly report.
+def rollup_cube(order_lines, usd_rate=DEFAULT_USD_RATE):
+    month, _ = order_months(order_lines)
+    dated = order_lines['Order Date'].notna()
+    # The same (Quantity × Unit Price) × rate products the monthly report sums
+    valued = inr_values(order_lines, usd_rate)
+    priority = order_lines.get('PRIORITY', pd.Series('', index=order_lines.index))
+    keys = pd.DataFrame({
+        'Month': month,
+        'Supplier': order_lines['Supplier'].fillna('').astype(str).str.strip().replace('', '(unknown)'),
+        'Currency': valued['Currency'],
+        'Priority': priority.fillna('').astype(str).str.strip().str.upper().replace('', '(none)'),
+    })[dated]
+    values = pd.DataFrame({
+        'Order Qty': valued['Quantity'],
+        'Order Value': valued['Quantity'] * valued['Unit Price'],
+        'Exchange Rate': valued['Exchange Rate'],
+        'Total (INR)': valued['Total (INR)'],
+    })[dated]
+
+    grouped = values.groupby([keys[dim] for dim in DIMENSIONS], sort=True)
+    cube = pd.DataFrame({
+        'Order Lines': grouped.size(),
+        'Order Qty': grouped['Order Qty'].sum(),
+        'Order Value': grouped['Order Value'].agg(exact_total),
+        'Exchange Rate': grouped['Exchange Rate'].first(),
+    })
+    cube[INR_PARTIALS] = [exact_partials(group) for _, group in grouped['Total (INR)']]
+    return cube.reset_index()
+
+
+# 🔹 Exact INR total of the given cells: partials of separate cells add up losslessly
+def partials_total(cell_partials):
+    return math.fsum([p for partials in cell_partials for p in partials])
+
+
+# 🔹 Order months covered by a period ending at `end_month` ("YYYY-MM"), including months without orders
+def period_months(end_month, period='ytd'):
+    end = pd.Period(end_month, freq='M')
+    start = pd.Period(year=end.year, month=1, freq='M') if period == 'ytd' else end - 11
+    return [str(month) for month in pd.period_range(start, end, freq='M')]
+
+
+def _rolled(valued, column, months=None):
+    grouped = valued.groupby(column, sort=True)
+    rolled = pd.DataFrame({
+        'Order Lines': grouped['Order Lines'].sum(),
+        'Order Qty': grouped['Order Qty'].sum(),
+        'Total (INR)': grouped[INR_PARTIALS].agg(partials_total),
+    })
+    if months is not None:
+        return rolled.reindex(months, fill_value=0).rename_axis(column)
+    total = rolled['Total (INR)'].sum()
+    rolled['Share %'] = (rolled['Total (INR)'] / total * 100).round(1) if total else 0.0
+    return rolled.sort_values('Total (INR)', ascending=False, kind='stable')
+
+
+# 🔹 Year-to-date ('ytd') or trailing 12-month ('12m') report from a cube built at usd_rate:
+# totals, per-month / supplier / currency / priority rollups and a per-month supplier trend
+def period_report(cube, end_month, period='ytd', usd_rate=DEFAULT_USD_RATE):
+    if (cube.loc[cube['Currency'] != 'INR', 'Exchange Rate'] != usd_rate).any():
+        raise ValueError(f"rollup cube was not built at USD rate {usd_rate}")
+    months = period_months(end_month, period)
+    cells = cube[cube['Month'].isin(months)]
+    valued = cells.assign(**{'Total (INR)': [math.fsum(partials) for partials in cells[INR_PARTIALS]]})
+
+    total_inr = partials_total(valued[INR_PARTIALS])
+    by_month = _rolled(valued, 'Month', months)
+    by_month['7.5% Value'] = by_month['Total (INR)'] * 0.075
+
+    by_supplier = _rolled(valued, 'Supplier')
+    top = by_supplier.index[:TOP_SUPPLIERS]
+    trend = valued.assign(Supplier=valued['Supplier'].where(valued['Supplier'].isin(top), 'Others'))
+    supplier_trend = trend.groupby(['Month', 'Supplier'])[INR_PARTIALS].agg(partials_total).unstack()
+    supplier_trend = supplier_trend.reindex(index=months, columns=[*top, 'Others']).fillna(0.0)
+    if not supplier_trend['Others'].any():
+        supplier_trend = supplier_trend.drop(columns='Others')
+
+    first, last = months[0], months[-1]
+    return {
+        'period': period,
+        'end_month': end_month,
+        'label': f"{PERIODS[period]}: {pd.Period(first).strftime('%b %Y')} – {pd.Period(last).strftime('%b %Y')}",
+        'usd_rate': usd_rate,
+        'total_inr': total_inr,
+        'percent_75': total_inr * 0.075,
+        'order_lines': int(valued['Order Lines'].sum()),
+        'order_qty': float(valued['Order Qty'].sum()),
+        'by_month': by_month.reset_index(),
+        'by_supplier': by_supplier.reset_index(),
+        'by_currency': _rolled(valued, 'Currency').reset_index(),
+        'by_priority': _rolled(valued, 'Priority').reset_index(),
+        'supplier_trend': supplier_trend.rename_axis(columns=None).reset_index(),
+    }
+
+
+# 🔹 Excel workbook for a period report, with native column / line charts next to the trend sheets
+def period_excel(report):
+    trend = report['supplier_trend']
+    return excel_report(
+        'rollup-xlsx',
+        [
+            ('By Month', report['by_month']),
+            ('Supplier Trend', trend),
+            ('By Supplier', report['by_supplier']),
+            ('By Currency', report['by_currency']),
+            ('By Priority', report['by_priority']),
+        ],
+        number_formats={'Total (INR)': INR_FORMAT, '7.5% Value': INR_FORMAT, 'Order Qty': AMOUNT_FORMAT,
+                        **{col: INR_FORMAT for col in trend.columns if col != 'Month'}},
+        params={'label': report['label'], 'usd_rate': report['usd_rate']},
+        charts={
+            'By Month': {'type': 'column', 'categories': 'Month', 'values': ['Total (INR)'],
+                         'title': f"Order value (INR) — {report['label']}"},
+            'Supplier Trend': {'type': 'line', 'categories': 'Month',
+                               'values': [col for col in trend.columns if col != 'Month'],
+                               'title': 'Order value (INR) by supplier'},
+        },
+    )
@@ -0,0 +1,78 @@
+# app/snapshot_diff.py
+# What changed between two uploads: order lines are hash-joined on (Order No., Part No.) in one
+# pass and classified as New / Removed / Changed; order summaries are joined on Order No. to
+# list status transitions under the same `classify` rules used by the dashboard.
+import numpy as np
+import pandas as pd
+
+from .order_lines import ORDER_LINE_KEYS, MAWB_COLUMN
+
+COMPARE_COLUMNS = ['Order Qty', 'GRN Qty', 'Stock Qty', MAWB_COLUMN, 'Mode of Transport', 'QA Status', 'Unit Price',
+                   'Supplier']
+BEFORE, AFTER = " (before)", " (after)"
+
+
+def values_differ(before, after):
+    both_missing = before.isna() & after.isna()
+    return (before != after) & ~both_missing
+
+
+# 🔹 Line-level diff: one row per new, removed or changed order line
+def diff_order_lines(old_lines, new_lines):
+    columns = [col for col in COMPARE_COLUMNS if col in old_lines.columns and col in new_lines.columns]
+    info = [col for col in ['Description', 'Order Date'] if col in new_lines.columns or col in old_lines.columns]
+    old_info = [col for col in info if col in old_lines.columns]
+    new_info = [col for col in info if col in new_lines.columns]
+
+    merged = pd.merge(old_lines[ORDER_LINE_KEYS + columns + old_info], new_lines[ORDER_LINE_KEYS + columns + new_info],
+                      on=ORDER_LINE_KEYS, how='outer', suffixes=(BEFORE, AFTER), indicator=True)
+    # Description / Order Date as of the new upload; removed lines keep the ones they had before
+    for col in set(old_info) & set(new_info):
+        merged[col] = merged[col + AFTER].combine_first(merged[col + BEFORE])
+
+    changed_fields = pd.Series("", index=merged.index)
+    any_change = pd.Series(False, index=merged.index)
+    both = merged['_merge'] == 'both'
+    for col in columns:
+        differs = both & values_differ(merged[col + BEFORE], merged[col + AFTER])
+        any_change |= differs
+        changed_fields = changed_fields.mask(differs, changed_fields + np.where(changed_fields == "", "", ", ") + col)
+
+    merged['Change'] = np.select(
+        [merged['_merge'] == 'right_only', merged['_merge'] == 'left_only', any_change],
+        ['New', 'Removed', 'Changed'], default='Unchanged')
+    merged['Changed Fields'] = changed_fields
+    merged['GRN Qty Δ'] = merged['GRN Qty' + AFTER].fillna(0) - merged['GRN Qty' + BEFORE].fillna(0)
+
+    result = merged[merged['Change'] != 'Unchanged'].drop(columns='_merge')
+    ordered = ORDER_LINE_KEYS + ['Change', 'Changed Fields'] + info + ['GRN Qty Δ'] + \
+        [col + suffix for col in columns for suffix in (BEFORE, AFTER)]
+    return result[ordered].sort_values(['Change'] + ORDER_LINE_KEYS).reset_index(drop=True)
+
+
+# 🔹 Orders whose classify status moved (incl. orders that appeared / disappeared)
+def status_transitions(old_summary, new_summary):
+    merged = pd.merge(old_summary[['Order No.', 'Supplier', 'Status']], new_summary[['Order No.', 'Supplier', 'Status']],
+                      on='Order No.', how='outer', suffixes=(BEFORE, AFTER))
+    merged['Status' + BEFORE] = merged['Status' + BEFORE].fillna("(not in upload)")
+    merged['Status' + AFTER] = merged['Status' + AFTER].fillna("(not in upload)")
+    merged['Supplier'] = merged['Supplier' + AFTER].combine_first(merged['Supplier' + BEFORE])
+
+    moved = merged[merged['Status' + BEFORE] != merged['Status' + AFTER]]
+    return moved[['Order No.', 'Supplier', 'Status' + BEFORE, 'Status' + AFTER]].sort_values(
+        ['Status' + BEFORE, 'Status' + AFTER, 'Order No.']).reset_index(drop=True)
+
+
+# 🔹 "No Item Shipped → Shipped - No GRN: 12" style counts
+def transition_counts(transitions):
+    if transitions.empty:
+        return pd.DataFrame(columns=['From', 'To', 'Orders'])
+    counts = transitions.groupby(['Status' + BEFORE, 'Status' + AFTER]).size().reset_index(name='Orders')
+    counts.columns = ['From', 'To', 'Orders']
+    return counts.sort_values('Orders', ascending=False).reset_index(drop=True)
+
+
+def diff_snapshots(old_lines, old_summary, new_lines, new_summary):
+    line_changes = diff_order_lines(old_lines, new_lines)
+    transitions = status_transitions(old_summary, new_summary)
+    return line_changes, transitions, transition_counts(transitions)
@@ -0,0 +1,67 @@
+# app/table_view.py
+# Paginated table view: sorting, filtering and paging happen on the server, and only the
+# visible page of the selected columns is serialized to the browser.
+import math
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+# 🔹 Case-insensitive substring match across the given columns
+def filter_rows(df, text, columns):
+    if not text or not columns:
+        return df
+    needle = text.strip().upper()
+    mask = pd.Series(False, index=df.index)
+    for col in columns:
+        mask |= df[col].astype(str).str.upper().str.contains(needle, regex=False, na=False)
+    return df[mask]
+
+
+# 🔹 Pure paging step: returns (page rows of `columns`, total matching rows)
+def page_frame(df, columns=None, filter_text="", sort_by=None, descending=False, page=1, page_size=50):
+    columns = [col for col in (columns or df.columns) if col in df.columns]
+    view = filter_rows(df, filter_text, columns)
+    total = len(view)
+
+    if sort_by in view.columns:
+        # Sort positions only; rows are materialized just for the requested page
+        keys = view[sort_by].reset_index(drop=True)
+        try:
+            order = keys.sort_values(ascending=not descending, kind='stable', na_position='last').index
+        except TypeError:  # mixed types in an object column
+            order = keys.astype(str).sort_values(ascending=not descending, kind='stable').index
+        start = (page - 1) * page_size
+        return view.iloc[order[start:start + page_size]][columns], total
+
+    start = (page - 1) * page_size
+    return view.iloc[start:start + page_size][columns], total
+
+
+# 🔹 Used for large result tables (order summary, Q&A results) instead of st.dataframe(df)
+def paged_table(df, key, default_columns=None, page_size=50):
+    all_columns = list(df.columns)
+    default_columns = [col for col in (default_columns or all_columns) if col in all_columns]
+
+    c1, c2, c3, c4, c5 = st.columns([4, 3, 2, 1, 1])
+    columns = c1.multiselect("Columns", all_columns, default=default_columns, key=f"{key}_columns")
+    filter_text = c2.text_input("Filter rows", key=f"{key}_filter", placeholder="contains…")
+    sort_by = c3.selectbox("Sort by", ["—"] + columns, key=f"{key}_sort")
+    descending = c4.checkbox("Desc", key=f"{key}_desc")
+    page_size = c5.selectbox("Rows", PAGE_SIZES, index=PAGE_SIZES.index(page_size) if page_size in PAGE_SIZES else 1,
+                             key=f"{key}_page_size")
+
+    view = filter_rows(df, filter_text, columns)
+    pages = max(1, math.ceil(len(view) / page_size))
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, value=1, step=1,
+                           key=f"{key}_page_{pages}")
+
+    page_df, total = page_frame(view, columns, sort_by=sort_by if sort_by != "—" else None, descending=descending,
+                                page=page, page_size=page_size)
+    st.dataframe(page_df, hide_index=True)
+    first_row = (page - 1) * page_size + 1 if total else 0
+    shown = f"Rows {first_row:,}–{first_row + len(page_df) - 1 if total else 0:,} of {total:,}"
+    st.caption(shown + (f" (filtered from {len(df):,})" if total != len(df) else ""))
+    return total
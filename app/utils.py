@@ -1,5 +1,7 @@
 # app/utils.py
-from babel.numbers import format_currency
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
 
@@ -8,9 +10,52 @@ def trim_text(text, max_len=16):
     return str(text)[:max_len] if pd.notnull(text) else ""
 
 
+# 🔹 Column-at-a-time trim_text: same strings, without a Python call per cell
+def trim_column(series, max_len=16):
+    if series.dtype == object or (series.dtype.kind == "f" and np.signbit(series[series == 0]).any()):
+        # Mixed objects (1 vs 1.0 vs True) and -0.0 would collapse under factorize — stringify every cell
+        return series.astype(str).str[:max_len].where(series.notna(), "")
+    # Typed columns repeat values a lot (quantities, dates, categories): stringify each distinct value once
+    codes, uniques = pd.factorize(series)
+    labels = np.array([str(value)[:max_len] for value in uniques] + [""], dtype=object)
+    return pd.Series(labels[codes], index=series.index)
+
+
+# 🔹 Table preparation for PDF tables: every cell trimmed to a string, returned as a list of rows
+def trimmed_rows(df, max_len=16):
+    if df.empty:
+        return []
+    columns = [trim_column(df.iloc[:, i], max_len).tolist() for i in range(df.shape[1])]
+    return [list(row) for row in zip(*columns)]
+
+
+# 🔹 Indian digit grouping (12,34,567) — memoized, totals repeat across reruns and reports
+@lru_cache(maxsize=4096)
+def indian_grouping(value):
+    digits = str(abs(value))
+    head, tail = digits[:-3], digits[-3:]
+    groups = []
+    while head:
+        groups.insert(0, head[-2:])
+        head = head[:-2]
+    return ("-" if value < 0 else "") + ",".join(groups + [tail])
+
+
 # 🔹 Used in monthly report to format total INR values as ₹ with Indian-style formatting
+# Produces the same text as babel's format_currency(round(amount), 'INR', locale='en_IN')
 def format_inr(amount):
-    return format_currency(round(amount), 'INR', locale='en_IN')
+    grouped = indian_grouping(int(round(amount)))
+    return f"-₹{grouped[1:]}.00" if grouped.startswith("-") else f"₹{grouped}.00"
+
+
+# 🔹 Used in monthly report display / PDF to show amounts with 2 decimals (Excel keeps the raw numbers)
+def format_amount(x):
+    return f"{x:,.2f}" if pd.notnull(x) else ""
+
+
+# 🔹 Column-at-a-time format_amount
+def format_amounts(series):
+    return series.map("{:,.2f}".format, na_action='ignore').fillna("")
 
 
 # 🔹 Used in Order Summary status classification (based on GRN quantity & QA Status)
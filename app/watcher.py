@@ -0,0 +1,199 @@
+# app/watcher.py
+# Watch-folder worker: every Laminaar export dropped into the watched folder is ingested once,
+# the shared caches the dashboard reads are warmed (parsed dataset, Q&A index, report files) and
+# the previous day's activity report and the current month's report are written to an output
+# folder under the same file names the dashboard downloads use.
+#
+#   python -m app.watcher --watch /shared/laminaar --out /shared/reports
+#   python -m app.watcher --watch in --out out --once            # process what is there and exit
+#   python -m app.watcher --watch in --out out --once --date 2025-06-02
+#
+# Run it from the app directory (or with PROCUREMENT_REPORT_CACHE set to the dashboard's cache)
+# so both processes share one report cache.
+import argparse
+import datetime
+import hashlib
+import json
+import logging
+import os
+import time
+
+from .dataset import prepare_dataset, prepare_query_index
+from .loader import SUPPORTED_EXTENSIONS, file_extension
+from .reports import DEFAULT_USD_RATE, daily_activity, has_activity, daily_pdf, daily_excel, monthly_report, \
+    monthly_excel, monthly_pdf
+
+LEDGER_NAME = ".ingested.json"
+DEFAULT_INTERVAL = 60
+
+log = logging.getLogger("procurement.watcher")
+
+
+def load_ledger(out_dir):
+    try:
+        with open(os.path.join(out_dir, LEDGER_NAME)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"files": {}, "latest": None, "rendered_for": None}
+
+
+def save_ledger(out_dir, ledger):
+    path = os.path.join(out_dir, LEDGER_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(ledger, fh, indent=2)
+    os.replace(tmp_path, path)
+
+
+# 🔹 Exports whose size and mtime are unchanged since the previous scan (i.e. fully copied)
+def ready_exports(watch_dir, last_seen):
+    ready = []
+    seen = {}
+    for name in sorted(os.listdir(watch_dir)):
+        path = os.path.join(watch_dir, name)
+        if name.startswith(".") or file_extension(name) not in SUPPORTED_EXTENSIONS or not os.path.isfile(path):
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:  # removed or renamed since the listing
+            continue
+        seen[path] = (stat.st_size, stat.st_mtime)
+        if last_seen.get(path) == seen[path]:
+            ready.append(path)
+    last_seen.clear()
+    last_seen.update(seen)
+    return sorted(ready, key=lambda p: seen[p][1])
+
+
+def write_report(out_dir, file_name, buffer):
+    path = os.path.join(out_dir, file_name)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as fh:
+        fh.write(buffer.getvalue())
+    os.replace(tmp_path, path)  # readers never see a half-written report
+    return path
+
+
+# 🔹 Previous day's activity PDF / Excel and the current month's PDF / Excel for `today`
+def render_reports(file_bytes, extension, out_dir, today, usd_rate=DEFAULT_USD_RATE):
+    df, order_lines, _ = prepare_dataset(file_bytes, extension, today=today)
+    written = []
+
+    report_date = today - datetime.timedelta(days=1)
+    daily_frames = daily_activity(df, report_date)
+    if has_activity(daily_frames):
+        written.append(write_report(out_dir, f"activity_report_{report_date}.pdf",
+                                    daily_pdf(report_date, daily_frames)))
+        written.append(write_report(out_dir, f"daily_report_{report_date}.xlsx", daily_excel(daily_frames)))
+    else:
+        log.info("no activity on %s", report_date)
+
+    month = today.strftime("%Y-%m")
+    report = monthly_report(order_lines, month, usd_rate)
+    if report is not None:
+        written.append(write_report(out_dir, f"Monthly_Procurement_Report_{month}.xlsx", monthly_excel(report)))
+        written.append(write_report(out_dir, f"Monthly_Procurement_Report_{month}.pdf", monthly_pdf(report)))
+    else:
+        log.info("no orders placed in %s", month)
+    return written
+
+
+# 🔹 Parses a new export once (dataset + Q&A index land in the shared cache) and renders its reports
+def ingest(path, out_dir, ledger, today, usd_rate=DEFAULT_USD_RATE):
+    with open(path, "rb") as fh:
+        file_bytes = fh.read()
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    if digest in ledger["files"]:
+        return False
+
+    entry = {"file": os.path.basename(path), "ingested": datetime.datetime.now().isoformat(timespec="seconds")}
+    started = time.perf_counter()
+    try:
+        extension = file_extension(path)
+        prepare_query_index(file_bytes, extension, today=today)
+        entry["reports"] = [os.path.basename(p) for p in render_reports(file_bytes, extension, out_dir, today, usd_rate)]
+        ledger["latest"] = path
+        ledger["rendered_for"] = today.isoformat()
+        log.info("ingested %s in %.1f s: %s", entry["file"], time.perf_counter() - started,
+                 ", ".join(entry["reports"]) or "no reports")
+    except Exception as exc:  # a broken export must not stop the worker; it is not retried unless it changes
+        entry["error"] = str(exc)
+        log.exception("failed to ingest %s", entry["file"])
+    ledger["files"][digest] = entry
+    return True
+
+
+# 🔹 After midnight "previous day" and possibly the month change: re-render from the latest export
+def rerender_if_stale(out_dir, ledger, today, usd_rate=DEFAULT_USD_RATE):
+    latest = ledger.get("latest")
+    if not latest or ledger.get("rendered_for") == today.isoformat() or not os.path.isfile(latest):
+        return False
+    # Marked as done even when rendering fails, so a bad export is not retried (and logged) every scan
+    ledger["rendered_for"] = today.isoformat()
+    try:
+        with open(latest, "rb") as fh:
+            file_bytes = fh.read()
+        written = render_reports(file_bytes, file_extension(latest), out_dir, today, usd_rate)
+    except Exception:
+        log.exception("failed to re-render reports for %s from %s", today, os.path.basename(latest))
+        return True
+    log.info("re-rendered reports for %s from %s: %s", today, os.path.basename(latest),
+             ", ".join(os.path.basename(p) for p in written) or "no reports")
+    return True
+
+
+def run(watch_dir, out_dir, interval=DEFAULT_INTERVAL, usd_rate=DEFAULT_USD_RATE, once=False, today=None):
+    os.makedirs(out_dir, exist_ok=True)
+    ledger = load_ledger(out_dir)
+    last_seen, handled = {}, {}
+    while True:
+        report_day = today or datetime.date.today()
+        try:
+            if once:
+                ready_exports(watch_dir, last_seen)  # a one-shot run treats everything present as complete
+            ready = ready_exports(watch_dir, last_seen)
+        except OSError:  # e.g. a network share that is briefly unavailable
+            log.exception("could not scan %s", watch_dir)
+            ready = []
+        changed = False
+        for path in ready:
+            if handled.get(path) == last_seen[path]:
+                continue  # unchanged since it was last read
+            handled[path] = last_seen[path]
+            # Errors are handled per file: one bad export must not stop the others or the worker
+            try:
+                changed |= ingest(path, out_dir, ledger, report_day, usd_rate)
+            except OSError:  # moved away or still locked by the copy: read again on the next scan
+                handled.pop(path, None)
+                log.warning("could not read %s", path, exc_info=True)
+            except Exception:
+                log.exception("failed to process %s", path)
+        changed |= rerender_if_stale(out_dir, ledger, report_day, usd_rate)
+        if changed:
+            try:
+                save_ledger(out_dir, ledger)
+            except OSError:  # kept in memory and written again after the next change
+                log.exception("could not save %s", LEDGER_NAME)
+        if once:
+            return ledger
+        time.sleep(interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest Laminaar exports from a folder and pre-render reports")
+    parser.add_argument("--watch", required=True, help="folder the exports are dropped into")
+    parser.add_argument("--out", required=True, help="folder the rendered reports are written to")
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL, help="seconds between folder scans")
+    parser.add_argument("--usd-rate", type=float, default=DEFAULT_USD_RATE,
+                        help="USD to INR rate for the monthly report (the dashboard default)")
+    parser.add_argument("--date", type=datetime.date.fromisoformat, default=None,
+                        help="render as if today were this date (YYYY-MM-DD)")
+    parser.add_argument("--once", action="store_true", help="process the folder once and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    run(args.watch, args.out, interval=args.interval, usd_rate=args.usd_rate, once=args.once, today=args.date)
+
+
+if __name__ == "__main__":
+    main()
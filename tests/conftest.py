@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+
+from app import report_cache
+from app.order_lines import MAWB_COLUMN, prepare_orders, build_order_lines
+
+
+# 🔹 One order, three lines; Laminaar repeats a line once per shipment / GRN batch
+@pytest.fixture
+def order_lines():
+    raw = pd.DataFrame({
+        'Order No.': ['PO1', 'PO1', 'PO1', 'PO1', 'PO1'],
+        'Part No.': ['P1', 'P1', 'P2', 'P3', 'P3'],
+        'Order Qty': [2, 2, 5, 4, 4],
+        'GRN Qty': [0, 2, None, 1, 1],
+        MAWB_COLUMN: [None, 'M1', None, 'M2', 'M3'],
+        'Mode of Transport': [None, 'AIR', None, 'AIR', 'AIR'],
+        'Supplier': ['SAT AIR'] * 5,
+        'Description': ['Seal', 'Seal', 'Valve', 'Pump', 'Pump'],
+        'Order Date': ['01-02-2025'] * 5,
+        'A/C Reg. No': ['VT-ABC'] * 5,
+    })
+    return build_order_lines(prepare_orders(raw, date_formats={'Order Date': '%d-%m-%Y'}))
+
+
+# 🔹 Report cache in the test's tmp folder, signed with a key of its own (never ~/.procurement_report_cache.key)
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(report_cache, "CACHE_KEY", "")
+    monkeypatch.setattr(report_cache, "KEY_FILE", str(tmp_path / "cache.key"))
+    monkeypatch.setattr(report_cache, "_signing_key", [])
+    return tmp_path / "cache"
@@ -0,0 +1,114 @@
+import datetime
+import http.client
+import json
+import threading
+import types
+
+import pytest
+
+from app import api
+from tools.synthetic_export import synthetic_export, write_export
+
+
+@pytest.fixture(scope="module")
+def export_bytes(tmp_path_factory):
+    path = tmp_path_factory.mktemp("export") / "station.csv"
+    write_export(synthetic_export(rows=300, start="2025-01-01", days=90), str(path))
+    return path.read_bytes()
+
+
+# 🔹 The real ThreadingHTTPServer on a free port, serving one export
+@pytest.fixture
+def server(export_bytes, cache_dir):
+    snapshot = api.Snapshot((("station.csv", export_bytes),))
+    server = api.make_server(snapshot, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def get(server):
+    connection = http.client.HTTPConnection(*server.server_address, timeout=10)
+
+    def request(path):
+        connection.request("GET", path)
+        response = connection.getresponse()
+        assert response.getheader("Content-Type") == "application/json"
+        return response.status, json.loads(response.read())
+
+    yield request
+    connection.close()
+
+
+def test_order_part_and_aircraft_lookups(server, get):
+    lines = server.snapshot.lines
+    order_no, part_no = lines['Order No.'].iloc[0], lines['Part No.'].iloc[0]
+
+    status, order = get(f"/orders/{order_no.lower()}%20")
+    assert status == 200
+    assert order['order_no'] == order_no
+    assert sum(order['line_counts'].values()) == len(lines[lines['Order No.'] == order_no])
+    assert len(order['items']) == len(lines[lines['Order No.'] == order_no])
+
+    status, part = get(f"/parts/{part_no}")
+    assert status == 200 and part['part_no'] == part_no and part['orders']
+
+    status, aircraft = get("/aircraft/abc")
+    assert status == 200 and aircraft['aircraft'] == 'VT-ABC'
+    assert aircraft['total_orders'] == sum(len(orders) for orders in aircraft['orders_by_status'].values())
+
+
+def test_activity_and_monthly(get):
+    status, day = get("/activity/2025-01-15")
+    assert status == 200
+    assert set(day['counts']) == set(api.DAILY_SHEETS)
+    assert day['counts']['New Orders'] == len(day['New Orders']) > 0
+
+    status, quiet = get("/activity/1999-01-01")
+    assert status == 200 and not any(quiet['counts'].values())
+
+    status, monthly = get("/monthly?usd_rate=80")
+    assert status == 200 and monthly['usd_rate'] == 80
+    months = [row['Month'] for row in monthly['months']]
+    status, one = get(f"/monthly/{months[0]}?usd_rate=80")
+    assert status == 200 and one['months'] == monthly['months'][:1]
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/orders/NOPE", 404),
+    ("/aircraft/ZZZ", 404),
+    ("/monthly/1999-01", 404),
+    ("/nowhere", 404),
+    ("/orders/", 400),
+    ("/activity/2025-02-30", 400),
+    ("/monthly?usd_rate=eighty", 400),
+])
+def test_errors(get, path, expected):
+    status, body = get(path)
+    assert status == expected
+    assert body['error']
+
+
+def test_bodies_are_memoized_per_day(server, get, monkeypatch):
+    order_no = server.snapshot.lines['Order No.'].iloc[0]
+    server.snapshot.body.cache_clear()
+    get(f"/orders/{order_no}")
+    get(f"/orders/{order_no.lower()}")  # same normalized key
+    assert (server.snapshot.body.cache_info().hits, server.snapshot.body.cache_info().misses) == (1, 1)
+
+    class Tomorrow(datetime.date):
+        @classmethod
+        def today(cls):
+            return datetime.date.today() + datetime.timedelta(days=1)
+
+    monkeypatch.setattr(api, "datetime", types.SimpleNamespace(date=Tomorrow))
+    get(f"/orders/{order_no}")
+    assert server.snapshot.body.cache_info().misses == 2  # a new day is a new memo key
+
+    status, stats = get("/stats")
+    assert status == 200
+    assert stats['endpoints']['orders']['requests'] == 3
+    assert stats['files'] == ['station.csv']
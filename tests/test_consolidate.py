@@ -0,0 +1,57 @@
+import pandas as pd
+import pytest
+
+from app import consolidate
+from app.order_lines import MAWB_COLUMN
+
+
+def export(rows):
+    columns = ['Order No.', 'Part No.', 'Order Qty', 'GRN Qty', MAWB_COLUMN, 'GRN Date', 'Supplier', 'Order Date']
+    return pd.DataFrame(rows, columns=columns).to_csv(index=False).encode()
+
+
+# 🔹 Two stations' exports sharing PO1/P1 (newer GRN in the second), PO2/P2 (no GRN in either) and
+# PO3/P3 (same GRN Date in both); PO4/P4 is only in the first
+@pytest.fixture
+def uploads():
+    first = export([
+        ['PO1', 'P1', 5, 2, 'M1', '2025-03-01', 'SAT AIR', '2025-02-01'],
+        ['PO2', 'P2', 1, 0, None, None, 'AAR', '2025-02-02'],
+        ['PO3', 'P3', 3, 3, 'M3', '2025-03-05', 'AAR', '2025-02-03'],
+        ['PO4', 'P4', 2, 0, None, None, 'BOEING', '2025-02-04'],
+    ])
+    second = export([
+        ['PO1', 'P1', 5, 2, 'M1', '2025-03-01', 'SAT AIR', '2025-02-01'],
+        ['PO1', 'P1', 5, 3, 'M9', '2025-03-20', 'SAT AIR', '2025-02-01'],
+        ['PO2', 'P2', 1, 0, None, None, 'AAR', '2025-02-02'],
+        ['PO3', 'P3', 3, 3, 'M3', '2025-03-05', 'AAR', '2025-02-03'],
+    ])
+    return (('bom.csv', first), ('del.csv', second))
+
+
+def test_latest_grn_wins_and_ties_go_to_the_last_upload(uploads):
+    fleet, dropped = consolidate.consolidate(consolidate.parse_uploads(uploads))
+    sources = fleet.groupby('Part No.')[consolidate.SOURCE_COLUMN].unique().map(list).to_dict()
+    assert sources == {'P1': ['del.csv'], 'P2': ['del.csv'], 'P3': ['del.csv'], 'P4': ['bom.csv']}
+    assert len(fleet[fleet['Part No.'] == 'P1']) == 2  # every batch row of the kept line
+    assert dropped[['Part No.', 'Kept From', 'Dropped From']].values.tolist() == [
+        ['P1', 'del.csv', 'bom.csv'], ['P2', 'del.csv', 'bom.csv'], ['P3', 'del.csv', 'bom.csv']]
+
+
+def test_earlier_upload_wins_with_the_newer_grn(uploads):
+    (first_name, first), (second_name, second) = uploads
+    fleet, _ = consolidate.consolidate(consolidate.parse_uploads(((second_name, second), (first_name, first))))
+    sources = fleet.groupby('Part No.')[consolidate.SOURCE_COLUMN].first().to_dict()
+    assert sources == {'P1': 'del.csv', 'P2': 'bom.csv', 'P3': 'bom.csv', 'P4': 'bom.csv'}
+
+
+def test_spawned_workers_parse_like_in_process(uploads, monkeypatch):
+    serial = consolidate.parse_uploads(uploads)
+    monkeypatch.setattr(consolidate, "PARALLEL_MIN_BYTES", 0)
+    for expected, actual in zip(serial, consolidate.parse_uploads(uploads, max_workers=2)):
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_same_file_name_twice_keeps_sources_distinct(uploads):
+    (name, data), _ = uploads
+    assert [name for name, _ in consolidate.unique_names(((name, data), (name, data)))] == ['bom.csv', 'bom.csv (2)']
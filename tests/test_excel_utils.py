@@ -0,0 +1,52 @@
+import datetime
+
+import openpyxl
+import pandas as pd
+
+from app.excel_utils import AOG_COLOR, AMOUNT_FORMAT, DATE_FORMAT, INR_FORMAT, generate_excel_report, indian_format
+
+
+def round_trip(sheets, **kwargs):
+    return openpyxl.load_workbook(generate_excel_report(sheets, **kwargs))
+
+
+def test_values_stay_typed_and_blanks_stay_blank():
+    data = pd.DataFrame({
+        'Order No.': ['PO1', 'PO2'],
+        'Order Date': pd.to_datetime(['2025-03-01', None]),
+        'Order Qty': [4, 0],
+        'Value': [1234567.5, float('nan')],
+    })
+    sheet = round_trip([('Report', data)])['Report']
+    rows = [[cell.value for cell in row] for row in sheet.iter_rows()]
+    assert rows == [
+        ['Order No.', 'Order Date', 'Order Qty', 'Value'],
+        ['PO1', datetime.datetime(2025, 3, 1), 4, 1234567.5],
+        ['PO2', None, 0, None],
+    ]
+    assert sheet['A1'].font.bold
+    assert sheet.freeze_panes == 'A2'
+
+
+def test_column_formats_and_indian_bands():
+    data = pd.DataFrame({'Order Date': pd.to_datetime(['2025-03-01']), 'Qty': [2.0], 'Value': [-123456789.0],
+                         'Hidden': [1]})
+    sheet = round_trip([('Report', data)], number_formats={'Qty': AMOUNT_FORMAT, 'Value': INR_FORMAT},
+                       hidden_columns=['Hidden'])['Report']
+    assert [sheet.cell(2, col).number_format for col in range(1, 4)] == [DATE_FORMAT, AMOUNT_FORMAT, INR_FORMAT]
+    assert sheet.column_dimensions['D'].hidden
+
+    bands = {rule.formula[0]: rule.dxf.numFmt.formatCode
+             for cf in sheet.conditional_formatting if str(cf.sqref) == 'C2' for rule in cf.rules}
+    assert len(bands) == 5
+    assert bands['AND(ABS(ROUND(C2,2))>=10000000,ABS(ROUND(C2,2))<1000000000)'] == indian_format('₹', 9)
+    assert bands['ABS(ROUND(C2,2))>=10000000000000'] == indian_format('₹', 15)
+
+
+def test_aog_rows_are_highlighted_by_one_conditional_format():
+    data = pd.DataFrame({'Order No.': ['PO1', 'PO2', 'PO3'], 'PRIORITY': ['AOG', 'ROUTINE', None]})
+    sheet = round_trip([('Report', data), ('Empty', data.iloc[:0])])['Report']
+    [(ranges, rule)] = [(str(cf.sqref), rule) for cf in sheet.conditional_formatting for rule in cf.rules]
+    assert ranges == 'A2:B4'
+    assert rule.formula == ['$B2="AOG"']
+    assert rule.dxf.fill.bgColor.rgb == 'FF' + AOG_COLOR.lstrip('#')
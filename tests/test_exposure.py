@@ -0,0 +1,46 @@
+import math
+
+import pandas as pd
+import pytest
+
+from app.exposure import VALUE_COLUMN, exposure_summary
+
+
+@pytest.fixture
+def lines():
+    return pd.DataFrame({
+        'Order No.': ['PO1', 'PO1', 'PO2', 'PO3', 'PO4'],
+        'Part No.': ['P1', 'P2', 'P3', 'P4', 'P5'],
+        'Supplier': ['SAT AIR', 'SAT AIR', 'AAR', 'AAR', 'BOEING'],
+        'A/C Reg. No': ['VT-ABC', None, 'VT-ABC, VT-XYZ', 'VT-XYZ', 'VT-ABC'],
+        'Order Date': pd.to_datetime(['2025-01-10', '2025-01-20', '2025-02-05', None, '2025-02-01']),
+        'Order Qty': [10, 4, 3, 2, 5],
+        'GRN Qty': [4, 6, 0, 0, 5],  # P2 over-received, P5 fully received
+        'Currency': ['USD', 'INR', ' usd ', 'INR', 'USD'],
+        'Unit Price': [2.5, 100.0, 10.0, float('nan'), 1.0],
+    })
+
+
+def test_open_value_is_unreceived_qty_in_inr(lines):
+    open_lines, _, _, _, total = exposure_summary(lines, usd_rate=80)
+    assert open_lines['Part No.'].tolist() == ['P3', 'P1', 'P4']  # largest exposure first, unpriced last
+    assert open_lines['Open Qty'].tolist() == [3, 6, 2]
+    assert open_lines[VALUE_COLUMN].tolist()[:2] == [3 * 10.0 * 80, 6 * 2.5 * 80]
+    assert math.isnan(open_lines[VALUE_COLUMN].iloc[2])
+    assert total == 2400 + 1200
+
+
+def test_rollups_share_the_total(lines):
+    _, by_supplier, by_aircraft, by_month, total = exposure_summary(lines, usd_rate=80)
+    assert by_supplier[['Supplier', 'Open Lines', VALUE_COLUMN, 'Share %']].values.tolist() == [
+        ['AAR', 2, 2400.0, 66.7], ['SAT AIR', 1, 1200.0, 33.3]]
+    # A line for two aircraft is counted once, under its combined registration
+    assert by_aircraft['Aircraft'].tolist() == ['VT-ABC, VT-XYZ', 'VT-ABC', 'VT-XYZ']
+    assert by_month['Month'].tolist() == ['(no date)', '2025-01', '2025-02']  # in month order, not by value
+    assert by_month[VALUE_COLUMN].sum() == total
+
+
+def test_nothing_open(lines):
+    open_lines, by_supplier, _, by_month, total = exposure_summary(lines.assign(**{'GRN Qty': lines['Order Qty']}))
+    assert open_lines.empty and by_supplier.empty and by_month.empty
+    assert total == 0
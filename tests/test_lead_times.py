@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.lead_times import ALL, DIMENSIONS, lead_time_breakdown, lead_time_cube, lead_time_lookup
+from app.order_lines import MAWB_DATE_COLUMN
+
+
+def dates(days):
+    return pd.Timestamp('2025-01-01') + pd.to_timedelta(pd.Series(days, dtype=float), unit='D')
+
+
+@pytest.fixture
+def rows():
+    # Order → Ship takes 10, 20, 30, 40 days; the last row ships "before" it was ordered (ignored)
+    return pd.DataFrame({
+        'Supplier': ['SAT AIR', 'sat air ', 'AAR', 'AAR', 'AAR'],
+        'Mode of Transport': ['AIR', 'AIR', 'SEA', None, 'AIR'],
+        'PRIORITY': ['AOG', 'ROUTINE', None, 'aog', 'AOG'],
+        'Order Date': dates([0, 0, 0, 0, 10]),
+        MAWB_DATE_COLUMN: dates([10, 20, 30, 40, 5]),
+        'GRN Date': dates([12, np.nan, 31, 45, np.nan]),
+        'Stock-In Date': dates([12, np.nan, np.nan, 44, np.nan]),
+    })
+
+
+def test_overall_statistics_per_leg(rows):
+    summary = lead_time_lookup(lead_time_cube(rows), {}).set_index('Leg')
+    assert summary.index.tolist() == ['Order → Ship', 'Ship → GRN', 'GRN → Stock-In']
+    ship = summary.loc['Order → Ship']
+    assert ship[['Count', 'Mean', 'Min', 'Max']].tolist() == [4, 25.0, 10, 40]
+    # Linear interpolation, as pandas' quantile: P50 of 10/20/30/40 is 25, P90 is 37
+    assert ship[['P50', 'P75', 'P90', 'P95']].tolist() == pytest.approx([25.0, 32.5, 37.0, 38.5])
+    assert summary.loc['Ship → GRN', 'Count'] == 3
+    assert summary.loc['GRN → Stock-In', 'Count'] == 1  # stock-in before GRN is dropped
+
+
+def test_drill_down_matches_direct_statistics(rows):
+    cube = lead_time_cube(rows)
+    aog = lead_time_lookup(cube, {'Priority': 'AOG'}).set_index('Leg')
+    assert aog.loc['Order → Ship', ['Count', 'P50']].tolist() == [2, 25.0]  # rows 0 and 3
+    sat_air = lead_time_lookup(cube, {'Supplier': 'SAT AIR', 'Mode of Transport': 'AIR'}).set_index('Leg')
+    assert sat_air.loc['Order → Ship', ['Count', 'Min', 'Max']].tolist() == [2, 10, 20]
+    assert lead_time_lookup(cube, {'Supplier': 'NOBODY'}).empty
+
+
+def test_breakdown_and_grouping_sets(rows):
+    cube = lead_time_cube(rows)
+    by_mode = lead_time_breakdown(cube, 'Mode of Transport', {'Supplier': 'AAR'})
+    ship = by_mode[by_mode['Leg'] == 'Order → Ship']
+    assert ship['Mode of Transport'].tolist() == ['(unknown)', 'SEA']
+    assert ALL not in by_mode['Mode of Transport'].tolist()
+    # Every rolled-up key sums to the grand total count
+    totals = cube.xs(('Order → Ship', ALL, ALL, ALL), level=['Leg'] + DIMENSIONS[:3])['Count']
+    assert totals.sum() == 2 * 4  # per completion month + the "All" month
@@ -0,0 +1,26 @@
+import pandas as pd
+
+from app.lookups import order_status
+from app.order_lines import UNPARSED_DATES_COLUMN, prepare_orders, unshipped_lines
+
+
+def test_not_shipped_is_per_line(order_lines):
+    # P1's first batch has no GRN and no MAWB, but the line has been shipped and received
+    unshipped = unshipped_lines(order_lines)
+    assert unshipped['Part No.'].tolist() == ['P2']
+
+
+def test_order_status_counts_each_line_once(order_lines):
+    status = order_status(order_lines)
+    assert status['line_counts'] == {'Fully Shipped': 1, 'Partial GRN': 1, 'Not Shipped': 1}
+    assert status['items']['Part Number'].tolist() == ['P3', 'P2', 'P1']
+    assert not status['fully_shipped']
+
+
+def test_unparsed_date_names_expected_format():
+    # The format is inferred from the first value, so a later day-first date cannot be read
+    raw = pd.DataFrame({'Order No.': ['PO1', 'PO2'], 'Part No.': ['P1', 'P1'], 'Order Qty': [1, 1],
+                        'GRN Qty': [0, 0], 'Order Date': ['2025-03-15', '20-03-2025']})
+    df = prepare_orders(raw)
+    assert df['Order Date'].tolist() == [pd.Timestamp('2025-03-15'), pd.NaT]
+    assert df[UNPARSED_DATES_COLUMN].tolist() == ['', 'Order Date: 20-03-2025 (expected %Y-%m-%d)']
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from app.order_lines import MAWB_COLUMN, prepare_orders, build_order_lines
+from app.quality import COUNT_COLUMNS, EXCEPTION_COLUMNS, RULES, scan_exceptions
+
+TODAY = pd.Timestamp('2025-06-02')
+
+
+def scan(raw):
+    df = prepare_orders(pd.DataFrame(raw), today=TODAY)
+    return scan_exceptions(df, build_order_lines(df, today=TODAY), today=TODAY)
+
+
+def details(exceptions, rule):
+    flagged = exceptions[exceptions['Rule'] == rule]
+    return dict(zip(flagged['Order No.'] + '/' + flagged['Part No.'], flagged['Detail']))
+
+
+@pytest.fixture
+def raw():
+    return {
+        'Order No.': ['PO1', 'PO1', 'PO2', 'PO3', 'PO4', 'PO5', 'PO6'],
+        'Part No.': ['P1', 'P1', 'P2', 'P3', 'P4', 'P5', 'P6'],
+        'Order Qty': [2, 2, 'N/A', 4, 1, 5, 3],
+        'GRN Qty': [1, 3, None, '-', -1, 0, 0],
+        'Stock Qty': [0, 0, 0, 0, 0, 0, 0],
+        'Unit Price': [10.0, 'N/A', None, 'TBA', 12.5, 0, 7],
+        MAWB_COLUMN: ['M1', None, None, None, 'M4', None, None],
+        'Supplier': ['SAT AIR'] * 7,
+        'Order Date': ['2025-01-05', '2025-01-05', None, '2025-01-31', 'someday', '2025-07-01', '2025-02-01'],
+    }
+
+
+def test_text_and_blank_cells_do_not_stop_the_scan(raw):
+    exceptions, counts = scan(raw)
+    assert list(exceptions.columns) == [col for col in EXCEPTION_COLUMNS if col != 'Source File']
+    assert list(counts.columns) == COUNT_COLUMNS and counts['Rule'].tolist() == sorted(
+        RULES, key=lambda rule: (['High', 'Medium', 'Low'].index(RULES[rule][1]), RULES[rule][0], rule))
+
+    # Text prices count as blank; a line's price conflict names both values
+    assert details(exceptions, 'Conflicting Unit Price') == {'PO1/P1': 'Unit Price 10 / blank'}
+    assert details(exceptions, 'Missing Unit Price') == {
+        'PO2/P2': 'Unit Price blank', 'PO3/P3': 'Unit Price blank', 'PO5/P5': 'Unit Price 0'}
+    # Text quantities count as 0
+    assert details(exceptions, 'Zero Order Qty') == {'PO2/P2': 'Order Qty 0'}
+
+
+def test_quantity_rules(raw):
+    exceptions, _ = scan(raw)
+    assert details(exceptions, 'GRN > Ordered') == {'PO1/P1': 'GRN 4 > ordered 2'}
+    assert details(exceptions, 'Negative quantity') == {'PO4/P4': 'GRN Qty -1'}
+    assert details(exceptions, 'GRN without shipment') == {'PO1/P1': 'GRN 3 without MAWB'}
+
+
+def test_date_rules(raw):
+    exceptions, counts = scan(raw)
+    assert details(exceptions, 'Unparseable date') == {'PO4/P4': 'Order Date: someday (expected %Y-%m-%d)'}
+    assert details(exceptions, 'Missing Order Date') == {'PO2/P2': 'Order Date blank'}  # not the unparseable one
+    assert details(exceptions, 'Order Date in future') == {'PO5/P5': 'Order Date 01-07-2025'}
+    by_rule = counts.set_index('Rule')
+    assert by_rule.loc['Unparseable date', ['Exceptions', 'Orders']].tolist() == [1, 1]
+    assert by_rule.loc['Dates out of sequence', 'Exceptions'] == 0
+
+
+def test_clean_upload_has_no_exceptions():
+    exceptions, counts = scan({
+        'Order No.': ['PO1'], 'Part No.': ['P1'], 'Order Qty': [2], 'GRN Qty': [2], 'Stock Qty': [2],
+        'Unit Price': [10.0], MAWB_COLUMN: ['M1'], 'Supplier': ['SAT AIR'], 'Order Date': ['2025-01-05'],
+    })
+    assert exceptions.empty
+    assert counts['Exceptions'].sum() == 0
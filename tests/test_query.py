@@ -0,0 +1,32 @@
+import pandas as pd
+import pytest
+
+from app.query import QueryIndex, is_compound, parse_query, run_query
+
+
+@pytest.fixture
+def index(order_lines):
+    return QueryIndex(order_lines)
+
+
+def test_date_range(index):
+    predicates, unknown = parse_query("not shipped since 2025-01", index)
+    assert [p.kind for p in predicates] == ["status", "date"]
+    assert predicates[1].start == pd.Timestamp("2025-01-01")
+    assert unknown == []
+    result, _, _ = run_query(predicates, index)
+    assert result['Part No.'].tolist() == ['P2']
+
+
+@pytest.mark.parametrize("question", ["since 2025-13", "in 2025-02-30", "po1 before 2025-00"])
+def test_invalid_date_is_ignored(index, question):
+    predicates, unknown = parse_query(question, index)
+    assert "date" not in [p.kind for p in predicates]
+    assert unknown == [" ".join(question.split()[-2:])]
+
+
+@pytest.mark.parametrize("question, planner", [("aog", True), ("not shipped", False), ("partial grn", False),
+                                               ("po1", False), ("p1 aog", True)])
+def test_status_without_dedicated_view_uses_planner(index, question, planner):
+    predicates, _ = parse_query(question, index)
+    assert is_compound(predicates) is planner
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from app import report_cache
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(report_cache, "MAX_CACHE_BYTES", 250)
+    monkeypatch.setattr(report_cache, "_usage", {"entries": 0, "bytes": 0, "scanned": None})
+    scans = []
+    entries = report_cache._entries
+    monkeypatch.setattr(report_cache, "_entries", lambda: scans.append(1) or entries())
+    return scans
+
+
+def test_put_keeps_running_total(cache):
+    report_cache.put("aa01", "pdf", b"x" * 100)
+    report_cache.put("bb02", "pdf", b"x" * 100)
+    report_cache.put("bb02", "pdf", b"x" * 50)  # replaced, not added
+    stats = report_cache.cache_stats()
+    assert (stats["entries"], stats["bytes"]) == (2, 150)
+    assert len(cache) == 1  # one scan for the first total, none per put or per stats call
+
+
+def test_evicts_least_recently_used_when_over_limit(cache):
+    report_cache.put("aa01", "pdf", b"x" * 100)
+    os.utime(report_cache._path("aa01", "pdf"), (1, 1))
+    report_cache.put("bb02", "pdf", b"x" * 100)
+    report_cache.put("cc03", "pdf", b"x" * 100)
+    assert report_cache.get("aa01", "pdf") is None
+    assert report_cache.get("cc03", "pdf") == b"x" * 100
+    stats = report_cache.cache_stats()
+    assert (stats["entries"], stats["bytes"]) == (2, 200)
+
+
+@pytest.fixture
+def signed(cache, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_cache, "MAX_CACHE_BYTES", 1 << 20)
+    monkeypatch.setattr(report_cache, "CACHE_KEY", "")
+    monkeypatch.setattr(report_cache, "KEY_FILE", str(tmp_path / "cache.key"))
+    monkeypatch.setattr(report_cache, "_signing_key", [])
+
+
+def test_cached_object_round_trip(signed):
+    builds = []
+    build = lambda: builds.append(1) or {"rows": [1, 2]}
+    assert report_cache.cached_object("dataset", b"export", {}, build) == {"rows": [1, 2]}
+    assert report_cache.cached_object("dataset", b"export", {}, build) == {"rows": [1, 2]}
+    assert len(builds) == 1
+    assert oct(os.stat(report_cache.KEY_FILE).st_mode & 0o777) == "0o600"
+
+
+def test_unsigned_entry_is_rebuilt_not_unpickled(signed):
+    import pickle
+
+    class Payload:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    key = report_cache.upload_key("dataset", b"export", {})
+    report_cache.put(key, "pkl", b"\0" * 32 + pickle.dumps(Payload()))
+    assert report_cache.cached_object("dataset", b"export", {}, lambda: "rebuilt") == "rebuilt"
+    assert report_cache.cached_object("dataset", b"export", {}, lambda: "again") == "rebuilt"
+
+
+def test_entry_copied_to_another_key_is_rejected(signed):
+    report_cache.cached_object("dataset", b"export A", {}, lambda: "A")
+    source = report_cache._path(report_cache.upload_key("dataset", b"export A", {}), "pkl")
+    target = report_cache.upload_key("dataset", b"export B", {})
+    with open(source, "rb") as fh:
+        report_cache.put(target, "pkl", fh.read())
+    assert report_cache.cached_object("dataset", b"export B", {}, lambda: "B") == "B"
@@ -0,0 +1,37 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.out_of_core import aggregate_csv, aggregate_in_memory
+from app.reports import exact_partials, exact_total
+from tools.synthetic_export import synthetic_export, write_export
+
+
+@pytest.mark.parametrize("values", [
+    [],
+    [np.nan, 5.0],
+    [1e16, 1.0, -1e16, 1e-10],
+    [0.1] * 10 + [-0.3, 1e300, -1e300],
+])
+def test_exact_partials_sum_to_exact_total(values):
+    values = pd.Series(values, dtype=float)
+    assert math.fsum(exact_partials(values)) == exact_total(values)
+
+
+def test_partials_of_chunks_combine_exactly():
+    rng = np.random.default_rng(7)
+    values = pd.Series(rng.lognormal(10, 3, 5000) * rng.choice([-1, 1], 5000))
+    chunks = [values.iloc[start:start + 400] for start in range(0, len(values), 400)]
+    combined = math.fsum([p for chunk in chunks for p in exact_partials(chunk)])
+    assert combined == exact_total(values)
+
+
+def test_out_of_core_matches_in_memory(tmp_path):
+    path = tmp_path / "history.csv"
+    write_export(synthetic_export(rows=3000, seed=3), str(path))
+    today = pd.Timestamp("2025-06-02")
+    for expected, actual in zip(aggregate_in_memory(str(path), today=today),
+                                aggregate_csv(str(path), memory_mb=1, chunk_rows=700, today=today)):
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
@@ -0,0 +1,49 @@
+import math
+
+import pandas as pd
+import pytest
+
+from app.columnar import derived_views
+from app.order_lines import prepare_orders, build_order_lines, build_order_summary
+from app.reports import monthly_totals, inr_values, order_months
+from app.rollup import INR_PARTIALS, rollup_cube, period_report
+from tools.synthetic_export import synthetic_export
+
+
+@pytest.fixture(scope="module")
+def lines():
+    return build_order_lines(prepare_orders(synthetic_export(rows=4000, seed=5, start="2024-03-01", days=420)))
+
+
+@pytest.mark.parametrize("period", ["ytd", "12m"])
+def test_month_totals_match_monthly_report_exactly(lines, period):
+    cube = rollup_cube(lines, usd_rate=83.7)
+    end_month = cube['Month'].max()
+    report = period_report(cube, end_month, period, usd_rate=83.7)
+
+    expected = monthly_totals(lines, usd_rate=83.7).set_index('Month')['Total (INR)']
+    by_month = report['by_month'].set_index('Month')['Total (INR)']
+    for month, total in by_month.items():
+        assert total == expected.get(month, 0.0), month  # bit for bit, not within a tolerance
+
+    month, _ = order_months(lines)
+    valued = inr_values(lines, 83.7)['Total (INR)']
+    in_period = month.isin(by_month.index) & lines['Order Date'].notna()
+    assert report['total_inr'] == math.fsum(valued[in_period].dropna())
+    trend = report['supplier_trend'].set_index('Month')
+    assert (trend.sum(axis=1) - by_month).abs().max() < 1e-6 * by_month.abs().max()
+
+
+def test_cells_keep_a_few_partials_not_every_line(lines):
+    cube = rollup_cube(lines, usd_rate=83.7)
+    assert cube['Order Lines'].max() > 20
+    assert cube[INR_PARTIALS].map(len).max() <= 2
+    with pytest.raises(ValueError):
+        period_report(cube, cube['Month'].max(), 'ytd', usd_rate=84)
+
+
+def test_columnar_view_leaves_out_partials(lines):
+    summary = build_order_summary(lines)
+    view = derived_views(lines.iloc[:0], lines, summary, rollup=rollup_cube(lines), lead_times=pd.DataFrame())
+    assert list(view['monthly_rollup'].columns) == [
+        'Month', 'Supplier', 'Currency', 'Priority', 'Order Lines', 'Order Qty', 'Order Value']
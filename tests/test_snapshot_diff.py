@@ -0,0 +1,20 @@
+import pandas as pd
+
+from app.snapshot_diff import diff_order_lines
+
+
+def test_removed_lines_keep_their_description(order_lines):
+    new_lines = order_lines[order_lines['Part No.'] != 'P2']
+    changes = diff_order_lines(order_lines, new_lines).set_index('Part No.')
+    assert changes.loc['P2', 'Change'] == 'Removed'
+    assert changes.loc['P2', 'Description'] == 'Valve'
+    assert changes.loc['P2', 'Order Date'] == pd.Timestamp('2025-02-01')
+
+
+def test_changed_lines_show_the_new_description(order_lines):
+    new_lines = order_lines.assign(
+        Description=order_lines['Description'].where(order_lines['Part No.'] != 'P3', 'Pump assy'),
+        **{'GRN Qty': order_lines['GRN Qty'].where(order_lines['Part No.'] != 'P3', 4)})
+    changes = diff_order_lines(order_lines, new_lines)
+    assert changes[['Part No.', 'Change', 'Description', 'GRN Qty Δ']].values.tolist() == [
+        ['P3', 'Changed', 'Pump assy', 2]]
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+
+from app.table_view import page_frame
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame({'Order No.': [f"PO{i}" for i in range(1, 8)], 'Qty': [3, 1, None, 7, 2, 5, 4],
+                         'Supplier': ['SAT AIR', 'AAR', 'SAT AIR', 'AAR', 'BOEING', 'SAT AIR', 'AAR']})
+
+
+def test_pages_cover_every_row_once(frame):
+    pages = [page_frame(frame, page=page, page_size=3) for page in (1, 2, 3)]
+    assert [len(rows) for rows, _ in pages] == [3, 3, 1]  # last page is the remainder
+    assert pd.concat([rows for rows, _ in pages])['Order No.'].tolist() == frame['Order No.'].tolist()
+    assert {total for _, total in pages} == {7}
+
+
+def test_page_past_the_end_is_empty(frame):
+    rows, total = page_frame(frame, page=4, page_size=3)
+    assert rows.empty and list(rows.columns) == list(frame.columns)
+    assert total == 7
+    rows, _ = page_frame(frame, sort_by='Qty', page=4, page_size=3)
+    assert rows.empty
+
+
+def test_empty_frame(frame):
+    rows, total = page_frame(frame.iloc[:0], filter_text="po", sort_by='Qty', page=1, page_size=3)
+    assert rows.empty and total == 0
+
+
+def test_sort_and_filter_before_paging(frame):
+    columns = ['Order No.', 'Qty', 'Supplier', 'Missing']
+    rows, total = page_frame(frame, columns=columns, filter_text="sat air", sort_by='Qty', descending=True,
+                             page=1, page_size=2)
+    assert total == 3
+    assert list(rows.columns) == ['Order No.', 'Qty', 'Supplier']
+    assert rows['Order No.'].tolist() == ['PO6', 'PO1']
+    rows, _ = page_frame(frame, columns=columns, filter_text="sat air", sort_by='Qty', descending=True,
+                         page=2, page_size=2)
+    assert rows['Order No.'].tolist() == ['PO3']  # blank Qty sorts last
+
+
+def test_filter_looks_only_at_shown_columns(frame):
+    _, total = page_frame(frame, columns=['Order No.', 'Qty'], filter_text="sat air")
+    assert total == 0
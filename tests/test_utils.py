@@ -0,0 +1,35 @@
+import pytest
+
+from app.utils import format_inr, indian_grouping
+
+
+@pytest.mark.parametrize("value, expected", [
+    (0, "0"),
+    (7, "7"),
+    (999, "999"),
+    (1000, "1,000"),
+    (100000, "1,00,000"),
+    (12345678, "1,23,45,678"),
+    (1000000000, "1,00,00,00,000"),
+    (-999, "-999"),
+    (-1234567, "-12,34,567"),
+])
+def test_indian_grouping(value, expected):
+    assert indian_grouping(value) == expected
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (0, "₹0.00"),
+    (0.4, "₹0.00"),
+    (-0.4, "₹0.00"),
+    (999.49, "₹999.00"),
+    (999.5, "₹1,000.00"),
+    (2.5, "₹2.00"),  # round half to even, as round() before babel's format_currency
+    (3.5, "₹4.00"),
+    (12345678.9, "₹1,23,45,679.00"),
+    (250000000, "₹25,00,00,000.00"),
+    (-1234567.2, "-₹12,34,567.00"),
+    (-500, "-₹500.00"),
+])
+def test_format_inr(amount, expected):
+    assert format_inr(amount) == expected
@@ -0,0 +1,61 @@
+import datetime
+
+import pytest
+
+from app import watcher
+from app.dataset import prepare_dataset
+from tools.synthetic_export import synthetic_export, write_export
+
+TODAY = datetime.date(2025, 6, 2)
+
+
+@pytest.fixture
+def folders(tmp_path, cache_dir):
+    watch, out = tmp_path / "in", tmp_path / "out"
+    watch.mkdir()
+    (watch / "a_broken.csv").write_text("not,a\nlaminaar,export\n")
+    write_export(synthetic_export(rows=200, start="2025-05-01", days=40), str(watch / "b_good.csv"))
+    return watch, out
+
+
+def test_bad_export_does_not_stop_the_others(folders):
+    watch, out = folders
+    ledger = watcher.run(str(watch), str(out), once=True, today=TODAY)
+    entries = {entry["file"]: entry for entry in ledger["files"].values()}
+    assert "error" in entries["a_broken.csv"]
+    assert entries["b_good.csv"]["reports"]
+    assert ledger["latest"].endswith("b_good.csv")
+
+
+def test_unreadable_export_does_not_stop_the_loop(folders, monkeypatch):
+    watch, out = folders
+    ingest, attempts = watcher.ingest, []
+
+    def locked(path, *args):
+        if path.endswith("a_broken.csv"):
+            attempts.append(path)
+            raise PermissionError("locked by the copy")
+        return ingest(path, *args)
+
+    monkeypatch.setattr(watcher, "ingest", locked)
+    ledger = watcher.run(str(watch), str(out), once=True, today=TODAY)
+    assert attempts
+    assert [entry["file"] for entry in ledger["files"].values()] == ["b_good.csv"]
+
+
+def test_failed_rerender_is_logged_not_raised(tmp_path):
+    export = tmp_path / "export.csv"
+    export.write_text("x\n1\n")
+    ledger = {"files": {}, "latest": str(export), "rendered_for": "2025-06-01"}
+    assert watcher.rerender_if_stale(str(tmp_path), ledger, TODAY)
+    assert ledger["rendered_for"] == TODAY.isoformat()
+
+
+def test_cached_dataset_counts_days_pending_to_the_day_it_is_read(folders):
+    watch, out = folders
+    watcher.run(str(watch), str(out), once=True, today=TODAY)
+    file_bytes = (watch / "b_good.csv").read_bytes()
+    _, built, _ = prepare_dataset(file_bytes, "csv", today=TODAY)
+    _, next_day, _ = prepare_dataset(file_bytes, "csv", today=TODAY + datetime.timedelta(days=1))
+    dated = built['Order Date'].notna()
+    assert (built.loc[dated, 'Days Pending'] + 1 == next_day.loc[dated, 'Days Pending']).all()
@@ -0,0 +1,91 @@
+# tools/check_import_time.py
+# Start-up budget check for the dashboard.
+#
+#   python tools/check_import_time.py                 # default budget
+#   python tools/check_import_time.py --budget-ms 60 --runs 9
+#
+# Each run imports `app.main` in a fresh interpreter and times it on top of the libraries a
+# Streamlit worker has loaded anyway (streamlit, pandas). Fails (exit 1) if the median exceeds
+# the budget, or if an export-only library (reportlab, xlsxwriter, pypdf) is loaded at start-up.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_BUDGET_MS = 100
+DEFERRED_MODULES = ["reportlab", "xlsxwriter", "pypdf"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import streamlit, pandas
+baseline = time.perf_counter()
+import app.main
+finished = time.perf_counter()
+print(json.dumps({
+    "baseline_ms": (baseline - started) * 1000,
+    "app_ms": (finished - baseline) * 1000,
+    "loaded": sorted(m for m in %r if m in sys.modules),
+}))
+""" % (DEFERRED_MODULES,)
+
+
+def run_probe():
+    out = subprocess.run([sys.executable, "-c", PROBE], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+# 🔹 Slowest modules imported by `app.main` itself, from python -X importtime
+def slowest_imports(limit=10):
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import streamlit, pandas; import app.main"],
+                         cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    rows = []
+    seen_baseline = False
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = [part.strip() for part in line[len("import time:"):].split("|")]
+        if module == "pandas":
+            seen_baseline = True  # everything after the baseline imports is attributable to the app
+            continue
+        if seen_baseline:
+            rows.append((int(cumulative) / 1000, module))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the dashboard start-up import budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="max median import time of app.main on top of streamlit + pandas")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [run_probe() for _ in range(args.runs)]
+    app_ms = statistics.median(r["app_ms"] for r in results)
+    baseline_ms = statistics.median(r["baseline_ms"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"streamlit + pandas: {baseline_ms:.0f} ms (median of {args.runs})")
+    print(f"app.main on top:    {app_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    print("slowest app imports (cumulative ms):")
+    for ms, module in slowest_imports():
+        print(f"  {ms:8.1f}  {module}")
+
+    failed = False
+    if loaded:
+        print(f"❌ export libraries loaded at start-up: {', '.join(loaded)}")
+        failed = True
+    if app_ms > args.budget_ms:
+        print(f"❌ start-up over budget by {app_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ within budget")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+# tools/load_test.py
+# Concurrent-session load test for the dashboard.
+#
+#   python tools/load_test.py --sessions 8 --rows 20000
+#   python tools/load_test.py --sessions 1,4,16 --scenarios qa,downloads --export real_export.xlsx
+#
+# Each simulated planner is a headless session of app.main driven through Streamlit's AppTest
+# API in its own process, so the test drivers do not compete for one GIL. Sessions upload the
+# export through the dashboard's own file uploader (AppTest's file_uploader, Streamlit 1.56+),
+# then replay each scenario; every phase starts in all sessions at once and every rerun is timed.
+# The on-disk report cache is shared by all sessions; st.cache_data / st.cache_resource live in
+# each session's process. Per scenario it reports p50 / p95 / max rerun latency, CPU time
+# (summed over sessions) and peak RSS (summed over sessions).
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(TOOLS_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, TOOLS_DIR)
+
+from synthetic_export import synthetic_export, write_export  # noqa: E402
+
+SCRIPT = """
+from app.main import main
+main()
+"""
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "xls": "application/vnd.ms-excel",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+QA_QUESTIONS = ["not shipped", "partial grn", "supplier sat air", "abc", "supplier sat air not shipped abc since 2025-01"]
+
+
+def labelled(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"no widget labelled {label!r} on the page")
+
+
+def ask(at, question):
+    labelled(at.text_input, "Ask a question about your data:").input(question).run()
+
+
+# 🔹 Scenarios: each replays one interaction sequence on a loaded session; timed() times one rerun
+def status_filter(at, plan, timed):
+    for status in labelled(at.selectbox, "Choose status to filter").options:
+        timed(lambda: labelled(at.selectbox, "Choose status to filter").select(status).run())
+
+
+def date_pick(at, plan, timed):
+    for day in plan["dates"]:
+        timed(lambda: labelled(at.date_input, "Select a date").set_value(day).run())
+
+
+def part_search(at, plan, timed):
+    for part in plan["parts"]:
+        timed(lambda: labelled(at.selectbox, "Select Part Number to view order-wise status").select(part).run())
+
+
+def qa(at, plan, timed):
+    for question in QA_QUESTIONS + plan["parts"][:1]:
+        timed(lambda: ask(at, question))
+
+
+def downloads(at, plan, timed):
+    timed(lambda: labelled(at.date_input, "Select a date").set_value(plan["dates"][0]).run())
+    timed(lambda: labelled(at.button, "📥 Download Full Daily Activity PDF").click().run())
+    timed(lambda: ask(at, "monthly report"))
+
+
+SCENARIOS = {
+    "status_filter": status_filter,
+    "date_pick": date_pick,
+    "part_search": part_search,
+    "qa": qa,
+    "downloads": downloads,
+}
+
+
+# 🔹 Peak resident memory while a phase runs, sampled from /proc (Linux); falls back to ru_maxrss
+class PeakRSS:
+    def __init__(self, interval=0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    @staticmethod
+    def current():
+        try:
+            with open("/proc/self/statm") as fh:
+                return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.peak = self.current()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def cpu_seconds():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)  # PDF / parsing worker processes
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))]
+
+
+# 🔹 One phase in one session: fn(timed) with every rerun timed, plus this process's CPU time and peak RSS
+def session_phase(at, fn):
+    latencies, errors = [], []
+
+    def timed(action):
+        started = time.perf_counter()
+        action()
+        latencies.append(time.perf_counter() - started)
+        errors.extend(e.value for e in at.exception)
+
+    cpu_before, started = cpu_seconds(), time.time()
+    with PeakRSS() as rss:
+        try:
+            fn(timed)
+        except Exception as exc:  # a broken interaction is reported, not fatal for the later phases
+            errors.append(f"{type(exc).__name__}: {exc}")
+    return {"latencies": latencies, "errors": errors, "cpu_s": cpu_seconds() - cpu_before,
+            "started": started, "finished": time.time(), "peak_rss": rss.peak}
+
+
+# 🔹 Worker process entry point: one planner's session, phase by phase in step with the other sessions
+def run_session(export_path, scenarios, plan, timeout, barrier, results):
+    from streamlit.testing.v1 import AppTest
+
+    with open(export_path, "rb") as fh:
+        upload = (os.path.basename(export_path), fh.read(),
+                  MIME_TYPES.get(export_path.rsplit(".", 1)[-1].lower(), "application/octet-stream"))
+    at = AppTest.from_string(SCRIPT, default_timeout=timeout)
+    at.run()  # the empty page, with the uploader
+
+    phases = [("upload", lambda timed: timed(lambda: at.file_uploader[0].set_value([upload]).run()))]
+    phases += [(name, lambda timed, scenario=SCENARIOS[name]: scenario(at, plan, timed)) for name in scenarios]
+    for name, fn in phases:
+        try:
+            barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            results.put((name, {"errors": ["another session stopped responding"]}))
+            return
+        results.put((name, session_phase(at, fn)))
+
+
+# 🔹 Per-phase results of all sessions combined into one row
+def combine_phase(name, sessions, parts):
+    latencies = [value for part in parts for value in part.get("latencies", [])]
+    errors = [error for part in parts for error in part["errors"]]
+    timed_parts = [part for part in parts if "started" in part]
+    wall = max(p["finished"] for p in timed_parts) - min(p["started"] for p in timed_parts) if timed_parts else 0.0
+    cpu = sum(part["cpu_s"] for part in timed_parts)
+    return {
+        "scenario": name,
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else None,
+        "p95_ms": percentile(latencies, 95) * 1000 if latencies else None,
+        "max_ms": max(latencies) * 1000 if latencies else None,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_cores": cpu / wall if wall else 0.0,
+        "peak_rss_mb": sum(part["peak_rss"] for part in timed_parts) / 1e6,
+        "errors": errors[:5],
+        "error_count": len(errors),
+    }
+
+
+# 🔹 Interaction inputs drawn from the export: activity dates and part numbers that exist in it
+def interaction_plan(export_path, seed=0, picks=5):
+    df = pd.read_csv(export_path) if export_path.endswith(".csv") else pd.read_excel(export_path)
+    rng = random.Random(seed)
+    dates = pd.to_datetime(df["GRN Date"], errors="coerce").dropna().dt.date.unique().tolist()
+    parts = sorted(df["Part No."].astype(str).str.strip().str.upper().unique())
+    return {"dates": rng.sample(dates, min(picks, len(dates))), "parts": rng.sample(parts, min(picks, len(parts)))}
+
+
+def run_load_test(export_path, session_count, scenarios, timeout=300):
+    plan = interaction_plan(export_path)
+    context = multiprocessing.get_context("spawn")
+    barrier = context.Barrier(session_count)
+    results = context.Queue()
+    processes = [context.Process(target=run_session, args=(export_path, scenarios, plan, timeout, barrier, results))
+                 for _ in range(session_count)]
+    for process in processes:
+        process.start()
+
+    phases = ["upload"] + scenarios
+    parts = {name: [] for name in phases}
+    expected = session_count * len(phases)
+    while sum(map(len, parts.values())) < expected:
+        try:
+            name, part = results.get(timeout=1)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                break  # a session died without reporting the rest of its phases
+            continue
+        parts[name].append(part)
+    for process in processes:
+        process.join()
+
+    for name in phases:
+        missing = session_count - len(parts[name])
+        if missing:
+            parts[name].append({"errors": [f"{missing} session(s) exited before this phase"]})
+    return [combine_phase(name, session_count, parts[name]) for name in phases]
+
+
+def print_results(results):
+    header = f"{'scenario':<14}{'sessions':>9}{'reruns':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}" \
+             f"{'CPU s':>8}{'cores':>7}{'peak RSS MB':>13}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        fmt = lambda v: f"{v:.0f}" if v is not None else "-"  # noqa: E731
+        print(f"{r['scenario']:<14}{r['sessions']:>9}{r['reruns']:>8}{fmt(r['p50_ms']):>9}{fmt(r['p95_ms']):>9}"
+              f"{fmt(r['max_ms']):>9}{r['cpu_s']:>8.1f}{r['cpu_cores']:>7.2f}{r['peak_rss_mb']:>13.0f}"
+              f"{r['error_count']:>8}")
+        for error in r["errors"]:
+            print(f"    ⚠️ {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the dashboard")
+    parser.add_argument("--sessions", default="4", help="simultaneous sessions, or a list like 1,4,16")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"subset of {','.join(SCENARIOS)}")
+    parser.add_argument("--export", default=None, help="export to upload (default: a synthetic one)")
+    parser.add_argument("--rows", type=int, default=20000, help="rows of the synthetic export")
+    parser.add_argument("--format", choices=["xlsx", "csv"], default="xlsx", help="format of the synthetic export")
+    parser.add_argument("--report-cache", default=None,
+                        help="report cache folder (default: a fresh temporary one, so the first downloads render)")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds a single rerun may take")
+    parser.add_argument("--json", default=None, help="also write the results to this file")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    work_dir = tempfile.mkdtemp(prefix="procurement-load-")
+    # Inherited by the session processes, before app.report_cache is imported there
+    os.environ["PROCUREMENT_REPORT_CACHE"] = args.report_cache or os.path.join(work_dir, "report_cache")
+    os.chdir(REPO_ROOT)  # PDF font is loaded from the working directory
+
+    export_path = args.export
+    if export_path is None:
+        export_path = os.path.join(work_dir, f"synthetic_export.{args.format}")
+        write_export(synthetic_export(args.rows), export_path)
+        print(f"synthetic export: {args.rows:,} rows → {export_path}")
+
+    all_results = []
+    for count in [int(n) for n in args.sessions.split(",")]:
+        print(f"\n▶ {count} concurrent session(s) — caches are warm after the first round")
+        results = run_load_test(os.path.abspath(export_path), count, scenarios, timeout=args.timeout)
+        print_results(results)
+        all_results.extend(results)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(all_results, fh, indent=2)
+    return 1 if any(r["error_count"] for r in all_results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
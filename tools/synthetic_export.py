@@ -0,0 +1,75 @@
+# tools/synthetic_export.py
+# Synthetic Laminaar "Order Tracker" export for load and performance testing.
+#
+#   python tools/synthetic_export.py --rows 20000 --out synthetic.xlsx
+#   python tools/synthetic_export.py --rows 200000 --out synthetic.csv --seed 7
+#
+# Rows mimic a real export: order lines repeated once per shipment / GRN batch, dates as
+# dd-Mon-yyyy text, mixed currencies, comma-separated aircraft and an AOG share in PRIORITY.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SUPPLIERS = ["SAT AIR", "ATR", "HINDUSTAN AERONAUTICS LTD", "AAR CORP", "AIRBUS", "PRATT & WHITNEY CANADA"]
+AIRCRAFT = ["VT-ABC", "VT-XYZ", "VT-ABC, VT-XYZ", "VT-KLM", None]
+DATE_TEXT = "%d-%b-%Y"
+
+
+def synthetic_export(rows=20000, seed=0, start="2024-01-01", days=600):
+    rng = np.random.default_rng(seed)
+    orders = rng.integers(2000100000, 2000100000 + max(rows // 6, 1), rows).astype(str)
+    parts = np.array([f"P{x:05d}" for x in rng.integers(0, max(rows // 10, 1), rows)])
+    order_qty = rng.integers(1, 10, rows).astype(float)
+    grn_qty = np.where(rng.random(rows) < 0.4, 0, rng.integers(0, 10, rows)).astype(float)
+
+    order_date = pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, rows), unit="D")
+    mawb_date = order_date + pd.to_timedelta(rng.integers(1, 40, rows), unit="D")
+    grn_date = mawb_date + pd.to_timedelta(rng.integers(1, 20, rows), unit="D")
+    stock_date = mawb_date + pd.to_timedelta(rng.integers(20, 30, rows), unit="D")
+    shipped = (grn_qty > 0) | (rng.random(rows) < 0.2)
+    received = grn_qty > 0
+
+    return pd.DataFrame({
+        "Order No.": orders,
+        "Order Date": order_date.strftime(DATE_TEXT),
+        "Part No.": parts,
+        "Description": [f"Desc item {x} with long text" for x in rng.integers(0, 99, rows)],
+        "Supplier": rng.choice(SUPPLIERS, rows),
+        "Order Qty": order_qty,
+        "GRN Qty": np.where(rng.random(rows) < .05, np.nan, grn_qty),
+        "Stock Qty": np.minimum(grn_qty, rng.integers(0, 10, rows)),
+        "QA Status": rng.choice(["Approved", "Pending", None], rows),
+        "MAWB No. / Consignment No./  Bill of Lading No.":
+            np.where(shipped, [f"MAWB{x}" for x in rng.integers(0, 9999, rows)], None),
+        "MAWB Date / Consignment Date/  Bill of Lading Date": np.where(shipped, mawb_date.strftime(DATE_TEXT), None),
+        "Mode of Transport": np.where(shipped, rng.choice(["AIR", "SEA"], rows), None),
+        "GRN Date": np.where(received, grn_date.strftime(DATE_TEXT), None),
+        "Stock-In Date": np.where(received, stock_date.strftime(DATE_TEXT), None),
+        "Unit Price": rng.uniform(1, 50000, rows).round(2),
+        "Currency": rng.choice(["INR", "USD", "US Dollar", "Indian Rupee"], rows),
+        "A/C Reg. No": rng.choice(AIRCRAFT, rows),
+        "REF. NO": [f"R{x}" for x in rng.integers(0, 999, rows)],
+        "PRIORITY": rng.choice(["AOG", "ROUTINE", "ROUTINE", "CRITICAL"], rows),
+    })
+
+
+def write_export(df, path):
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False, sheet_name="PURCHASE_ORDER")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic Laminaar Order Tracker export")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help=".xlsx (PURCHASE_ORDER sheet) or .csv")
+    args = parser.parse_args()
+    write_export(synthetic_export(args.rows, args.seed), args.out)
+    print(f"wrote {args.rows:,} rows to {args.out}")
+
+
+if __name__ == "__main__":
+    main()